@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Asset Manifest
+Writes the build-time index of every downloaded and published asset:
+- assets/asset-paths.json: the sorted list of asset paths, the only file the
+  Nuxt app imports (utils/imageCache.js), so existence checks need no runtime
+  probing and the client bundle carries no per-file metadata
+- assets/asset-manifest.json: size, sha256, mime type and dimensions per path,
+  for the pipeline; deterministic, so it only changes when the assets do
+
+Covers:
+- AAII-Migration-assets/output/assets/images    -> keys "assets/images/..."
+- AAII-Migration-assets/output/assets/materials -> keys "assets/materials/..."
+- public/                                       -> keys "/images/...", "/documents/..."
+  (except public/images/derivatives, see SKIP_DIRS)
+
+Dimensions need Pillow. Hashes are reused for files whose size and mtime are
+unchanged since the previous run; those mtimes are per-machine, so they live
+in CACHE_FILE (not committed) rather than in the manifest.
+
+The download scripts refresh the files after writing assets, and
+"npm run build"/"npm run generate" run this script first. Files copied into
+public/ by hand while "nuxt dev" is running are reported missing until this
+script is rerun.
+
+Usage: python asset_manifest.py
+"""
+
+import hashlib
+import json
+import mimetypes
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image
+    HAS_PILLOW = True
+except ImportError:
+    Image = None
+    HAS_PILLOW = False
+
+PROJECT_ROOT = Path(__file__).parent.parent
+OUTPUT_ASSETS = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'assets'
+PUBLIC_DIR = PROJECT_ROOT / 'public'
+MANIFEST_FILE = PROJECT_ROOT / 'assets' / 'asset-manifest.json'
+CLIENT_FILE = PROJECT_ROOT / 'assets' / 'asset-paths.json'
+CACHE_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'asset-manifest-cache.json'
+
+# (directory, key prefix) pairs indexed into the manifest
+ROOTS: List[Tuple[Path, str]] = [
+    (OUTPUT_ASSETS / 'images', 'assets/images/'),
+    (OUTPUT_ASSETS / 'materials', 'assets/materials/'),
+    (PUBLIC_DIR, '/'),
+]
+
+# Generated image derivatives: build output (gitignored), looked up through
+# image_derivatives' manifest rather than existence checks
+SKIP_DIRS = [PUBLIC_DIR / 'images' / 'derivatives']
+
+# Pipeline bookkeeping files that are not assets
+SKIP_SUFFIXES = {'.json', '.tmp', '.part'}
+
+mimetypes.add_type('image/webp', '.webp')
+mimetypes.add_type('image/avif', '.avif')
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def image_size(path: Path) -> Optional[Tuple[int, int]]:
+    """(width, height) from the image header, or None"""
+    if not HAS_PILLOW:
+        return None
+    try:
+        with Image.open(path) as im:
+            return im.size
+    except Exception:
+        return None
+
+
+def iter_assets():
+    """Yield (key, path) for every asset file under the indexed roots"""
+    for root, prefix in ROOTS:
+        if not root.exists():
+            continue
+        for path in sorted(root.rglob('*')):
+            if not path.is_file() or path.name.startswith('.') or path.suffix.lower() in SKIP_SUFFIXES:
+                continue
+            if any(path.is_relative_to(skip_dir) for skip_dir in SKIP_DIRS):
+                continue
+            yield prefix + path.relative_to(root).as_posix(), path
+
+
+def describe(path: Path, previous: Optional[Dict]) -> Dict:
+    """Cache entry for one file (manifest entry plus mtime_ns), reusing the previous one if unchanged"""
+    stat = path.stat()
+    if previous and previous.get('size') == stat.st_size and previous.get('mtime_ns') == stat.st_mtime_ns:
+        return previous
+
+    mime = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+    entry = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_sha256(path),
+        'mime': mime
+    }
+    if mime.startswith('image/'):
+        dimensions = image_size(path)
+        if dimensions:
+            entry['width'], entry['height'] = dimensions
+    return entry
+
+
+def load_cache() -> Dict:
+    """Load the hash cache of the previous run, or an empty one"""
+    if CACHE_FILE.exists():
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠ Ignoring unreadable asset manifest cache: {e}")
+    return {}
+
+
+def write_json(path: Path, data) -> None:
+    """Write JSON atomically, leaving the file untouched if the content is the same"""
+    text = json.dumps(data, indent=2, ensure_ascii=False, sort_keys=True) + '\n'
+    if path.exists() and path.read_text(encoding='utf-8') == text:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_file, path)
+
+
+def update_manifest() -> Dict[str, int]:
+    """
+    Rescan the asset roots and rewrite the manifest, client path list and cache.
+    Returns counts: {'total', 'hashed', 'removed'}
+    """
+    previous = load_cache()
+    cache = {}
+    hashed = 0
+
+    for key, path in iter_assets():
+        entry = describe(path, previous.get(key))
+        if entry is not previous.get(key):
+            hashed += 1
+        cache[key] = entry
+
+    assets = {key: {field: value for field, value in entry.items() if field != 'mtime_ns'}
+              for key, entry in cache.items()}
+
+    write_json(MANIFEST_FILE, {'assets': assets})
+    write_json(CLIENT_FILE, sorted(assets))
+    write_json(CACHE_FILE, cache)
+
+    return {
+        'total': len(assets),
+        'hashed': hashed,
+        'removed': len(set(previous) - set(assets))
+    }
+
+
+def refresh() -> None:
+    """Update the manifest after a download step and print a one-line summary"""
+    print(f"\n  Updating asset manifest...")
+    try:
+        counts = update_manifest()
+    except OSError as e:
+        print(f"    ⚠ Asset manifest not updated: {e}")
+        return
+    print(f"    ✓ Asset manifest: {counts['total']} assets ({counts['hashed']} hashed)")
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("ASSET MANIFEST")
+    print("=" * 80)
+    print()
+
+    start_time = time.time()
+    counts = update_manifest()
+
+    print(f"Assets: {counts['total']} ({counts['hashed']} hashed, {counts['removed']} removed)")
+    print(f"Dimensions: {'yes' if HAS_PILLOW else 'no (Pillow not installed)'}")
+    print(f"Time elapsed: {time.time() - start_time:.2f} seconds")
+    print(f"\n✓ Manifest saved to: {MANIFEST_FILE}")
+    print(f"✓ Client path list saved to: {CLIENT_FILE}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,29 +5,19 @@ Processes all JSON files to download speaker images
 """
 
 import json
-import subprocess
 from pathlib import Path
 import time
-import re
+import importlib.util
 
 PROJECT_ROOT = Path(__file__).parent.parent
 STRUCTURED_JSON = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-json'
 REPORT_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'image-download-report.json'
 SCRIPT_PATH = Path(__file__).parent / 'download-speaker-images.py'
 
-
-def parse_output(output: str) -> tuple:
-    """Parse script output to extract downloaded/failed counts"""
-    downloaded = 0
-    failed = 0
-
-    # Look for "Summary: X downloaded, Y failed"
-    summary_match = re.search(r'Summary:\s+(\d+)\s+downloaded,\s+(\d+)\s+failed', output)
-    if summary_match:
-        downloaded = int(summary_match.group(1))
-        failed = int(summary_match.group(2))
-
-    return downloaded, failed
+# Load the downloader in-process so all meetings share one pipeline
+spec = importlib.util.spec_from_file_location("download_images", SCRIPT_PATH)
+download_images = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(download_images)
 
 
 def main():
@@ -77,57 +67,22 @@ def main():
         'files': []
     }
 
-    for i, json_file in enumerate(files_to_process, 1):
-        print(f"\n{'=' * 80}")
-        print(f"[{i}/{len(files_to_process)}]")
-        print(f"{'=' * 80}")
-
-        try:
-            # Run the download script for this file
-            result = subprocess.run(
-                ['python3', str(SCRIPT_PATH), json_file.name],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            # Print the output
-            print(result.stdout)
-
-            if result.stderr and 'NotOpenSSLWarning' not in result.stderr:
-                print("STDERR:", result.stderr)
-
-            # Parse output to get counts
-            downloaded, failed = parse_output(result.stdout)
-
+    # Pages and images are fetched concurrently; per-host limits replace the per-file sleep
+    start_time = time.time()
+    file_results = download_images.process_files_concurrently(
+        files_to_process,
+        download_images.LivePageFetcher(),
+        download_images.ImageExtractor(),
+        download_images.DataUpdater()
+    )
+    elapsed = time.time() - start_time
+
+    for file_result in file_results:
+        results['files'].append(file_result)
+        if file_result['status'] == 'success':
             results['processed_files'] += 1
-            results['total_images_downloaded'] += downloaded
-            results['total_images_failed'] += failed
-
-            results['files'].append({
-                'filename': json_file.name,
-                'status': 'success',
-                'images_downloaded': downloaded,
-                'images_failed': failed
-            })
-
-            # Small delay to be nice to the server
-            time.sleep(2)
-
-        except subprocess.TimeoutExpired:
-            print(f"  ❌ Timeout processing file")
-            results['files'].append({
-                'filename': json_file.name,
-                'status': 'error',
-                'error': 'Timeout'
-            })
-        except Exception as e:
-            print(f"  ❌ Error processing file: {e}")
-            results['files'].append({
-                'filename': json_file.name,
-                'status': 'error',
-                'error': str(e)
-            })
+            results['total_images_downloaded'] += file_result['images_downloaded']
+            results['total_images_failed'] += file_result['images_failed']
 
     # Generate summary report
     print("\n" + "=" * 80)
@@ -136,6 +91,7 @@ def main():
     print(f"\nFiles processed: {results['processed_files']}/{results['total_files']}")
     print(f"Total images downloaded: {results['total_images_downloaded']}")
     print(f"Total images failed: {results['total_images_failed']}")
+    print(f"Time elapsed: {elapsed:.1f} seconds")
 
     # Show files with failures
     failed_files = [f for f in results['files'] if f.get('images_failed', 0) > 0 or f.get('status') == 'error']
@@ -1,156 +1,206 @@
 #!/usr/bin/env python3
 """
 Batch Materials Downloader (PDF/PPT)
-Processes all JSON files to download presentation materials
+Downloads the presentation materials of every meeting in two phases, in-process
+with one shared fetcher (and HTTP session)
+
+- Plan: every structured JSON file is scanned once into a global plan with one
+  entry per unique URL, so a deck linked from several meetings is fetched once;
+  materials already downloaded from the same URL are skipped unless --force
+  is given (see build_plan in download-materials.py for filename ownership).
+  The URLs still to fetch are probed with concurrent HEAD requests for their
+  size and content type
+- Download: the plan runs on a thread pool (largest files first), with the
+  per-host limit replacing the per-file sleep; then every linking meeting's
+  JSON/XML is updated and the PDFs are post-processed in one pass
+- --dry-run stops after planning and reports the request count and total
+  bytes, saving the plan to PLAN_FILE
+
+Usage: python batch-download-all-materials.py [--dry-run] [--force] [--workers=N]
 """
 
 import json
-import subprocess
+import sys
 from pathlib import Path
 import time
-import re
+import importlib.util
 
 PROJECT_ROOT = Path(__file__).parent.parent
 STRUCTURED_JSON = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-json'
 REPORT_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'materials-download-report.json'
+PLAN_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'materials-download-plan.json'
 SCRIPT_PATH = Path(__file__).parent / 'download-materials.py'
 
+LARGEST_SHOWN = 10
+
+
+def load_downloader():
+    """Load the downloader in-process so all meetings share one session"""
+    spec = importlib.util.spec_from_file_location("download_materials", SCRIPT_PATH)
+    download_materials = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(download_materials)
+    return download_materials
+
+
+def format_bytes(size: int) -> str:
+    """Human-readable byte count"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+
+
+def probe_problem(entry):
+    """Why a probe did not succeed, or None"""
+    if entry.get('status') is None:
+        return entry.get('error', 'no response')
+    return f"HTTP {entry['status']}" if entry['status'] >= 400 else None
+
+
+def summarize_plan(download_materials, plan, pending):
+    """Totals of a probed plan"""
+    references = sum(len(entry['references']) for entry in plan)
+    gone = [entry for entry in pending if entry.get('status') in download_materials.GONE_STATUSES]
+    fetchable = [entry for entry in pending if entry.get('status') not in download_materials.GONE_STATUSES]
+    by_type = {}
+    for entry in fetchable:
+        content_type = entry.get('content_type') or 'unknown'
+        count, size = by_type.get(content_type, (0, 0))
+        by_type[content_type] = (count + 1, size + (entry.get('size') or 0))
+    return {
+        'meetings': len({ref['json_file'] for entry in plan for ref in entry['references']}),
+        'references': references,
+        'unique_urls': len(plan),
+        'duplicate_references': references - len(plan),
+        'existing': len(plan) - len(pending),
+        'probe_requests': len(pending),
+        'download_requests': len(fetchable),
+        'total_bytes': sum(entry.get('size') or 0 for entry in fetchable),
+        'unknown_sizes': sum(1 for entry in fetchable if entry.get('size') is None),
+        'gone': len(gone),
+        'probe_errors': sum(1 for entry in fetchable if probe_problem(entry)),
+        'by_content_type': {content_type: {'count': count, 'bytes': size}
+                            for content_type, (count, size) in sorted(by_type.items())},
+    }
 
-def parse_output(output: str) -> tuple:
-    """Parse script output to extract downloaded/failed counts"""
-    downloaded = 0
-    failed = 0
-
-    # Look for "Summary: X downloaded, Y failed"
-    summary_match = re.search(r'Summary:\s+(\d+)\s+downloaded,\s+(\d+)\s+failed', output)
-    if summary_match:
-        downloaded = int(summary_match.group(1))
-        failed = int(summary_match.group(2))
 
-    return downloaded, failed
+def print_plan_report(plan, pending, summary):
+    """Dry-run report of what a download run would fetch"""
+    print(f"Meetings with materials:   {summary['meetings']}")
+    print(f"Material references:       {summary['references']}")
+    print(f"Unique URLs:               {summary['unique_urls']} "
+          f"({summary['duplicate_references']} duplicate references deduplicated)")
+    print(f"Already downloaded:        {summary['existing']}")
+    print(f"Gone (404/410, skipped):   {summary['gone']}")
+    print()
+    print(f"Download requests:         {summary['download_requests']}")
+    unknown = f" + {summary['unknown_sizes']} of unknown size" if summary['unknown_sizes'] else ''
+    print(f"Total download size:       {format_bytes(summary['total_bytes'])}{unknown}")
+
+    if summary['by_content_type']:
+        print(f"\n{'Content type':<60} {'Files':>6} {'Size':>12}")
+        print("-" * 80)
+        for content_type, totals in summary['by_content_type'].items():
+            print(f"{content_type[:60]:<60} {totals['count']:>6} {format_bytes(totals['bytes']):>12}")
+
+    largest = sorted((entry for entry in pending if entry.get('size')), key=lambda entry: entry['size'], reverse=True)
+    if largest:
+        print(f"\nLargest downloads:")
+        for entry in largest[:LARGEST_SHOWN]:
+            print(f"  - {entry['filename']}: {format_bytes(entry['size'])}")
+
+    problems = [entry for entry in pending if probe_problem(entry)]
+    if problems:
+        print(f"\n⚠ URLs that failed to probe ({len(problems)}; only 404/410 are skipped):")
+        for entry in problems:
+            print(f"  - {entry['url'][:80]}: {probe_problem(entry)}")
+
+    shared = [entry for entry in plan if len(entry['references']) > 1]
+    if shared:
+        print(f"\nMaterials linked from several meetings ({len(shared)}):")
+        for entry in shared:
+            print(f"  - {entry['filename']}: {len(entry['references'])} references")
 
 
 def main():
-    """Process all JSON files in batch"""
+    """Plan, then download, all materials in batch"""
     print("=" * 80)
     print("BATCH MATERIALS DOWNLOADER (PDF/PPT)")
     print("=" * 80)
     print()
 
-    # Find all JSON files with materials (PDFs/PPTs)
-    print("Scanning for files with downloadable materials...")
-    files_to_process = []
-
-    for json_file in sorted(STRUCTURED_JSON.glob('*.json')):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Check if any topics have materials (PDF/PPT)
-            has_materials = False
-            for topic in data.get('topics', []):
-                for material in topic.get('materials', []):
-                    mat_type = material.get('type', '')
-                    url = material.get('url', '')
-                    if mat_type == 'slides' or '.pdf' in url.lower() or '.ppt' in url.lower():
-                        has_materials = True
-                        break
-                if has_materials:
-                    break
-
-            if has_materials:
-                files_to_process.append(json_file)
-        except Exception as e:
-            print(f"  ⚠ Error reading {json_file.name}: {e}")
-
-    print(f"Found {len(files_to_process)} files to process")
-    print()
+    args = sys.argv[1:]
+    dry_run = '--dry-run' in args
+    force = '--force' in args
 
-    if not files_to_process:
+    download_materials = load_downloader()
+    workers = next((int(a.split('=', 1)[1]) for a in args if a.startswith('--workers=')),
+                   download_materials.DOWNLOAD_WORKERS)
+
+    # Phase 1: plan
+    print("Scanning structured JSON for downloadable materials...")
+    plan = download_materials.build_plan(sorted(STRUCTURED_JSON.glob('*.json')))
+    if not plan:
         print("No files with downloadable materials found!")
         return
 
-    # Process each file
+    fetcher = download_materials.MaterialsFetcher()
+    pending = download_materials.pending_entries(plan, force)
+    print(f"Probing {len(pending)} URLs...")
+    start_time = time.time()
+    download_materials.probe_plan(plan, fetcher, force)
+    print(f"Probed in {time.time() - start_time:.1f} seconds")
+    print()
+
+    summary = summarize_plan(download_materials, plan, pending)
+    print_plan_report(plan, pending, summary)
+
+    if dry_run:
+        with open(PLAN_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'entries': plan,
+                       'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')}, f, indent=2, ensure_ascii=False)
+        print(f"\n✓ Plan saved to: {PLAN_FILE}")
+        print("Dry run: nothing downloaded")
+        print()
+        return
+
+    # Phase 2: download
+    print("\n" + "=" * 80)
+    print(f"DOWNLOADING {summary['download_requests']} MATERIALS ON {workers} WORKERS")
+    print("=" * 80)
+    updater = download_materials.DataUpdater()
+    start_time = time.time()
+    file_results = download_materials.execute_plan(plan, fetcher, updater, force, workers)
+    elapsed = time.time() - start_time
+
     results = {
-        'total_files': len(files_to_process),
-        'processed_files': 0,
-        'total_materials_downloaded': 0,
-        'total_materials_failed': 0,
-        'files': []
+        'total_files': len(file_results),
+        'processed_files': len(file_results),
+        'total_materials_downloaded': sum(r['materials_downloaded'] for r in file_results.values()),
+        'total_materials_failed': sum(r['materials_failed'] for r in file_results.values()),
+        'unique_downloads': sum(1 for entry in plan if entry['result'] == 'downloaded'),
+        'files': [file_results[name] for name in sorted(file_results)],
     }
 
-    for i, json_file in enumerate(files_to_process, 1):
-        print(f"\n{'=' * 80}")
-        print(f"[{i}/{len(files_to_process)}]")
-        print(f"{'=' * 80}")
-
-        try:
-            # Run the download script for this file
-            result = subprocess.run(
-                ['python3', str(SCRIPT_PATH), json_file.name],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-
-            # Print the output
-            print(result.stdout)
-
-            if result.stderr and 'NotOpenSSLWarning' not in result.stderr:
-                print("STDERR:", result.stderr)
-
-            # Parse output to get counts
-            downloaded, failed = parse_output(result.stdout)
-
-            results['processed_files'] += 1
-            results['total_materials_downloaded'] += downloaded
-            results['total_materials_failed'] += failed
-
-            results['files'].append({
-                'filename': json_file.name,
-                'status': 'success',
-                'materials_downloaded': downloaded,
-                'materials_failed': failed
-            })
-
-            # Small delay to be nice to the server
-            time.sleep(2)
-
-        except subprocess.TimeoutExpired:
-            print(f"  ❌ Timeout processing file")
-            results['files'].append({
-                'filename': json_file.name,
-                'status': 'error',
-                'error': 'Timeout'
-            })
-        except Exception as e:
-            print(f"  ❌ Error processing file: {e}")
-            results['files'].append({
-                'filename': json_file.name,
-                'status': 'error',
-                'error': str(e)
-            })
-
     # Generate summary report
     print("\n" + "=" * 80)
     print("BATCH PROCESSING COMPLETE")
     print("=" * 80)
     print(f"\nFiles processed: {results['processed_files']}/{results['total_files']}")
+    print(f"Unique materials downloaded: {results['unique_downloads']}")
     print(f"Total materials downloaded: {results['total_materials_downloaded']}")
     print(f"Total materials failed: {results['total_materials_failed']}")
+    print(f"Time elapsed: {elapsed:.1f} seconds")
 
     # Show files with failures
-    failed_files = [f for f in results['files'] if f.get('materials_failed', 0) > 0 or f.get('status') == 'error']
+    failed_files = [f for f in results['files'] if f.get('materials_failed', 0) > 0]
     if failed_files:
         print(f"\n⚠ Files with issues ({len(failed_files)}):")
         for f in failed_files:
-            if f['status'] == 'error':
-                print(f"  - {f['filename']}: ERROR - {f.get('error', 'Unknown')}")
-            else:
-                print(f"  - {f['filename']}: {f['materials_failed']} materials failed")
+            print(f"  - {f['filename']}: {f['materials_failed']} materials failed")
 
     # Show success summary
-    success_files = [f for f in results['files'] if f.get('status') == 'success' and f.get('materials_downloaded', 0) > 0]
+    success_files = [f for f in results['files'] if f.get('materials_downloaded', 0) > 0]
     if success_files:
         print(f"\n✓ Files with successful downloads ({len(success_files)}):")
         for f in success_files:
@@ -1,13 +1,33 @@
 #!/usr/bin/env python3
 """
 Batch Extraction Script
-Runs V2 extraction on all 50 XML files
+Runs V2 extraction on every category folder written by extract-individual-items.py
+(monthly-meetings, strategic-investing, retirement-investing, other) in one run
+
+- All files of all categories go through a single shared process pool
+- Each category has an extraction profile: which detect_format branches it
+  extracts (files in other formats are skipped and listed) and which
+  structured-xml/structured-json subfolder it writes to
+- Monthly meetings keep writing to the top level, which the downloaders and
+  markdown generator read; the other categories get their own subfolders
+- Profiles can be overridden with PROFILES_FILE (a JSON object of the same
+  shape as CATEGORY_PROFILES); each entry is merged onto the built-in profile
+  of its category, so it only needs the keys it changes. New categories
+  default to every format and an output subfolder named after the category
+
+Usage: python batch-extract-all.py [<category> ...] [--workers=N]
 """
 
+import contextlib
+import io
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import time
 import importlib.util
+import xml.etree.ElementTree as ET
 
 # Load the V2 extraction script
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -18,66 +38,150 @@ extract_v2 = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(extract_v2)
 
 DataExtractor = extract_v2.DataExtractor
-process_single_file = extract_v2.process_single_file
 
-INDIVIDUAL_POSTS = PROJECT_ROOT / 'AAII-Migration-assets' / 'individual-posts' / 'monthly-meetings'
+INDIVIDUAL_POSTS_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'individual-posts'
+PROFILES_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'extraction-profiles.json'
+
+# Per-category extraction profiles, keyed by individual-posts folder.
+# formats: detect_format labels to extract (None = every format)
+# output:  subfolder of structured-xml/ and structured-json/ ('' = top level)
+CATEGORY_PROFILES = {
+    'monthly-meetings': {
+        'formats': None,
+        'output': '',
+    },
+    'strategic-investing': {
+        'formats': None,
+        'output': 'strategic-investing',
+    },
+    'retirement-investing': {
+        'formats': None,
+        'output': 'retirement-investing',
+    },
+    # Uncategorised posts are only meetings if they carry topic markup
+    'other': {
+        'formats': [extract_v2.FORMAT_TOPIC_MARKERS, extract_v2.FORMAT_TOPICS_SUBTITLE],
+        'output': 'other',
+    },
+}
+
+_extractor = None
+
+
+def load_profiles():
+    """CATEGORY_PROFILES with the per-category overrides from PROFILES_FILE merged on top"""
+    profiles = {category: dict(profile) for category, profile in CATEGORY_PROFILES.items()}
+    if not PROFILES_FILE.exists():
+        return profiles
+    with open(PROFILES_FILE, 'r', encoding='utf-8') as f:
+        overrides = json.load(f)
+    for category, override in overrides.items():
+        unknown = set(override.get('formats') or []) - set(extract_v2.FORMATS)
+        if unknown:
+            raise ValueError(f"{PROFILES_FILE.name}: unknown formats for {category}: {sorted(unknown)}")
+        base = profiles.get(category, {'formats': None, 'output': category})
+        profiles[category] = {**base, **override}
+    print(f"Extraction profiles: {PROFILES_FILE} (overrides for {', '.join(overrides)})")
+    return profiles
+
+
+def extract_file(task):
+    """
+    Extract and write one file in a worker process.
+    Returns (category, filename, status, format, topic count, log) with status
+    'success', 'skipped' or 'failed'; log is the extractor's captured output.
+    """
+    global _extractor
+    if _extractor is None:
+        _extractor = DataExtractor()
+
+    category, xml_file, profile = task
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            root = ET.parse(xml_file).getroot()
+            content = extract_v2.ITEM_READER.read(root)['content']
+            fmt = _extractor.detect_format(content) if content else ''
+            if profile['formats'] is not None and fmt not in profile['formats']:
+                return category, xml_file.name, 'skipped', fmt, 0, log.getvalue()
+
+            meeting = _extractor.extract_meeting_from_item(root, xml_file.name)
+            if not meeting:
+                return category, xml_file.name, 'failed', fmt, 0, log.getvalue()
+            extract_v2.write_meeting(meeting, xml_file.stem, profile['output'])
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            return category, xml_file.name, 'failed', '', 0, log.getvalue()
+    return category, xml_file.name, 'success', fmt, len(meeting.topics), log.getvalue()
 
 
 def main():
-    """Process all XML files"""
+    """Process all XML files of every category"""
     print("=" * 80)
-    print("BATCH V2 EXTRACTION - ALL 50 FILES")
+    print("BATCH V2 EXTRACTION - ALL CATEGORIES")
     print("=" * 80)
     print()
 
-    # Get all XML files
-    xml_files = sorted(INDIVIDUAL_POSTS.glob('*.xml'))
-
-    print(f"Found {len(xml_files)} XML files to process")
+    args = sys.argv[1:]
+    workers = next((int(a.split('=', 1)[1]) for a in args if a.startswith('--workers=')), None)
+    profiles = load_profiles()
+    categories = [a for a in args if not a.startswith('--')] or list(profiles)
+
+    unknown = [c for c in categories if c not in profiles]
+    if unknown:
+        print(f"❌ No extraction profile for: {', '.join(unknown)}")
+        print(f"   Known categories: {', '.join(profiles)}")
+        return
+
+    # Gather files of every category up front so one pool serves them all
+    tasks = []
+    for category in categories:
+        xml_files = sorted((INDIVIDUAL_POSTS_DIR / category).glob('*.xml'))
+        profile = profiles[category]
+        formats = ', '.join(profile['formats']) if profile['formats'] else 'all formats'
+        output = f"structured-*/{profile['output']}/" if profile['output'] else 'structured-*/'
+        print(f"{category}: {len(xml_files)} files ({formats}) → {output}")
+        tasks += [(category, xml_file, profile) for xml_file in xml_files]
+
+    print(f"\nFound {len(tasks)} XML files to process on {workers or os.cpu_count()} workers")
     print()
 
-    extractor = DataExtractor()
-    results = {
-        'success': [],
-        'failed': [],
-        'total': len(xml_files)
-    }
+    results = {category: {'success': [], 'skipped': [], 'failed': []} for category in categories}
+    formats = {}
 
     start_time = time.time()
 
-    # Process each file
-    for i, xml_file in enumerate(xml_files, 1):
-        print(f"\n[{i}/{len(xml_files)}] Processing {xml_file.name}")
-        print("-" * 80)
-
-        try:
-            meeting = process_single_file(xml_file, extractor)
-            if meeting:
-                results['success'].append(xml_file.name)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i, (category, filename, status, fmt, topics, log) in enumerate(pool.map(extract_file, tasks), 1):
+            results[category][status].append(filename)
+            if status == 'success':
+                formats[fmt] = formats.get(fmt, 0) + 1
+                print(f"[{i}/{len(tasks)}] ✓ {category}/{filename}: {topics} topics")
+            elif status == 'skipped':
+                print(f"[{i}/{len(tasks)}] - {category}/{filename}: skipped ({fmt})")
             else:
-                results['failed'].append(xml_file.name)
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            results['failed'].append(xml_file.name)
-
-        # Brief pause between requests
-        if i < len(xml_files):
-            time.sleep(0.5)
+                print(f"[{i}/{len(tasks)}] ✗ {category}/{filename}")
+                for line in log.strip().splitlines():
+                    print(f"    {line}")
 
     # Summary
     elapsed = time.time() - start_time
     print("\n" + "=" * 80)
     print("BATCH EXTRACTION COMPLETE")
     print("=" * 80)
-    print(f"\nTotal files: {results['total']}")
-    print(f"✓ Success: {len(results['success'])}")
-    print(f"✗ Failed: {len(results['failed'])}")
+    print(f"\nTotal files: {len(tasks)}")
+    print(f"\n{'Category':<24} {'Success':>8} {'Skipped':>8} {'Failed':>8}")
+    print("-" * 52)
+    for category, result in results.items():
+        print(f"{category:<24} {len(result['success']):>8} {len(result['skipped']):>8} {len(result['failed']):>8}")
+    print(f"\nFormats extracted: " + ', '.join(f"{fmt} ({n})" for fmt, n in sorted(formats.items())))
     print(f"Time elapsed: {elapsed:.1f} seconds")
 
-    if results['failed']:
+    failed = [(category, filename) for category, result in results.items() for filename in result['failed']]
+    if failed:
         print(f"\nFailed files:")
-        for filename in results['failed']:
-            print(f"  - {filename}")
+        for category, filename in failed:
+            print(f"  - {category}/{filename}")
 
     print(f"\n✓ Extraction complete!")
     print(f"✓ Structured XML files: AAII-Migration-assets/output/structured-xml/")
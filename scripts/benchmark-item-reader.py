@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Item Reader Benchmark
+Compares per-field find() lookups against the single-pass wp_export.ItemReader
+on large <item> elements:
+- V2 extraction fields: metadata, custom fields and content:encoded
+- Splitter fields: title/type/status/date/id/modified, categories and the
+  postmeta filter applied to every entry
+Items are the monthly meeting posts, padded with synthetic postmeta and
+comments to the size of heavy export items (or the heaviest items of a real
+export when one is given). Also checks that both readers return the same data.
+
+Usage: python benchmark-item-reader.py [<export.xml>] [--postmeta=N] [--comments=N]
+"""
+
+import copy
+import heapq
+import importlib.util
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import wp_export
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = PROJECT_ROOT / 'scripts'
+ITEMS_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'individual-posts' / 'monthly-meetings'
+
+NS = wp_export.NAMESPACES
+WP = wp_export.WP
+
+REPEATS = 5
+DEFAULT_POSTMETA = 200
+DEFAULT_COMMENTS = 20
+EXPORT_ITEMS = 50
+
+# Keys typical of a WordPress/Visual Composer export, cycled for the padding
+PADDING_KEYS = ['_edit_last', '_wpb_vc_js_status', '_yoast_wpseo_title', 'dfd_post_layout',
+                'crum_page_custom_bg', '_oembed_time', 'slide_template', '_pingsme',
+                '_wp_page_template', 'stunnig_headers_custom']
+
+
+def load_script(name: str, filename: str):
+    """Load a hyphenated script as a module"""
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def pad_item(item: ET.Element, postmeta: int, comments: int) -> ET.Element:
+    """Copy of an item with extra postmeta and comment children"""
+    item = copy.deepcopy(item)
+    for i in range(postmeta):
+        meta = ET.SubElement(item, WP + 'postmeta')
+        ET.SubElement(meta, WP + 'meta_key').text = f"{PADDING_KEYS[i % len(PADDING_KEYS)]}_{i}"
+        ET.SubElement(meta, WP + 'meta_value').text = 'x' * 40
+    for i in range(comments):
+        comment = ET.SubElement(item, WP + 'comment')
+        ET.SubElement(comment, WP + 'comment_id').text = str(i)
+        ET.SubElement(comment, WP + 'comment_content').text = 'Thanks for the talk. ' * 10
+    return item
+
+
+def heaviest_export_items(xml_file: Path, count: int):
+    """Copies of the export items with the most children"""
+    heaviest = []
+    for n, item in enumerate(wp_export.iter_items(xml_file)):
+        if len(heaviest) < count:
+            heapq.heappush(heaviest, (len(item), n, copy.deepcopy(item)))
+        elif len(item) > heaviest[0][0]:
+            heapq.heapreplace(heaviest, (len(item), n, copy.deepcopy(item)))
+    return [item for _, _, item in heaviest]
+
+
+def text(item, path):
+    """Text of a child element, or ''"""
+    elem = item.find(path, NS)
+    return elem.text if elem is not None else ''
+
+
+def extractor_fields_find(item, keep_keys):
+    """V2 extraction fields, one find() per field (the previous implementation)"""
+    metadata = {
+        'title': text(item, 'title'),
+        'link': text(item, 'link'),
+        'post_id': text(item, 'wp:post_id'),
+        'post_name': text(item, 'wp:post_name'),
+        'post_date': text(item, 'wp:post_date'),
+        'category': text(item, 'category'),
+        'creator': text(item, 'dc:creator'),
+    }
+    custom_fields = []
+    for postmeta in item.findall('wp:postmeta', NS):
+        meta_key = postmeta.find('wp:meta_key', NS)
+        meta_value = postmeta.find('wp:meta_value', NS)
+        if meta_key is not None and meta_value is not None and meta_key.text in keep_keys:
+            custom_fields.append({'meta_key': meta_key.text, 'meta_value': meta_value.text or ''})
+    return metadata, custom_fields, text(item, 'content:encoded')
+
+
+def extractor_fields_reader(item, reader, fields):
+    """V2 extraction fields from one ItemReader pass"""
+    record = reader.read(item)
+    metadata = {field: record[field] for field in fields}
+    custom_fields = [{'meta_key': key, 'meta_value': value}
+                     for key, value, _, keep, _ in record['postmeta'] if keep and value is not None]
+    return metadata, custom_fields, record['content']
+
+
+def splitter_fields_find(item, classify):
+    """Splitter fields, one find() per field and a filter loop over the children (the previous implementation)"""
+    fields = [text(item, path) for path in ('title', 'wp:post_type', 'wp:status', 'wp:post_date',
+                                            'wp:post_id', 'wp:post_modified')]
+    categories = [c.text or '' for c in item.findall('category[@domain="category"]')]
+    kept = []
+    stats = {}
+    for child in item:
+        if child.tag.endswith('postmeta'):
+            meta_key = child.find(WP + 'meta_key')
+            if meta_key is not None and meta_key.text:
+                keep, rule = classify(meta_key.text)
+                stats[rule] = stats.get(rule, 0) + 1
+                if keep:
+                    kept.append(child)
+        else:
+            kept.append(child)
+    return fields, categories, kept, stats
+
+
+def splitter_fields_reader(item, reader):
+    """Splitter fields from one ItemReader pass"""
+    record = reader.read(item)
+    fields = [record[key] for key in ('title', 'post_type', 'status', 'post_date', 'post_id', 'post_modified')]
+    stats = {}
+    for _, _, _, _, rule in record['postmeta']:
+        stats[rule] = stats.get(rule, 0) + 1
+    return fields, record['categories'], record['children'], stats
+
+
+def best_of(fn, repeats: int = REPEATS) -> float:
+    """Run fn repeatedly and return the best wall time in seconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("ITEM READER BENCHMARK")
+    print("=" * 80)
+    print()
+
+    args = sys.argv[1:]
+    postmeta = next((int(a.split('=', 1)[1]) for a in args if a.startswith('--postmeta=')), DEFAULT_POSTMETA)
+    comments = next((int(a.split('=', 1)[1]) for a in args if a.startswith('--comments=')), DEFAULT_COMMENTS)
+    paths = [a for a in args if not a.startswith('--')]
+
+    extract_v2 = load_script('extract_v2', 'extract-structured-data-v2.py')
+    splitter = load_script('extract_items', 'extract-individual-items.py')
+
+    if paths:
+        items = heaviest_export_items(Path(paths[0]), EXPORT_ITEMS)
+        print(f"Items: the {len(items)} heaviest of {paths[0]}")
+    else:
+        items = [pad_item(ET.parse(f).getroot(), postmeta, comments) for f in sorted(ITEMS_DIR.glob('*.xml'))]
+        print(f"Items: {len(items)} monthly meetings padded with {postmeta} postmeta and {comments} comments")
+    if not items:
+        print("❌ No items to benchmark")
+        return
+
+    children = sum(len(item) for item in items)
+    print(f"Children per item: {children / len(items):.0f} on average")
+    print(f"Best of {REPEATS} runs")
+    print()
+
+    keep_keys = extract_v2.CUSTOM_FIELD_KEYS
+    extractor_reader = extract_v2.ITEM_READER
+    postmeta_filter = splitter.get_postmeta_filter()
+    splitter_reader = wp_export.ItemReader(postmeta_filter.classify)
+
+    cases = [
+        ('extractor', lambda item: extractor_fields_find(item, keep_keys),
+         lambda item: extractor_fields_reader(item, extractor_reader, extract_v2.METADATA_FIELDS)),
+        ('splitter', lambda item: splitter_fields_find(item, postmeta_filter.classify),
+         lambda item: splitter_fields_reader(item, splitter_reader)),
+    ]
+
+    print(f"{'Fields':<12} {'find() (ms)':>14} {'reader (ms)':>14} {'Per item (us)':>15} {'Speedup':>9}")
+    print("-" * 68)
+    mismatches = []
+    for name, find_fn, reader_fn in cases:
+        find_time = best_of(lambda: [find_fn(item) for item in items])
+        reader_time = best_of(lambda: [reader_fn(item) for item in items])
+        per_item = reader_time / len(items) * 1e6
+        print(f"{name:<12} {find_time * 1000:>14.1f} {reader_time * 1000:>14.1f} {per_item:>15.1f} "
+              f"{find_time / reader_time:>8.2f}x")
+        mismatches += [(name, n) for n, item in enumerate(items) if find_fn(item) != reader_fn(item)]
+
+    if mismatches:
+        print(f"\n⚠ {len(mismatches)} items read differently:")
+        for name, n in mismatches[:10]:
+            print(f"  - {name}: item {n}")
+    else:
+        print(f"\n✓ Both readers return the same fields for all {len(items)} items")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+XML Backend Benchmark
+Compares the ElementTree and lxml backends on the full structured output set:
+- generate_structured_xml for every meeting in individual-posts/monthly-meetings
+- DataUpdater.update_xml (speaker images + materials) using the local paths
+  already recorded in structured-json
+Also checks that both backends produce canonically identical XML.
+"""
+
+import xml.etree.ElementTree as ET
+import importlib.util
+import contextlib
+import io
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import xml_backend
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = PROJECT_ROOT / 'scripts'
+STRUCTURED_JSON = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-json'
+
+REPEATS = 5
+
+
+def load_script(name: str, filename: str):
+    """Load a hyphenated script as a module"""
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def collect_updates(json_file: Path):
+    """Rebuild the image/material update dicts the downloaders would pass to update_xml"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    image_updates = {}
+    material_updates = {}
+    for topic in data.get('topics', []):
+        for speaker_idx, speaker in enumerate(topic.get('speakers', [])):
+            if speaker.get('photo_local_path'):
+                image_updates.setdefault(topic['id'], {})[speaker_idx] = speaker['photo_local_path']
+        for material_idx, material in enumerate(topic.get('materials', [])):
+            if material.get('local_path'):
+                material_updates.setdefault(topic['id'], []).append({
+                    'material_index': material_idx,
+                    'local_path': material['local_path']
+                })
+    return image_updates, material_updates
+
+
+def best_of(fn, repeats: int = REPEATS) -> float:
+    """Run fn repeatedly and return the best wall time in seconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("XML BACKEND BENCHMARK")
+    print("=" * 80)
+    print()
+
+    extract_v2 = load_script('extract_v2', 'extract-structured-data-v2.py')
+    images = load_script('download_images', 'download-speaker-images.py')
+    materials = load_script('download_materials', 'download-materials.py')
+
+    # Extract every meeting once (not timed)
+    extractor = extract_v2.DataExtractor()
+    meetings = []
+    for xml_file in sorted(extract_v2.INDIVIDUAL_POSTS.glob('*.xml')):
+        with contextlib.redirect_stdout(io.StringIO()):
+            meeting = extractor.extract_meeting(xml_file)
+        if meeting:
+            updates = collect_updates(STRUCTURED_JSON / f"{xml_file.stem}.json") \
+                if (STRUCTURED_JSON / f"{xml_file.stem}.json").exists() else ({}, {})
+            meetings.append((xml_file.stem, meeting, updates))
+
+    print(f"Meetings: {len(meetings)}")
+    print(f"lxml available: {'yes' if xml_backend.HAS_LXML else 'no (ElementTree only)'}")
+    print(f"Best of {REPEATS} runs")
+    print()
+
+    backends = ['etree'] + (['lxml'] if xml_backend.HAS_LXML else [])
+    work_dir = Path(tempfile.mkdtemp(prefix='xml-bench-'))
+    results = {}
+    original_backend = xml_backend.BACKEND
+
+    try:
+        for backend in backends:
+            out_dir = work_dir / backend
+            out_dir.mkdir()
+            xml_backend.BACKEND = backend
+
+            def generate():
+                for stem, meeting, _ in meetings:
+                    extract_v2.generate_structured_xml(meeting, out_dir / f"{stem}.xml")
+
+            def update():
+                # Annotators mutate files in place, so start every run from fresh output
+                generate()
+                for stem, _, (image_updates, material_updates) in meetings:
+                    xml_file = out_dir / f"{stem}.xml"
+                    if image_updates:
+                        images.DataUpdater.update_xml(xml_file, image_updates)
+                    if material_updates:
+                        materials.DataUpdater.update_xml(xml_file, material_updates)
+
+            gen_time = best_of(generate)
+            total_time = best_of(update)
+            results[backend] = {
+                'generate': gen_time,
+                'update': max(total_time - gen_time, 0.0),
+                'dir': out_dir
+            }
+    finally:
+        xml_backend.BACKEND = original_backend
+
+    print(f"{'Backend':<10} {'Generate (ms)':>15} {'Update (ms)':>15} {'Per meeting (ms)':>18}")
+    print("-" * 60)
+    for backend, r in results.items():
+        per_meeting = (r['generate'] + r['update']) / max(len(meetings), 1) * 1000
+        print(f"{backend:<10} {r['generate'] * 1000:>15.1f} {r['update'] * 1000:>15.1f} {per_meeting:>18.2f}")
+
+    if 'lxml' in results:
+        speedup_gen = results['etree']['generate'] / results['lxml']['generate']
+        speedup_upd = results['etree']['update'] / results['lxml']['update'] if results['lxml']['update'] else 0
+        print(f"\nlxml speedup: generate {speedup_gen:.2f}x, update {speedup_upd:.2f}x")
+
+        # Outputs must be the same document regardless of backend
+        mismatches = []
+        for stem, _, _ in meetings:
+            a = ET.canonicalize(from_file=str(results['etree']['dir'] / f"{stem}.xml"))
+            b = ET.canonicalize(from_file=str(results['lxml']['dir'] / f"{stem}.xml"))
+            if a != b:
+                mismatches.append(stem)
+
+        if mismatches:
+            print(f"\n⚠ {len(mismatches)} files differ between backends:")
+            for stem in mismatches[:10]:
+                print(f"  - {stem}.xml")
+        else:
+            print(f"\n✓ All {len(meetings)} outputs canonically identical across backends")
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,55 +2,280 @@
 """
 Materials Downloader (PDF/PPT)
 Downloads presentation materials from live webpages and updates structured data with local paths
+
+Downloads are resumable: bytes are streamed into <name>.part next to a
+<name>.part.json holding the server's validators (ETag/Last-Modified), and an
+interrupted transfer - in this run or a later one - continues with a Range
+request guarded by If-Range. Completed files are checked (length, digest
+header when sent, file signature) before being moved into place.
+
+Materials already downloaded from the same URL are not fetched again unless
+--force is given; URL_MAP_FILE records which URL each file came from.
+
+Usage: python download-materials.py <filename.json> [--force]
 """
 
-import xml.etree.ElementTree as ET
-import requests
+import base64
 import json
+import os
 import re
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 import hashlib
 
+import requests
+import urllib3
+
+import http_client
+import xml_backend
+import asset_manifest
+import material_processing
+
 PROJECT_ROOT = Path(__file__).parent.parent
 STRUCTURED_JSON = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-json'
 STRUCTURED_XML = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-xml'
 MATERIALS_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'assets' / 'materials'
+# Which URL each downloaded file was fetched from ({filename: url})
+URL_MAP_FILE = MATERIALS_DIR / 'url-map.json'
+
+CHUNK_SIZE = 256 * 1024
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30          # longest stall between chunks, not a limit on the whole transfer
+RESUME_ATTEMPTS = 5        # interrupted transfers resumed within one run
+DOWNLOAD_WORKERS = 4       # concurrent material downloads in a planned batch
+PROBE_WORKERS = 8          # concurrent HEAD requests while planning
+GONE_STATUSES = (404, 410)  # probe results that are not requested again
+
+# Leading bytes of each material format, to catch error pages served as 200
+SIGNATURES = {
+    '.pdf': (b'%PDF-',),
+    '.ppt': (b'\xd0\xcf\x11\xe0',),   # OLE2 compound file
+    '.pps': (b'\xd0\xcf\x11\xe0',),
+    '.pptx': (b'PK\x03\x04',),         # Office Open XML (zip)
+    '.ppsx': (b'PK\x03\x04',),
+}
+
+# Digest header algorithm names -> hashlib names
+DIGEST_ALGORITHMS = {'sha-256': 'sha256', 'sha-512': 'sha512', 'md5': 'md5'}
+
+RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                    urllib3.exceptions.ProtocolError, urllib3.exceptions.ReadTimeoutError)
+
+
+class IncompleteDownload(Exception):
+    """The transfer stopped before the expected length; the .part file can be resumed"""
+
+
+def partial_paths(output_path: Path) -> Tuple[Path, Path]:
+    """(<name>.part, <name>.part.json) for an output file"""
+    return (output_path.with_name(output_path.name + '.part'),
+            output_path.with_name(output_path.name + '.part.json'))
+
+
+def parse_content_range(value: str) -> Tuple[Optional[int], Optional[int]]:
+    """'bytes 100-199/1000' -> (100, 1000); total is None when unknown ('*')"""
+    match = re.match(r'bytes\s+(\d+)-\d+/(\d+|\*)', value or '')
+    if not match:
+        return None, None
+    return int(match.group(1)), (int(match.group(2)) if match.group(2) != '*' else None)
+
+
+def expected_digest(headers, full_body: bool) -> Optional[Tuple[str, str]]:
+    """(hashlib name, base64 value) from Repr-Digest/Digest, or Content-MD5 on a full response"""
+    for header in ('Repr-Digest', 'Digest'):
+        for item in headers.get(header, '').split(','):
+            algorithm, _, value = item.strip().partition('=')
+            name = DIGEST_ALGORITHMS.get(algorithm.strip().lower())
+            if name and value:
+                return name, value.strip().strip(':')
+    if full_body and headers.get('Content-MD5'):
+        return 'md5', headers['Content-MD5'].strip()
+    return None
+
+
+def file_digest(path: Path, algorithm: str) -> str:
+    """Base64 digest of a file, as sent in digest headers"""
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return base64.b64encode(digest.digest()).decode('ascii')
+
+
+def check_integrity(part_path: Path, state: Dict, output_path: Path) -> Optional[str]:
+    """Problem with a completed download, or None if it looks intact"""
+    size = part_path.stat().st_size
+    if state.get('size') is not None and size != state['size']:
+        return f"expected {state['size']} bytes, got {size}"
+    if state.get('digest'):
+        algorithm, value = state['digest']
+        if file_digest(part_path, algorithm) != value:
+            return f"{algorithm} digest mismatch"
+    signatures = SIGNATURES.get(output_path.suffix.lower())
+    if signatures:
+        with open(part_path, 'rb') as f:
+            head = f.read(max(len(sig) for sig in signatures))
+        if not head.startswith(signatures):
+            return f"not a {output_path.suffix.lower()[1:].upper()} file"
+    return None
 
 
 class MaterialsFetcher:
     """Fetches materials (PDF/PPT) from URLs with proper headers"""
 
-    def __init__(self):
-        self.session = requests.Session()
-        # Mimic real browser headers
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Mobile Safari/537.36',
-            'Accept': 'application/pdf,application/vnd.ms-powerpoint,application/vnd.openxmlformats-officedocument.presentationml.presentation,*/*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Cache-Control': 'no-cache',
-            'Referer': 'https://aaiila.org/'
-        })
+    def __init__(self, limiter: Optional[http_client.HostLimiter] = None):
+        self.limiter = limiter or http_client.HostLimiter()
+        self.session = http_client.session('document', max(DOWNLOAD_WORKERS, PROBE_WORKERS))
 
-    def download_material(self, material_url: str, output_path: Path) -> bool:
-        """Download material from URL to local path"""
+    def probe(self, material_url: str) -> Dict:
+        """Expected size and content type of a material, without downloading it"""
+        headers = {'Accept-Encoding': 'identity'}
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
         try:
-            response = self.session.get(material_url, timeout=30)
-            if response.status_code == 200:
-                with open(output_path, 'wb') as f:
-                    f.write(response.content)
-                return True
+            with self.limiter.slot(material_url):
+                response = self.session.head(material_url, headers=headers, allow_redirects=True, timeout=timeout)
+                size = response.headers.get('Content-Length')
+                size = int(size) if response.status_code == 200 and size and size.isdigit() else None
+                if response.status_code not in (200, *GONE_STATUSES) or size is None:
+                    # Some servers refuse HEAD; a one-byte range reports the total in Content-Range
+                    with self.session.get(material_url, headers={**headers, 'Range': 'bytes=0-0'}, stream=True,
+                                          timeout=timeout) as response:
+                        if response.status_code == 206:
+                            size = parse_content_range(response.headers.get('Content-Range'))[1]
+                        elif response.status_code == 200:
+                            length = response.headers.get('Content-Length')
+                            size = int(length) if length and length.isdigit() else None
+        except requests.RequestException as e:
+            return {'status': None, 'size': None, 'content_type': None, 'error': str(e)}
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip() or None
+        return {'status': response.status_code, 'size': size, 'content_type': content_type}
+
+    def download_material(self, material_url: str, output_path: Path) -> bool:
+        """Download material from URL to local path, resuming any earlier partial download"""
+        part_path, state_path = partial_paths(output_path)
+        state = self.load_partial(material_url, part_path, state_path)
+        if state:
+            print(f"    ↻ Resuming from {part_path.stat().st_size} bytes")
+
+        for attempt in range(1, RESUME_ATTEMPTS + 1):
+            try:
+                if not self.fetch_into(material_url, part_path, state_path, state):
+                    return False
+                break
+            except IncompleteDownload as e:
+                received = part_path.stat().st_size if part_path.exists() else 0
+                print(f"    ⚠ Interrupted at {received} bytes ({e}), attempt {attempt}/{RESUME_ATTEMPTS}")
+                time.sleep(min(http_client.BACKOFF_FACTOR * 2 ** (attempt - 1), http_client.BACKOFF_MAX))
+            except Exception as e:
+                print(f"    ⚠ Download error: {e}")
+                return False
+        else:
+            print(f"    ⚠ Giving up for now; {part_path.name} is kept for the next run")
+            return False
+
+        problem = check_integrity(part_path, state, output_path)
+        if problem:
+            print(f"    ⚠ Integrity check failed: {problem}")
+            part_path.unlink()
+            state_path.unlink(missing_ok=True)
+            return False
+
+        os.replace(part_path, output_path)
+        state_path.unlink(missing_ok=True)
+        return True
+
+    @staticmethod
+    def load_partial(material_url: str, part_path: Path, state_path: Path) -> Dict:
+        """Validators of a resumable .part file for this URL, or {} (stale partials are removed)"""
+        state = {}
+        if part_path.exists() and state_path.exists():
+            try:
+                with open(state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+        if state.get('url') == material_url and (state.get('etag') or state.get('last_modified')):
+            return state
+        part_path.unlink(missing_ok=True)
+        state_path.unlink(missing_ok=True)
+        return {}
+
+    def fetch_into(self, material_url: str, part_path: Path, state_path: Path, state: Dict) -> bool:
+        """
+        One request appending to (or restarting) the .part file; updates state in place.
+        Returns False on an HTTP error; raises IncompleteDownload if the transfer
+        stops early.
+        """
+        validator = state.get('etag') or state.get('last_modified')
+        # Without a validator the stored bytes cannot be trusted to match the server's
+        offset = part_path.stat().st_size if part_path.exists() and validator else 0
+        # Ranges must address the stored bytes, so ask for no content coding
+        headers = {'Accept-Encoding': 'identity'}
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+            # If the file changed on the server we get the full new file back instead
+            headers['If-Range'] = validator
+
+        with self.limiter.slot(material_url), \
+                self.session.get(material_url, headers=headers, stream=True,
+                                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)) as response:
+            if response.status_code == 416 and offset:
+                if offset == state.get('size'):
+                    # Everything was already received
+                    return True
+                part_path.unlink()
+                raise IncompleteDownload(f"range {offset}- not satisfiable")
+
+            if response.status_code == 206:
+                start, total = parse_content_range(response.headers.get('Content-Range'))
+                if start != offset:
+                    part_path.unlink(missing_ok=True)
+                    raise IncompleteDownload(f"server resumed at {start}, expected {offset}")
+                if total is not None:
+                    state['size'] = total
+                mode = 'ab'
+            elif response.status_code == 200:
+                # New download, or the server ignored/refused the range: start over
+                etag = response.headers.get('ETag', '')
+                length = response.headers.get('Content-Length')
+                state.clear()
+                state.update({
+                    'url': material_url,
+                    # Weak ETags cannot be used in If-Range
+                    'etag': etag if etag and not etag.startswith('W/') else None,
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'size': int(length) if length and length.isdigit()
+                    and not response.headers.get('Content-Encoding') else None,
+                    'digest': expected_digest(response.headers, full_body=True),
+                })
+                with open(state_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, indent=2)
+                mode = 'wb'
             else:
                 print(f"    ⚠ Failed to download: HTTP {response.status_code}")
                 return False
-        except Exception as e:
-            print(f"    ⚠ Download error: {e}")
-            return False
+
+            # Failures before the response are already retried by the session;
+            # a transfer broken mid-body is resumed by the caller. read1 returns
+            # whatever has arrived (up to CHUNK_SIZE) instead of filling a whole
+            # chunk, so every received byte is on disk when the connection drops
+            try:
+                with open(part_path, mode) as f:
+                    while True:
+                        chunk = response.raw.read1(CHUNK_SIZE, decode_content=True)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+            except RETRYABLE_ERRORS as e:
+                raise IncompleteDownload(type(e).__name__) from e
+
+        if state.get('size') is not None and part_path.stat().st_size < state['size']:
+            raise IncompleteDownload(f"{part_path.stat().st_size} of {state['size']} bytes")
+        return True
 
 
 class DataUpdater:
@@ -93,7 +318,7 @@ class DataUpdater:
         material_updates: {topic_id: [{material_index: int, local_path: str}]}
         """
         try:
-            tree = ET.parse(xml_file)
+            tree = xml_backend.parse(xml_file)
             root = tree.getroot()
 
             topics_elem = root.find('topics')
@@ -115,18 +340,10 @@ class DataUpdater:
                             local_path = update['local_path']
 
                             if material_idx < len(material_elems):
-                                material_elem = material_elems[material_idx]
-
-                                # Add local_path element
-                                local_path_elem = ET.Element('local_path')
-                                local_path_elem.text = local_path
+                                # Set local_path in place (appended last), keeping indentation
+                                xml_backend.set_child_text(material_elems[material_idx], 'local_path', local_path)
 
-                                # Append to material element
-                                material_elem.append(local_path_elem)
-
-            # Write back with formatting
-            ET.indent(tree, space='  ')
-            tree.write(xml_file, encoding='utf-8', xml_declaration=True)
+            xml_backend.write(tree, xml_file)
 
             return True
         except Exception as e:
@@ -147,100 +364,263 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
-def process_file(json_file: Path, fetcher: MaterialsFetcher, updater: DataUpdater) -> Tuple[int, int]:
-    """
-    Process a single JSON file to download materials.
-    Returns (materials_downloaded, materials_failed)
-    """
-    print(f"\nProcessing: {json_file.name}")
-    print("=" * 80)
-
-    # Load JSON data
-    try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"  ❌ Failed to load JSON: {e}")
-        return 0, 0
-
-    # Collect all materials that are PDFs or PPTs
-    downloadable_materials = []  # [(topic_id, material_idx, material_obj)]
-
+def downloadable_materials(data: Dict) -> List[Tuple[int, int, Dict]]:
+    """PDF/PPT materials of a meeting as [(topic_id, material_idx, material)]; recordings are skipped"""
+    downloadable = []
     for topic in data.get('topics', []):
-        topic_id = topic['id']
         for material_idx, material in enumerate(topic.get('materials', [])):
             mat_type = material.get('type', '')
             url = material.get('url', '')
-
-            # Only download PDF/PPT files (skip recordings)
             if mat_type == 'slides' or '.pdf' in url.lower() or '.ppt' in url.lower():
-                downloadable_materials.append((topic_id, material_idx, material))
+                downloadable.append((topic['id'], material_idx, material))
+    return downloadable
 
-    if not downloadable_materials:
-        print(f"  ℹ No downloadable materials found (PDFs/PPTs)")
-        return 0, 0
 
-    print(f"  Found {len(downloadable_materials)} downloadable materials")
+def material_filename(url: str, topic_id: int, material_idx: int) -> str:
+    """Local filename for a material URL"""
+    original_filename = Path(urlparse(url).path).name
+
+    # If no filename, generate one
+    if not original_filename or '.' not in original_filename:
+        ext = '.pdf' if '.pdf' in url.lower() else '.ppt'
+        original_filename = f"material_{topic_id}_{material_idx}{ext}"
+
+    return sanitize_filename(original_filename)
+
+
+def update_structured_data(json_file: Path, material_updates: Dict[int, List[Dict]], updater: DataUpdater) -> None:
+    """Write local material paths into a meeting's structured JSON and XML"""
+    if updater.update_json(json_file, material_updates):
+        print(f"    ✓ Updated JSON: {json_file.name}")
+
+    xml_file = STRUCTURED_XML / json_file.name.replace('.json', '.xml')
+    if xml_file.exists():
+        if updater.update_xml(xml_file, material_updates):
+            print(f"    ✓ Updated XML: {xml_file.name}")
 
-    # Download materials
-    materials_downloaded = 0
-    materials_failed = 0
-    material_updates = {}  # {topic_id: [{material_index: int, local_path: str}]}
 
+def load_url_map() -> Dict[str, str]:
+    """{filename: url} of previous downloads, or {}"""
+    if URL_MAP_FILE.exists():
+        try:
+            with open(URL_MAP_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠ Ignoring unreadable {URL_MAP_FILE.name}: {e}")
+    return {}
+
+
+def save_url_map(url_map: Dict[str, str]) -> None:
     MATERIALS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = URL_MAP_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(url_map, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_file, URL_MAP_FILE)
+
+
+def material_owners(json_files: List[Path]) -> Dict[str, str]:
+    """
+    {filename: url} for files in MATERIALS_DIR: the saved URL map first, then
+    the local_path recorded on each material of the given meetings
+    """
+    owners = load_url_map()
+    for json_file in json_files:
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            continue
+        for topic in data.get('topics', []):
+            for material in topic.get('materials', []):
+                local_path = material.get('local_path') or ''
+                if local_path.startswith('assets/materials/') and material.get('url'):
+                    owners.setdefault(local_path[len('assets/materials/'):], material['url'])
+    return owners
+
 
-    for topic_id, material_idx, material in downloadable_materials:
-        url = material.get('url', '')
-        label = material.get('label', 'material')
-
-        # Extract filename from URL
-        parsed_url = urlparse(url)
-        original_filename = Path(parsed_url.path).name
-
-        # If no filename, generate one
-        if not original_filename or '.' not in original_filename:
-            ext = '.pdf' if '.pdf' in url.lower() else '.ppt'
-            original_filename = f"material_{topic_id}_{material_idx}{ext}"
-
-        # Sanitize filename
-        filename = sanitize_filename(original_filename)
-        output_path = MATERIALS_DIR / filename
-        local_path = f"assets/materials/{filename}"
-
-        print(f"\n  Downloading: {label}")
-        print(f"    Topic ID: {topic_id}")
-        print(f"    URL: {url[:80]}...")
-        print(f"    Saving to: {filename}")
-
-        # Download
-        if fetcher.download_material(url, output_path):
-            print(f"    ✓ Downloaded ({output_path.stat().st_size} bytes)")
-            materials_downloaded += 1
-
-            # Track for updating structured data
-            if topic_id not in material_updates:
-                material_updates[topic_id] = []
-            material_updates[topic_id].append({
+def build_plan(json_files: List[Path]) -> List[Dict]:
+    """
+    Scan the given structured JSON once and return the download plan: one entry
+    per unique material URL, listing every (meeting, topic, material) that links it.
+
+    Filenames already owned by a URL (URL_MAP_FILE, or a local_path recorded in
+    any meeting) stay with it; other URLs get their plain filename unless it is
+    owned by a different URL, in which case a short URL hash is appended. A file
+    on disk only counts as existing for the URL that owns it.
+    """
+    plan = {}  # {url: entry}
+
+    for json_file in json_files:
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"  ⚠ Error reading {json_file.name}: {e}")
+            continue
+
+        for topic_id, material_idx, material in downloadable_materials(data):
+            url = material.get('url', '')
+            if not url:
+                continue
+            entry = plan.setdefault(url, {'url': url, 'filename': material_filename(url, topic_id, material_idx),
+                                          'exists': False, 'references': []})
+            entry['references'].append({
+                'json_file': json_file.name,
+                'topic_id': topic_id,
                 'material_index': material_idx,
-                'local_path': local_path
+                'recorded': material.get('local_path'),
             })
+
+    # Ownership comes from every meeting, not just the planned ones
+    planned = {json_file.name for json_file in json_files}
+    others = [f for f in sorted(STRUCTURED_JSON.glob('*.json')) if f.name not in planned]
+    owners = material_owners(list(json_files) + others)
+    owned = {}  # {url: filename}
+    for filename, url in owners.items():
+        owned.setdefault(url, filename)
+
+    for url, entry in plan.items():
+        if url in owned:
+            entry['filename'] = owned[url]
+        elif owners.get(entry['filename'], url) != url:
+            stem, dot, ext = entry['filename'].rpartition('.')
+            url_hash = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+            entry['filename'] = f"{stem}-{url_hash}.{ext}" if dot else f"{entry['filename']}-{url_hash}"
+        owners[entry['filename']] = url
+        entry['exists'] = url in owned and (MATERIALS_DIR / entry['filename']).exists()
+        local_path = f"assets/materials/{entry['filename']}"
+        for ref in entry['references']:
+            ref['recorded'] = ref['recorded'] == local_path
+
+    return list(plan.values())
+
+
+def pending_entries(plan: List[Dict], force: bool = False) -> List[Dict]:
+    """Plan entries that need downloading (all of them with force)"""
+    return [entry for entry in plan if force or not entry['exists']]
+
+
+def probe_plan(plan: List[Dict], fetcher: MaterialsFetcher, force: bool = False,
+               workers: int = PROBE_WORKERS) -> None:
+    """Add status, size and content_type to every pending entry, probing concurrently"""
+    pending = pending_entries(plan, force)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for entry, info in zip(pending, pool.map(fetcher.probe, [entry['url'] for entry in pending])):
+            entry.update(info)
+
+
+def execute_plan(plan: List[Dict], fetcher: MaterialsFetcher, updater: DataUpdater, force: bool = False,
+                 workers: int = DOWNLOAD_WORKERS) -> Dict[str, Dict]:
+    """
+    Run a download plan. Each URL is fetched once, largest first, `workers` at a
+    time within the fetcher's per-host limit; every meeting linking it is then
+    updated. Materials already on disk are only recorded, unless force is set;
+    URLs that probed as gone (GONE_STATUSES) are not requested again.
+    Sets entry['result'] ('downloaded', 'existing' or 'failed') and returns one
+    result dict per meeting (same shape as the batch report entries).
+    """
+    MATERIALS_DIR.mkdir(parents=True, exist_ok=True)
+    # Grow the shared connection pool to the download concurrency
+    http_client.session('document', workers)
+
+    results = {}
+    for entry in plan:
+        for ref in entry['references']:
+            results.setdefault(ref['json_file'], {'filename': ref['json_file'], 'status': 'success',
+                                                  'materials_downloaded': 0, 'materials_failed': 0})
+
+    to_download = []
+    for entry in plan:
+        if entry['exists'] and not force:
+            entry['result'] = 'existing'
+        elif entry.get('status') in GONE_STATUSES:
+            entry['result'] = 'failed'
+            print(f"  ❌ {entry['filename']}: HTTP {entry['status']}")
         else:
-            print(f"    ❌ Download failed")
-            materials_failed += 1
+            to_download.append(entry)
+    # Long transfers start first instead of trailing at the end of the queue
+    to_download.sort(key=lambda entry: entry.get('size') or 0, reverse=True)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetcher.download_material, entry['url'], MATERIALS_DIR / entry['filename']): entry
+                   for entry in to_download}
+        for future in as_completed(futures):
+            entry = futures[future]
+            if future.result():
+                entry['result'] = 'downloaded'
+                size = (MATERIALS_DIR / entry['filename']).stat().st_size
+                print(f"  ✓ {entry['filename']} ({size} bytes, {len(entry['references'])} meeting(s))")
+            else:
+                entry['result'] = 'failed'
+                print(f"  ❌ {entry['filename']}: download failed")
+
+    url_map = load_url_map()
+    for entry in plan:
+        if entry['result'] in ('downloaded', 'existing'):
+            url_map[entry['filename']] = entry['url']
+    save_url_map(url_map)
+
+    # Collect local paths per meeting, so each structured file is written once
+    material_updates = {}  # {json name: {topic_id: [{material_index: int, local_path: str}]}}
+    pdfs = []
+    for entry in plan:
+        if entry['result'] == 'failed':
+            for ref in entry['references']:
+                results[ref['json_file']]['materials_failed'] += 1
+            continue
+
+        unrecorded = [ref for ref in entry['references'] if not ref['recorded']]
+        if entry['result'] == 'downloaded':
+            for ref in entry['references']:
+                results[ref['json_file']]['materials_downloaded'] += 1
+        for ref in unrecorded:
+            material_updates.setdefault(ref['json_file'], {}).setdefault(ref['topic_id'], []).append({
+                'material_index': ref['material_index'],
+                'local_path': f"assets/materials/{entry['filename']}"
+            })
+
+        path = MATERIALS_DIR / entry['filename']
+        if path.suffix.lower() == '.pdf' and (entry['result'] == 'downloaded' or unrecorded):
+            pdfs.append(path)
 
-    # Update structured data files
     if material_updates:
         print(f"\n  Updating structured data files...")
+        for name, updates in material_updates.items():
+            update_structured_data(STRUCTURED_JSON / name, updates, updater)
+
+    # Post-process PDFs (page count, thumbnail) and record results next to local_path
+    if pdfs:
+        print(f"\n  Post-processing PDFs...")
+        processed = material_processing.process_materials(sorted(set(pdfs)))
+        material_processing.annotate_structured_json(processed, [STRUCTURED_JSON / name for name in results])
+
+    if any(entry['result'] == 'downloaded' for entry in plan):
+        asset_manifest.refresh()
 
-        # Update JSON
-        if updater.update_json(json_file, material_updates):
-            print(f"    ✓ Updated JSON: {json_file.name}")
+    return results
 
-        # Update XML
-        xml_file = STRUCTURED_XML / json_file.name.replace('.json', '.xml')
-        if xml_file.exists():
-            if updater.update_xml(xml_file, material_updates):
-                print(f"    ✓ Updated XML: {xml_file.name}")
+
+def process_file(json_file: Path, fetcher: MaterialsFetcher, updater: DataUpdater,
+                 force: bool = False) -> Tuple[int, int]:
+    """
+    Process a single JSON file to download materials, as a one-meeting plan
+    (same filename ownership and existing-file rules as the batch).
+    Returns (materials_downloaded, materials_failed)
+    """
+    print(f"\nProcessing: {json_file.name}")
+    print("=" * 80)
+
+    plan = build_plan([json_file])
+    if not plan:
+        print(f"  ℹ No downloadable materials found (PDFs/PPTs)")
+        return 0, 0
+
+    existing = sum(1 for entry in plan if entry['exists'] and not force)
+    print(f"  Found {len(plan)} downloadable materials ({existing} already downloaded)")
+
+    result = execute_plan(plan, fetcher, updater, force).get(json_file.name, {})
+    materials_downloaded = result.get('materials_downloaded', 0)
+    materials_failed = result.get('materials_failed', 0)
 
     print(f"\n  Summary: {materials_downloaded} downloaded, {materials_failed} failed")
 
@@ -257,9 +637,12 @@ def main():
     fetcher = MaterialsFetcher()
     updater = DataUpdater()
 
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    force = '--force' in sys.argv[1:]
+
     # Check if specific file provided
-    if len(sys.argv) > 1:
-        json_filename = sys.argv[1]
+    if args:
+        json_filename = args[0]
         if not json_filename.endswith('.json'):
             json_filename += '.json'
 
@@ -268,14 +651,14 @@ def main():
             print(f"❌ File not found: {json_file}")
             return
 
-        downloaded, failed = process_file(json_file, fetcher, updater)
+        downloaded, failed = process_file(json_file, fetcher, updater, force)
 
         print(f"\n{'=' * 80}")
         print(f"COMPLETE: {downloaded} materials downloaded, {failed} failed")
         print(f"{'=' * 80}")
 
     else:
-        print("Usage: python download-materials.py <filename.json>")
+        print("Usage: python download-materials.py <filename.json> [--force]")
         print("Example: python download-materials.py april-2021-webinar-meeting-archive-14812.json")
 
 
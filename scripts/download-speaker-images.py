@@ -4,7 +4,6 @@ Speaker Image Downloader
 Downloads speaker images from live webpages and updates structured data with local paths
 """
 
-import xml.etree.ElementTree as ET
 import requests
 from bs4 import BeautifulSoup
 import json
@@ -13,35 +12,38 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from urllib.parse import urljoin, urlparse
 import hashlib
 
+import http_client
+import xml_backend
+import image_derivatives
+import asset_manifest
+
 PROJECT_ROOT = Path(__file__).parent.parent
 STRUCTURED_JSON = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-json'
 STRUCTURED_XML = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-xml'
 IMAGES_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'assets' / 'images'
 
+# Pipeline concurrency
+PAGE_WORKERS = 4     # meeting pages fetched ahead of the image downloads
+IMAGE_WORKERS = 8    # concurrent headshot downloads
+
 
 class LivePageFetcher:
     """Fetches live webpage content with proper headers"""
 
-    def __init__(self):
-        self.session = requests.Session()
-        # Mimic real browser headers (from verify-extraction-accuracy.py)
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Mobile Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Cache-Control': 'no-cache',
-            'Referer': 'https://aaiila.org/'
-        })
+    def __init__(self, limiter: Optional[http_client.HostLimiter] = None):
+        self.limiter = limiter or http_client.HostLimiter()
+        # Pages and images share one pool, sized for both worker pools
+        self.session = http_client.session('html', PAGE_WORKERS + IMAGE_WORKERS)
 
     def fetch_page(self, url: str) -> Tuple[bool, Optional[BeautifulSoup]]:
         """Fetch webpage and return (success, soup)"""
         try:
-            response = self.session.get(url, timeout=15)
+            with self.limiter.slot(url):
+                response = self.session.get(url, timeout=15)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 return True, soup
@@ -58,7 +60,8 @@ class LivePageFetcher:
     def download_image(self, image_url: str, output_path: Path) -> bool:
         """Download image from URL to local path"""
         try:
-            response = self.session.get(image_url, timeout=15)
+            with self.limiter.slot(image_url):
+                response = self.session.get(image_url, timeout=15)
             if response.status_code == 200:
                 with open(output_path, 'wb') as f:
                     f.write(response.content)
@@ -208,7 +211,7 @@ class DataUpdater:
         image_updates: {topic_id: {speaker_index: local_path}}
         """
         try:
-            tree = ET.parse(xml_file)
+            tree = xml_backend.parse(xml_file)
             root = tree.getroot()
 
             topics_elem = root.find('topics')
@@ -225,23 +228,12 @@ class DataUpdater:
 
                         for speaker_idx, local_path in image_updates[topic_id].items():
                             if speaker_idx < len(speaker_elems):
-                                speaker_elem = speaker_elems[speaker_idx]
-
-                                # Add photo_local_path element after photo_id
-                                photo_local_elem = ET.Element('photo_local_path')
-                                photo_local_elem.text = local_path
+                                # Set photo_local_path in place (after photo_id), keeping indentation
+                                xml_backend.set_child_text(
+                                    speaker_elems[speaker_idx], 'photo_local_path', local_path, after='photo_id'
+                                )
 
-                                # Find position to insert (after photo_id)
-                                photo_id_elem = speaker_elem.find('photo_id')
-                                if photo_id_elem is not None:
-                                    idx = list(speaker_elem).index(photo_id_elem)
-                                    speaker_elem.insert(idx + 1, photo_local_elem)
-                                else:
-                                    speaker_elem.append(photo_local_elem)
-
-            # Write back with formatting
-            ET.indent(tree, space='  ')
-            tree.write(xml_file, encoding='utf-8', xml_declaration=True)
+            xml_backend.write(tree, xml_file)
 
             return True
         except Exception as e:
@@ -249,6 +241,54 @@ class DataUpdater:
             return False
 
 
+def collect_speakers(data: Dict) -> Dict[str, Tuple[int, int, str]]:
+    """Map photo_id -> (topic_id, speaker_idx, speaker_name) for speakers with photos"""
+    photo_id_to_speaker = {}
+
+    for topic in data.get('topics', []):
+        topic_id = topic['id']
+        for speaker_idx, speaker in enumerate(topic.get('speakers', [])):
+            photo_id = speaker.get('photo_id', '')
+            if photo_id:
+                speaker_name = speaker.get('name', 'unknown')
+                photo_id_to_speaker[photo_id] = (topic_id, speaker_idx, speaker_name)
+
+    return photo_id_to_speaker
+
+
+def image_filename(extractor: ImageExtractor, speaker_name: str, photo_id: str, image_url: str) -> str:
+    """Create filename: {speaker-slug}_{photo_id}.{ext}"""
+    speaker_slug = extractor.slugify(speaker_name)
+    ext = Path(urlparse(image_url).path).suffix or '.jpg'
+    return f"{speaker_slug}_{photo_id}{ext}"
+
+
+def update_structured_data(json_file: Path, image_updates: Dict, updater: DataUpdater) -> None:
+    """Write local image paths back into the structured JSON and XML files"""
+    print(f"\n  Updating structured data files...")
+
+    # Update JSON
+    if updater.update_json(json_file, image_updates):
+        print(f"    ✓ Updated JSON: {json_file.name}")
+
+    # Update XML
+    xml_file = STRUCTURED_XML / json_file.name.replace('.json', '.xml')
+    if xml_file.exists():
+        if updater.update_xml(xml_file, image_updates):
+            print(f"    ✓ Updated XML: {xml_file.name}")
+
+
+def build_derivatives(image_files: List[Path]) -> None:
+    """Post-download stage: resized WebP/AVIF derivatives and their manifest"""
+    if not image_files:
+        return
+    print(f"\n  Generating image derivatives...")
+    counts = image_derivatives.generate_derivatives(sorted(set(image_files)))
+    if image_derivatives.HAS_PILLOW:
+        print(f"    ✓ Derivatives: {counts['generated']} generated, {counts['skipped']} unchanged, "
+              f"{counts['failed']} failed")
+
+
 def process_file(json_file: Path, fetcher: LivePageFetcher, extractor: ImageExtractor, updater: DataUpdater) -> Tuple[int, int]:
     """
     Process a single JSON file to download speaker images.
@@ -277,15 +317,7 @@ def process_file(json_file: Path, fetcher: LivePageFetcher, extractor: ImageExtr
     print(f"  ✓ Page fetched")
 
     # Collect all photo_ids and speaker info
-    photo_id_to_speaker = {}  # {photo_id: (topic_id, speaker_idx, speaker_name)}
-
-    for topic in data.get('topics', []):
-        topic_id = topic['id']
-        for speaker_idx, speaker in enumerate(topic.get('speakers', [])):
-            photo_id = speaker.get('photo_id', '')
-            if photo_id:
-                speaker_name = speaker.get('name', 'unknown')
-                photo_id_to_speaker[photo_id] = (topic_id, speaker_idx, speaker_name)
+    photo_id_to_speaker = collect_speakers(data)
 
     if not photo_id_to_speaker:
         print(f"  ℹ No speakers with photo_id found")
@@ -304,16 +336,14 @@ def process_file(json_file: Path, fetcher: LivePageFetcher, extractor: ImageExtr
     images_downloaded = 0
     images_failed = 0
     image_updates = {}  # {topic_id: {speaker_idx: local_path}}
+    downloaded_files = []
 
     IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 
     for photo_id, image_url in image_map.items():
         topic_id, speaker_idx, speaker_name = photo_id_to_speaker[photo_id]
 
-        # Create filename: {speaker-slug}_{photo_id}.{ext}
-        speaker_slug = extractor.slugify(speaker_name)
-        ext = Path(urlparse(image_url).path).suffix or '.jpg'
-        filename = f"{speaker_slug}_{photo_id}{ext}"
+        filename = image_filename(extractor, speaker_name, photo_id, image_url)
         output_path = IMAGES_DIR / filename
         local_path = f"assets/images/{filename}"
 
@@ -326,6 +356,7 @@ def process_file(json_file: Path, fetcher: LivePageFetcher, extractor: ImageExtr
         if fetcher.download_image(image_url, output_path):
             print(f"    ✓ Downloaded ({output_path.stat().st_size} bytes)")
             images_downloaded += 1
+            downloaded_files.append(output_path)
 
             # Track for updating structured data
             if topic_id not in image_updates:
@@ -337,23 +368,125 @@ def process_file(json_file: Path, fetcher: LivePageFetcher, extractor: ImageExtr
 
     # Update structured data files
     if image_updates:
-        print(f"\n  Updating structured data files...")
-
-        # Update JSON
-        if updater.update_json(json_file, image_updates):
-            print(f"    ✓ Updated JSON: {json_file.name}")
+        update_structured_data(json_file, image_updates, updater)
 
-        # Update XML
-        xml_file = STRUCTURED_XML / json_file.name.replace('.json', '.xml')
-        if xml_file.exists():
-            if updater.update_xml(xml_file, image_updates):
-                print(f"    ✓ Updated XML: {xml_file.name}")
+    build_derivatives(downloaded_files)
+    if downloaded_files:
+        asset_manifest.refresh()
 
     print(f"\n  Summary: {images_downloaded} downloaded, {images_failed} failed")
 
     return images_downloaded, images_failed
 
 
+def process_files_concurrently(json_files: List[Path], fetcher: LivePageFetcher, extractor: ImageExtractor,
+                               updater: DataUpdater) -> List[Dict]:
+    """
+    Pipelined version of process_file for many meetings.
+    Meeting pages are fetched PAGE_WORKERS at a time in a dedicated pool while the
+    headshots of already-fetched meetings download in a second pool, so page
+    fetches and image downloads overlap. The fetcher's HostLimiter bounds the
+    combined number of in-flight requests per host.
+    Structured data is updated from the calling thread as each meeting completes;
+    image derivatives and the asset manifest are generated once all downloads
+    have finished.
+    Returns one result dict per file (same shape as the batch report entries).
+    """
+    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+
+    results = {}
+    downloaded_files = []
+    meetings = {}  # {filename: state}
+    pending = {}   # {future: (kind, filename, payload)}
+
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as page_pool, \
+            ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as image_pool:
+
+        # Stage 1: queue every page fetch (the page pool keeps only a few in flight)
+        for json_file in json_files:
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"  ❌ {json_file.name}: failed to load JSON: {e}")
+                results[json_file.name] = {'filename': json_file.name, 'status': 'error', 'error': str(e)}
+                continue
+
+            photo_id_to_speaker = collect_speakers(data)
+            if not photo_id_to_speaker:
+                results[json_file.name] = {'filename': json_file.name, 'status': 'success',
+                                           'images_downloaded': 0, 'images_failed': 0}
+                continue
+
+            meetings[json_file.name] = {
+                'json_file': json_file,
+                'speakers': photo_id_to_speaker,
+                'remaining': 0,
+                'downloaded': 0,
+                'failed': 0,
+                'updates': {}
+            }
+            url = data['metadata'].get('link', '')
+            pending[page_pool.submit(fetcher.fetch_page, url)] = ('page', json_file.name, None)
+
+        def finish(name: str):
+            state = meetings[name]
+            if state['updates']:
+                update_structured_data(state['json_file'], state['updates'], updater)
+            print(f"  Summary [{name}]: {state['downloaded']} downloaded, {state['failed']} failed")
+            results[name] = {'filename': name, 'status': 'success',
+                             'images_downloaded': state['downloaded'], 'images_failed': state['failed']}
+
+        # Stage 2/3: as pages arrive, match and queue downloads; as downloads finish, record them
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, name, payload = pending.pop(future)
+                state = meetings[name]
+
+                if kind == 'page':
+                    success, soup = future.result()
+                    if not success:
+                        print(f"  ❌ {name}: failed to fetch page")
+                        results[name] = {'filename': name, 'status': 'error', 'error': 'Page fetch failed'}
+                        continue
+
+                    speaker_data = [(photo_id, info[2]) for photo_id, info in state['speakers'].items()]
+                    image_map = extractor.find_speaker_images(soup, speaker_data)
+                    print(f"  ✓ {name}: page fetched, {len(image_map)}/{len(speaker_data)} images found")
+
+                    for photo_id, image_url in image_map.items():
+                        topic_id, speaker_idx, speaker_name = state['speakers'][photo_id]
+                        filename = image_filename(extractor, speaker_name, photo_id, image_url)
+                        download = image_pool.submit(fetcher.download_image, image_url, IMAGES_DIR / filename)
+                        pending[download] = ('image', name, (topic_id, speaker_idx, filename))
+                        state['remaining'] += 1
+
+                    if not state['remaining']:
+                        finish(name)
+
+                else:
+                    topic_id, speaker_idx, filename = payload
+                    state['remaining'] -= 1
+                    if future.result():
+                        state['downloaded'] += 1
+                        downloaded_files.append(IMAGES_DIR / filename)
+                        state['updates'].setdefault(topic_id, {})[speaker_idx] = f"assets/images/{filename}"
+                        print(f"    ✓ {filename} ({(IMAGES_DIR / filename).stat().st_size} bytes)")
+                    else:
+                        state['failed'] += 1
+                        print(f"    ❌ {filename}: download failed")
+
+                    if not state['remaining']:
+                        finish(name)
+
+    build_derivatives(downloaded_files)
+    if downloaded_files:
+        asset_manifest.refresh()
+
+    return [results[f.name] for f in json_files if f.name in results]
+
+
 def main():
     """Main execution"""
     print("=" * 80)
@@ -365,25 +498,32 @@ def main():
     extractor = ImageExtractor()
     updater = DataUpdater()
 
-    # Check if specific file provided
+    # Check if specific file(s) provided
     if len(sys.argv) > 1:
-        json_filename = sys.argv[1]
-        if not json_filename.endswith('.json'):
-            json_filename += '.json'
-
-        json_file = STRUCTURED_JSON / json_filename
-        if not json_file.exists():
-            print(f"❌ File not found: {json_file}")
-            return
-
-        downloaded, failed = process_file(json_file, fetcher, extractor, updater)
+        json_files = []
+        for json_filename in sys.argv[1:]:
+            if not json_filename.endswith('.json'):
+                json_filename += '.json'
+
+            json_file = STRUCTURED_JSON / json_filename
+            if not json_file.exists():
+                print(f"❌ File not found: {json_file}")
+                return
+            json_files.append(json_file)
+
+        if len(json_files) == 1:
+            downloaded, failed = process_file(json_files[0], fetcher, extractor, updater)
+        else:
+            results = process_files_concurrently(json_files, fetcher, extractor, updater)
+            downloaded = sum(r.get('images_downloaded', 0) for r in results)
+            failed = sum(r.get('images_failed', 0) for r in results)
 
         print(f"\n{'=' * 80}")
         print(f"COMPLETE: {downloaded} images downloaded, {failed} failed")
         print(f"{'=' * 80}")
 
     else:
-        print("Usage: python download-speaker-images.py <filename.json>")
+        print("Usage: python download-speaker-images.py <filename.json> [<filename.json> ...]")
         print("Example: python download-speaker-images.py april-2024-skirballwebinar-archive-16632.json")
 
 
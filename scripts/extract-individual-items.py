@@ -4,17 +4,39 @@ Extract Individual Meeting Items to Separate XML Files
 Splits the main WordPress XML export into individual item files for easier analysis
 Removes all useless WordPress metadata, keeps only essential fields and useful postmeta
 Filters for published posts from 2021 onwards
+The export is streamed one <item> at a time (wp_export.iter_items), so memory
+stays bounded by the largest item rather than the whole export
+
+Incremental: a split index records each post's wp:post_modified and output
+files, so re-splitting a newer export only rewrites posts that are new or
+changed (and removes files of posts that disappeared or moved). Posts with
+several categories are written to the folder of every category.
+
+With --structured, monthly meeting items are handed to the V2 DataExtractor
+in memory and written straight to structured-xml/structured-json, skipping
+the per-item file write and re-parse. Per-item files are then only written
+as debug output with --write-items.
+
+Usage: python extract-individual-items.py [--force] [--structured [--write-items]]
 """
 
 import xml.etree.ElementTree as ET
 from pathlib import Path
 import re
 import copy
+import hashlib
+import importlib.util
+import json
+import os
+import sys
 from datetime import datetime
 
+import wp_export
+
 PROJECT_ROOT = Path(__file__).parent.parent
 XML_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'aaiilaorg.WordPress.2025-11-01.xml'
 OUTPUT_BASE_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'individual-posts'
+INDEX_FILE = OUTPUT_BASE_DIR / 'split-index.json'
 
 # Category-based output directories
 OUTPUT_DIRS = {
@@ -63,54 +85,154 @@ def determine_category_folder(category_text):
     # Default to other
     return 'other'
 
+def determine_category_folders(category_texts):
+    """
+    Folders for every category of a post, in category order.
+    'other' is only used when no category maps to a specific folder.
+    """
+    folders = []
+    for category_text in category_texts:
+        folder = determine_category_folder(category_text)
+        if folder != 'other' and folder not in folders:
+            folders.append(folder)
+    return folders or ['other']
+
+def load_index():
+    """Split index from the previous run: {post_id: {post_modified, files}}"""
+    if INDEX_FILE.exists():
+        try:
+            with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: ignoring unreadable split index: {e}")
+    return {}
+
+def save_index(index):
+    """Write the split index atomically"""
+    tmp_file = INDEX_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(index.items())), f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, INDEX_FILE)
+
+# Postmeta filter rules, checked in order: (action, match, key or prefix, note).
+# Anything no rule matches is dropped as well; those keys are reported so
+# the table can be tuned. Override with RULES_FILE (a JSON list of the same
+# four fields as objects).
+POSTMETA_RULES = [
+    ('keep', 'exact', '_thumbnail_id', 'Featured image ID'),
+    ('keep', 'exact', 'stunnig_headers_bg_img', 'Hero background image URL'),
+    ('skip', 'prefix', '_wpb_shortcodes_custom_css', 'Visual Composer CSS (duplicates)'),
+    ('skip', 'prefix', 'post_single_', 'Post display toggles'),
+    ('skip', 'prefix', 'stunnig_headers_', 'Header config (except bg_img)'),
+    ('skip', 'prefix', 'dfd_', 'Theme-specific'),
+    ('skip', 'prefix', 'preloader_', 'Page loader animation'),
+    ('skip', 'prefix', 'crum_', 'Breadcrumb settings'),
+    ('skip', 'prefix', '_oembed_', 'oEmbed cache'),
+    ('skip', 'prefix', '_wp_old_', 'Historical dates/slugs'),
+    ('skip', 'prefix', '_yoast_wpseo_', 'SEO metadata'),
+    ('skip', 'prefix', '_monsterinsights_', 'Analytics'),
+    ('skip', 'prefix', '_edit_', 'Edit history'),
+    ('skip', 'prefix', '_wpb_vc_', 'Visual Composer'),
+    ('skip', 'prefix', 'slide_template', 'Template settings'),
+    ('skip', 'prefix', 'sharing_disabled', 'Social sharing'),
+    ('skip', 'prefix', '_my_post_', 'Custom post settings'),
+    ('skip', 'prefix', '_dp_original', 'Duplicate tracking'),
+    ('skip', 'prefix', 'stun_header_', 'Stunning header config'),
+]
+RULES_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'postmeta-rules.json'
+
+UNMATCHED = '(no rule)'
+
+class PostmetaFilter:
+    """
+    The rule table compiled into one anchored regex with a named group per
+    rule, so each meta_key is classified by a single match call
+    """
+
+    def __init__(self, rules):
+        self.rules = []
+        seen = set()
+        for action, match, pattern, note in rules:
+            if (match, pattern) not in seen:
+                seen.add((match, pattern))
+                self.rules.append((action, match, pattern, note))
+
+        alternatives = []
+        for i, (action, match, pattern, note) in enumerate(self.rules):
+            alternatives.append(f"(?P<r{i}>{re.escape(pattern)}{'$' if match == 'exact' else ''})")
+        self.pattern = re.compile('|'.join(alternatives)) if alternatives else None
+        self.signature = hashlib.sha256(json.dumps(self.rules).encode()).hexdigest()[:16]
+        self._cache = {}
+
+    @classmethod
+    def load(cls):
+        """Rules from RULES_FILE if present, else POSTMETA_RULES"""
+        if RULES_FILE.exists():
+            with open(RULES_FILE, 'r', encoding='utf-8') as f:
+                rules = [(r['action'], r['match'], r['pattern'], r.get('note', '')) for r in json.load(f)]
+            print(f"Postmeta rules: {RULES_FILE} ({len(rules)} rules)")
+            return cls(rules)
+        return cls(POSTMETA_RULES)
+
+    def classify(self, meta_key):
+        """(keep, rule label) for a meta_key"""
+        result = self._cache.get(meta_key)
+        if result is None:
+            m = self.pattern.match(meta_key) if self.pattern else None
+            if m:
+                action, match, pattern, note = self.rules[int(m.lastgroup[1:])]
+                result = (action == 'keep', pattern)
+            else:
+                result = (False, UNMATCHED)
+            self._cache[meta_key] = result
+        return result
+
+    def keep_patterns(self):
+        return [pattern for action, match, pattern, note in self.rules if action == 'keep']
+
+    def skip_patterns(self):
+        return [pattern for action, match, pattern, note in self.rules if action != 'keep']
+
+_postmeta_filter = None
+
+def get_postmeta_filter():
+    """Postmeta filter, compiled on first use"""
+    global _postmeta_filter
+    if _postmeta_filter is None:
+        _postmeta_filter = PostmetaFilter.load()
+    return _postmeta_filter
+
 def should_keep_postmeta(meta_key):
     """
     Determine if a postmeta field should be kept.
     Only keep essential fields that are useful for content or images.
     Remove all WordPress theme settings, cache, and internal fields.
     """
-    # Useful fields to KEEP
-    useful_keys = {
-        '_thumbnail_id',                      # Featured image ID
-        'stunnig_headers_bg_img',              # Hero background image URL
-    }
+    return get_postmeta_filter().classify(meta_key)[0]
 
-    # Patterns to SKIP (WordPress noise)
-    skip_patterns = [
-        '_wpb_shortcodes_custom_css',         # Visual Composer CSS (duplicates)
-        'post_single_',                        # Display toggles
-        'stunnig_headers_',                    # Header config (except bg_img)
-        'dfd_',                               # Theme-specific
-        'preloader_',                         # Page loader animation
-        'crum_',                              # Breadcrumb settings
-        '_oembed_',                           # oEmbed cache
-        '_wp_old_',                           # Historical dates/slugs
-        '_yoast_wpseo_',                      # SEO metadata
-        '_monsterinsights_',                  # Analytics
-        '_edit_',                             # Edit history
-        '_wpb_vc_',                           # Visual Composer
-        'slide_template',                     # Template settings
-        'sharing_disabled',                   # Social sharing
-        '_my_post_',                          # Custom post settings
-        '_dp_original',                       # Duplicate tracking
-        'stun_header_',                       # Stunning header config
-        'post_single_',                       # Post display config
-    ]
-
-    # Check if in useful list
-    if meta_key in useful_keys:
-        return True
-
-    # Check if matches skip patterns
-    for pattern in skip_patterns:
-        if meta_key.startswith(pattern):
-            return False
-
-    # Default: skip anything not explicitly approved
-    return False
+def load_extractor():
+    """V2 extraction module and a DataExtractor, for --structured"""
+    spec = importlib.util.spec_from_file_location("extract_v2", PROJECT_ROOT / 'scripts' / 'extract-structured-data-v2.py')
+    extract_v2 = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(extract_v2)
+    return extract_v2, extract_v2.DataExtractor()
+
+def structured_outputs(extract_v2, base_name):
+    """Structured XML and JSON paths for a meeting"""
+    return [extract_v2.OUTPUT_XML / f"{base_name}.xml", extract_v2.OUTPUT_JSON / f"{base_name}.json"]
 
 def main():
     """Extract individual items to separate XML files"""
+    args = sys.argv[1:]
+    force = '--force' in args
+    structured = '--structured' in args
+    write_items = not structured or '--write-items' in args
+
+    extract_v2 = extractor = None
+    structured_count = 0
+    structured_failed = 0
+    if structured:
+        extract_v2, extractor = load_extractor()
 
     if not XML_FILE.exists():
         print(f"ERROR: XML file not found: {XML_FILE}")
@@ -125,9 +247,9 @@ def main():
         print(f"Created directory: {output_dir}")
     print()
 
-    # Parse XML
-    tree = ET.parse(XML_FILE)
-    root = tree.getroot()
+    postmeta_filter = get_postmeta_filter()
+    rule_hits = {}       # rule label -> postmeta entries matched (written items)
+    unmatched_keys = {}  # meta_key -> entries dropped without a matching rule
 
     # Define namespaces
     namespaces = {
@@ -148,15 +270,16 @@ def main():
     ET.register_namespace('wfw', 'http://wellformedweb.org/CommentAPI/')
     ET.register_namespace('excerpt', 'http://wordpress.org/export/1.2/excerpt/')
 
-    # Find all items (posts)
-    items = root.findall('.//item')
-    print(f"Found {len(items)} total items\n")
-
     # Filter for meeting archive posts
+    item_count = 0
     meeting_count = 0
     extracted_count = 0
     skipped_status_count = 0
     skipped_date_count = 0
+    unchanged_count = 0
+    removed_count = 0
+    index = load_index()
+    seen_post_ids = set()
     category_counts = {
         'monthly': 0,
         'strategic': 0,
@@ -168,20 +291,23 @@ def main():
     print("EXTRACTING PUBLISHED MEETING ARCHIVE POSTS (2021 ONWARDS)")
     print("=" * 80)
 
-    for item in items:
-        title_elem = item.find('title')
-        title = title_elem.text if title_elem is not None else ""
+    # One pass per item: fields, categories and classified postmeta together
+    reader = wp_export.ItemReader(postmeta_filter.classify)
+
+    # Stream the export: only the current <item> is in memory
+    for item in wp_export.iter_items(XML_FILE):
+        item_count += 1
+        record = reader.read(item)
+        title = record['title']
 
         # Check if this is an archive post
         if title and 'ARCHIVE' in title.upper():
-            post_type_elem = item.find('wp:post_type', namespaces)
-            post_type = post_type_elem.text if post_type_elem is not None else ""
+            post_type = record['post_type']
 
             # Only process posts, not attachments
             if post_type == 'post':
                 # Check if post is published
-                status_elem = item.find('wp:status', namespaces)
-                status = status_elem.text if status_elem is not None else ""
+                status = record['status']
 
                 if status != 'publish':
                     skipped_status_count += 1
@@ -189,10 +315,9 @@ def main():
                     continue
 
                 # Check if post is from 2021 onwards
-                post_date_elem = item.find('wp:post_date', namespaces)
-                if post_date_elem is not None and post_date_elem.text:
+                if record['post_date']:
                     try:
-                        post_date = datetime.strptime(post_date_elem.text, '%Y-%m-%d %H:%M:%S')
+                        post_date = datetime.strptime(record['post_date'], '%Y-%m-%d %H:%M:%S')
                         if post_date.year <= 2019:
                             skipped_date_count += 1
                             print(f"SKIPPED (year={post_date.year}): {title}")
@@ -206,68 +331,135 @@ def main():
                 meeting_count += 1
 
                 # Get post ID for filename
-                post_id_elem = item.find('wp:post_id', namespaces)
-                post_id = post_id_elem.text if post_id_elem is not None else 'unknown'
-
-                # Extract category to determine output folder
-                category_elem = item.find('category[@domain="category"]')
-                category_text = category_elem.text if category_elem is not None else ""
+                post_id = record['post_id'] or 'unknown'
 
-                # Determine which folder based on category
-                category_folder = determine_category_folder(category_text)
-                output_dir = OUTPUT_DIRS[category_folder]
+                # Route by every category of the post
+                category_folders = determine_category_folders(record['categories'])
 
                 # Sanitize title for filename
                 safe_title = sanitize_filename(title)
 
                 # Generate filename
                 filename = f"{safe_title}-{post_id}.xml"
-                filepath = output_dir / filename
+                filepaths = [OUTPUT_DIRS[folder] / filename for folder in category_folders]
+                relative_paths = [fp.relative_to(OUTPUT_BASE_DIR).as_posix() for fp in filepaths]
+
+                # Skip posts unchanged since the last split
+                post_modified = record['post_modified'] or ""
+                seen_post_ids.add(post_id)
+                previous = index.get(post_id) or {}
+                items_current = not force and post_modified \
+                    and previous.get('post_modified') == post_modified \
+                    and previous.get('files') == relative_paths \
+                    and previous.get('rules') == postmeta_filter.signature \
+                    and all(fp.exists() for fp in filepaths)
+
+                # Only monthly meetings have a structured extractor
+                base_name = filename[:-len('.xml')] if structured and 'monthly' in category_folders else None
+                structured_current = not force and post_modified \
+                    and previous.get('structured_modified') == post_modified \
+                    and previous.get('structured') == base_name \
+                    and all(p.exists() for p in structured_outputs(extract_v2, base_name))
+
+                need_items = write_items and not items_current
+                need_structured = base_name is not None and not structured_current
+                if not need_items and not need_structured:
+                    unchanged_count += 1
+                    for folder in category_folders:
+                        category_counts[folder] += 1
+                    continue
 
                 try:
                     # Create a minimal XML document with just this item
                     item_root = ET.Element('item')
 
-                    # Copy child elements, filtering out useless postmeta
-                    postmeta_count = 0
-                    postmeta_kept = 0
+                    # Copy child elements; the reader already dropped useless postmeta
+                    for child in record['children']:
+                        item_root.append(copy.deepcopy(child))
 
-                    for child in item:
-                        # Check if this is a postmeta element
-                        if child.tag.endswith('postmeta'):
-                            postmeta_count += 1
-                            # Extract meta_key
-                            meta_key_elem = child.find('{http://wordpress.org/export/1.2/}meta_key')
-                            if meta_key_elem is not None and meta_key_elem.text:
-                                meta_key = meta_key_elem.text
-                                # Only keep if it passes filter
-                                if should_keep_postmeta(meta_key):
-                                    item_root.append(copy.deepcopy(child))
-                                    postmeta_kept += 1
-                            # Skip this postmeta entry
+                    postmeta_count = record['postmeta_count']
+                    postmeta_kept = 0
+                    postmeta_stats = {}
+                    for meta_key, _, _, keep, rule in record['postmeta']:
+                        postmeta_stats[rule] = postmeta_stats.get(rule, 0) + 1
+                        if rule == UNMATCHED:
+                            unmatched_keys[meta_key] = unmatched_keys.get(meta_key, 0) + 1
+                        if keep:
+                            postmeta_kept += 1
+
+                    entry = dict(previous)
+
+                    if need_items:
+                        # Write to every category folder
+                        tree_out = ET.ElementTree(item_root)
+                        for filepath in filepaths:
+                            tmp_path = filepath.with_suffix('.xml.tmp')
+                            tree_out.write(tmp_path, encoding='utf-8', xml_declaration=True)
+                            os.replace(tmp_path, filepath)
+
+                        # Drop files from the previous split that this post no longer produces
+                        for old_path in set(previous.get('files', [])) - set(relative_paths):
+                            if (OUTPUT_BASE_DIR / old_path).exists():
+                                (OUTPUT_BASE_DIR / old_path).unlink()
+                                removed_count += 1
+
+                        entry.update({
+                            'post_modified': post_modified,
+                            'files': relative_paths,
+                            'rules': postmeta_filter.signature,
+                        })
+
+                    if need_structured:
+                        # Feed the filtered item straight to the extractor, no file round trip
+                        meeting = extractor.extract_meeting_from_item(item_root, filename)
+                        if meeting:
+                            extract_v2.write_meeting(meeting, base_name)
+                            entry.update({'structured': base_name, 'structured_modified': post_modified})
+                            structured_count += 1
                         else:
-                            # Keep all non-postmeta elements
-                            item_root.append(copy.deepcopy(child))
+                            print(f"ERROR: structured extraction failed for {filename}")
+                            structured_failed += 1
 
-                    # Write to file
-                    tree_out = ET.ElementTree(item_root)
-                    tree_out.write(filepath, encoding='utf-8', xml_declaration=True)
+                    entry['postmeta'] = dict(sorted(postmeta_stats.items(), key=lambda kv: -kv[1]))
+                    index[post_id] = entry
+                    for rule, count in postmeta_stats.items():
+                        rule_hits[rule] = rule_hits.get(rule, 0) + count
 
                     extracted_count += 1
-                    category_counts[category_folder] += 1
+                    for folder in category_folders:
+                        category_counts[folder] += 1
                     postmeta_removed = postmeta_count - postmeta_kept
-                    category_label = category_folder.upper()
+                    category_label = '+'.join(folder.upper() for folder in category_folders)
                     print(f"{extracted_count}. [{category_label}] {filename} (removed {postmeta_removed} postmeta, kept {postmeta_kept})")
 
                 except Exception as e:
                     print(f"ERROR extracting '{title}': {e}")
 
+    # Remove files of posts that are gone from the export or no longer qualify
+    for post_id in [pid for pid in index if pid not in seen_post_ids]:
+        entry = index.pop(post_id)
+        stale = [OUTPUT_BASE_DIR / old_path for old_path in entry.get('files', [])]
+        if extract_v2 and entry.get('structured'):
+            stale += structured_outputs(extract_v2, entry['structured'])
+        for stale_path in stale:
+            if stale_path.exists():
+                stale_path.unlink()
+                removed_count += 1
+
+    save_index(index)
+
     print("\n" + "=" * 80)
     print(f"EXTRACTION COMPLETE")
     print("=" * 80)
     total_found = meeting_count + skipped_status_count + skipped_date_count
+    print(f"Items scanned: {item_count}")
     print(f"Total archive posts found: {total_found}")
-    print(f"Published posts from 2021+ extracted: {extracted_count}")
+    print(f"Published posts from 2021+ written: {extracted_count}")
+    print(f"Unchanged since last split: {unchanged_count}")
+    print(f"Stale files removed: {removed_count}")
+    if structured:
+        print(f"Structured meetings written: {structured_count} ({structured_failed} failed) "
+              f"→ {extract_v2.OUTPUT_XML.parent}")
     print(f"Skipped (non-published status): {skipped_status_count}")
     print(f"Skipped (2020 or earlier): {skipped_date_count}")
 
@@ -278,10 +470,22 @@ def main():
     print(f"  Other: {category_counts['other']} files → {OUTPUT_DIRS['other']}")
 
     print(f"\nMetadata Cleanup Summary:")
-    print(f"  Each file: ~95% of useless postmeta entries removed")
-    print(f"  Kept fields: _thumbnail_id, stunnig_headers_bg_img")
-    print(f"  Removed patterns: _wpb_*, post_single_*, _oembed_*, _yoast_*, etc.")
-    print(f"\nExpected size reduction: ~70-80% per file")
+    print(f"  Kept fields: {', '.join(postmeta_filter.keep_patterns())}")
+    print(f"  Rules: {len(postmeta_filter.rules)} (signature {postmeta_filter.signature})")
+    if rule_hits:
+        total_postmeta = sum(rule_hits.values())
+        print(f"  Postmeta in written items: {total_postmeta} "
+              f"({rule_hits.get(UNMATCHED, 0)} matched no rule)")
+        for rule, count in sorted(rule_hits.items(), key=lambda kv: -kv[1]):
+            print(f"    {rule:<32} {count:6d} ({100 * count / total_postmeta:5.1f}%)")
+        unused = [r for r in postmeta_filter.keep_patterns() + postmeta_filter.skip_patterns() if r not in rule_hits]
+        if unused:
+            print(f"  Rules that matched nothing: {', '.join(unused)}")
+    if unmatched_keys:
+        print(f"  Most common keys without a rule (candidates for the table):")
+        for meta_key, count in sorted(unmatched_keys.items(), key=lambda kv: -kv[1])[:10]:
+            print(f"    {meta_key}: {count}")
+    print(f"  Per-item counts: {INDEX_FILE}")
 
     # Find example files in each category
     print(f"\nTo view sample posts:")
@@ -17,11 +17,26 @@ from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional, Tuple
 import sys
 
+import wp_export
+import xml_backend
+
 PROJECT_ROOT = Path(__file__).parent.parent
 INDIVIDUAL_POSTS = PROJECT_ROOT / 'AAII-Migration-assets' / 'individual-posts' / 'monthly-meetings'
 OUTPUT_XML = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-xml'
 OUTPUT_JSON = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-json'
 
+# detect_format() labels
+FORMAT_TOPIC_MARKERS = "Format 1: TOPIC 1/2/3"
+FORMAT_TOPICS_SUBTITLE = "Format 2: TOPICS with subtitle"
+FORMAT_PROGRAM = "Format 3: PROGRAM/Single"
+FORMATS = [FORMAT_TOPIC_MARKERS, FORMAT_TOPICS_SUBTITLE, FORMAT_PROGRAM]
+
+METADATA_FIELDS = ['title', 'link', 'post_id', 'post_name', 'post_date', 'category', 'creator']
+CUSTOM_FIELD_KEYS = {'_thumbnail_id', 'stunnig_headers_bg_img'}
+
+# One pass over each item's children for metadata, custom fields and content
+ITEM_READER = wp_export.ItemReader(lambda key: (key in CUSTOM_FIELD_KEYS, key))
+
 
 @dataclass
 class Material:
@@ -120,11 +135,11 @@ class DataExtractor:
     def detect_format(self, content: str) -> str:
         """Detect which format the content uses"""
         if re.search(r'\[dfd_heading[^\]]*\]TOPIC \d+\[/dfd_heading\]', content):
-            return "Format 1: TOPIC 1/2/3"
+            return FORMAT_TOPIC_MARKERS
         elif 'TOPICS' in content and 'subtitle=' in content:
-            return "Format 2: TOPICS with subtitle"
+            return FORMAT_TOPICS_SUBTITLE
         else:
-            return "Format 3: PROGRAM/Single"
+            return FORMAT_PROGRAM
 
     def extract_event_date(self, content: str) -> str:
         """Extract event date from content"""
@@ -537,55 +552,29 @@ class DataExtractor:
     def extract_meeting(self, xml_file: Path) -> Optional[Meeting]:
         """Extract meeting data from XML file"""
         try:
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
-
-            # Define namespaces
-            ns = {
-                'content': 'http://purl.org/rss/1.0/modules/content/',
-                'wp': 'http://wordpress.org/export/1.2/',
-                'dc': 'http://purl.org/dc/elements/1.1/'
-            }
+            root = ET.parse(xml_file).getroot()
+        except Exception as e:
+            print(f"Error processing {xml_file.name}: {str(e)}")
+            return None
+        return self.extract_meeting_from_item(root, xml_file.name)
+
+    def extract_meeting_from_item(self, root: ET.Element, name: str = '') -> Optional[Meeting]:
+        """Extract meeting data from an <item> element already in memory"""
+        try:
+            record = ITEM_READER.read(root)
 
             # Extract basic metadata
-            title_elem = root.find('title')
-            link_elem = root.find('link')
-            post_id_elem = root.find('wp:post_id', ns)
-            post_name_elem = root.find('wp:post_name', ns)
-            post_date_elem = root.find('wp:post_date', ns)
-            category_elem = root.find('category')
-            creator_elem = root.find('dc:creator', ns)
-
-            metadata = {
-                'title': title_elem.text if title_elem is not None else '',
-                'link': link_elem.text if link_elem is not None else '',
-                'post_id': post_id_elem.text if post_id_elem is not None else '',
-                'post_name': post_name_elem.text if post_name_elem is not None else '',
-                'post_date': post_date_elem.text if post_date_elem is not None else '',
-                'category': category_elem.text if category_elem is not None else '',
-                'creator': creator_elem.text if creator_elem is not None else ''
-            }
+            metadata = {field: record[field] for field in METADATA_FIELDS}
 
             # Extract custom fields
-            custom_fields = []
-            for postmeta in root.findall('wp:postmeta', ns):
-                meta_key = postmeta.find('wp:meta_key', ns)
-                meta_value = postmeta.find('wp:meta_value', ns)
-                if meta_key is not None and meta_value is not None:
-                    key = meta_key.text
-                    if key in ['_thumbnail_id', 'stunnig_headers_bg_img']:
-                        custom_fields.append({
-                            'meta_key': key,
-                            'meta_value': meta_value.text or ''
-                        })
+            custom_fields = [{'meta_key': key, 'meta_value': value}
+                             for key, value, _, keep, _ in record['postmeta'] if keep and value is not None]
 
             # Extract content
-            content_elem = root.find('content:encoded', ns)
-            if content_elem is None or not content_elem.text:
+            content = record['content']
+            if not content:
                 return None
 
-            content = content_elem.text
-
             # Extract event date
             event_date = self.extract_event_date(content)
 
@@ -600,87 +589,68 @@ class DataExtractor:
             )
 
         except Exception as e:
-            print(f"Error processing {xml_file.name}: {str(e)}")
+            print(f"Error processing {name}: {str(e)}")
             return None
 
 
-def generate_structured_xml(meeting: Meeting, output_path: Path):
-    """Generate clean structured XML"""
-    root = ET.Element('meeting')
-
-    # Metadata
-    metadata_elem = ET.SubElement(root, 'metadata')
-    for key, value in meeting.metadata.items():
-        elem = ET.SubElement(metadata_elem, key)
-        elem.text = value
-
-    # Custom fields
-    if meeting.custom_fields:
-        custom_fields_elem = ET.SubElement(root, 'custom_fields')
-        for field in meeting.custom_fields:
-            field_elem = ET.SubElement(custom_fields_elem, 'field')
-            for key, value in field.items():
-                elem = ET.SubElement(field_elem, key)
-                elem.text = value
-
-    # Event
-    event_elem = ET.SubElement(root, 'event')
-    date_elem = ET.SubElement(event_elem, 'date')
-    date_elem.text = meeting.event_date
-    status_elem = ET.SubElement(event_elem, 'status')
-    status_elem.text = 'ARCHIVED'
-
-    # Topics
-    topics_elem = ET.SubElement(root, 'topics')
-    for topic in meeting.topics:
-        topic_elem = ET.SubElement(topics_elem, 'topic', id=str(topic.id))
-
-        # Speakers (can be multiple for panel sessions)
-        if topic.speakers:
-            speakers_elem = ET.SubElement(topic_elem, 'speakers')
-            for speaker in topic.speakers:
-                speaker_elem = ET.SubElement(speakers_elem, 'speaker')
-                for key in ['name', 'title', 'photo_id', 'bio']:
-                    value = getattr(speaker, key, '')
-                    elem = ET.SubElement(speaker_elem, key)
-                    elem.text = value
-
-        # Presentation
-        pres_elem = ET.SubElement(topic_elem, 'presentation')
-        title_elem = ET.SubElement(pres_elem, 'title')
-        title_elem.text = topic.presentation.title
-
-        if topic.presentation.description:
-            desc_elem = ET.SubElement(pres_elem, 'description')
-            desc_elem.text = topic.presentation.description
-
-        if topic.presentation.learning_outcomes:
-            outcomes_elem = ET.SubElement(pres_elem, 'learning_outcomes')
-            for outcome in topic.presentation.learning_outcomes:
-                outcome_elem = ET.SubElement(outcomes_elem, 'outcome')
-                outcome_elem.text = outcome
-
-        # Materials
-        if topic.materials:
-            materials_elem = ET.SubElement(topic_elem, 'materials')
-            for material in topic.materials:
-                mat_elem = ET.SubElement(materials_elem, material.type)
-                url_elem = ET.SubElement(mat_elem, 'url')
-                url_elem.text = material.url
-                label_elem = ET.SubElement(mat_elem, 'label')
-                label_elem.text = material.label
-                status_elem = ET.SubElement(mat_elem, 'status')
-                status_elem.text = 'not_validated'
-
-    # Write XML
-    tree = ET.ElementTree(root)
-    ET.indent(tree, space='  ')
-    tree.write(output_path, encoding='utf-8', xml_declaration=True)
-
-
-def generate_json(meeting: Meeting, output_path: Path):
-    """Generate JSON output"""
-    data = {
+def generate_structured_xml(meeting: Meeting, output_path: Path, backend: Optional[str] = None):
+    """Generate clean structured XML (streamed with lxml when available)"""
+    with xml_backend.open_writer(output_path, 'meeting', backend) as w:
+        # Metadata
+        with w.element('metadata'):
+            for key, value in meeting.metadata.items():
+                w.leaf(key, value)
+
+        # Custom fields
+        if meeting.custom_fields:
+            with w.element('custom_fields'):
+                for field in meeting.custom_fields:
+                    with w.element('field'):
+                        for key, value in field.items():
+                            w.leaf(key, value)
+
+        # Event
+        with w.element('event'):
+            w.leaf('date', meeting.event_date)
+            w.leaf('status', 'ARCHIVED')
+
+        # Topics
+        with w.element('topics'):
+            for topic in meeting.topics:
+                with w.element('topic', id=str(topic.id)):
+                    # Speakers (can be multiple for panel sessions)
+                    if topic.speakers:
+                        with w.element('speakers'):
+                            for speaker in topic.speakers:
+                                with w.element('speaker'):
+                                    for key in ['name', 'title', 'photo_id', 'bio']:
+                                        w.leaf(key, getattr(speaker, key, ''))
+
+                    # Presentation
+                    with w.element('presentation'):
+                        w.leaf('title', topic.presentation.title)
+
+                        if topic.presentation.description:
+                            w.leaf('description', topic.presentation.description)
+
+                        if topic.presentation.learning_outcomes:
+                            with w.element('learning_outcomes'):
+                                for outcome in topic.presentation.learning_outcomes:
+                                    w.leaf('outcome', outcome)
+
+                    # Materials
+                    if topic.materials:
+                        with w.element('materials'):
+                            for material in topic.materials:
+                                with w.element(material.type):
+                                    w.leaf('url', material.url)
+                                    w.leaf('label', material.label)
+                                    w.leaf('status', 'not_validated')
+
+
+def meeting_to_dict(meeting: Meeting) -> Dict:
+    """JSON-ready representation of a meeting (the structured-json layout)"""
+    return {
         'metadata': meeting.metadata,
         'custom_fields': meeting.custom_fields,
         'event': {
@@ -698,11 +668,35 @@ def generate_json(meeting: Meeting, output_path: Path):
         ]
     }
 
+
+def generate_json(meeting: Meeting, output_path: Path):
+    """Generate JSON output"""
+    data = meeting_to_dict(meeting)
+
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
-def process_single_file(xml_file: Path, extractor: DataExtractor):
+def write_meeting(meeting: Meeting, base_name: str, subfolder: str = '') -> Tuple[Path, Path]:
+    """
+    Write the structured XML and JSON for a meeting. Returns (xml_output, json_output).
+    subfolder places the outputs below structured-xml/ and structured-json/
+    (monthly meetings use the top level, which the downloaders read).
+    """
+    xml_dir = OUTPUT_XML / subfolder
+    json_dir = OUTPUT_JSON / subfolder
+    xml_output = xml_dir / f"{base_name}.xml"
+    json_output = json_dir / f"{base_name}.json"
+
+    xml_dir.mkdir(parents=True, exist_ok=True)
+    json_dir.mkdir(parents=True, exist_ok=True)
+
+    generate_structured_xml(meeting, xml_output)
+    generate_json(meeting, json_output)
+    return xml_output, json_output
+
+
+def process_single_file(xml_file: Path, extractor: DataExtractor, subfolder: str = ''):
     """Process a single XML file"""
     print(f"\nProcessing: {xml_file.name}")
     print("=" * 80)
@@ -712,17 +706,7 @@ def process_single_file(xml_file: Path, extractor: DataExtractor):
         print(f"❌ Failed to extract data")
         return None
 
-    # Create output filenames
-    base_name = xml_file.stem
-    xml_output = OUTPUT_XML / f"{base_name}.xml"
-    json_output = OUTPUT_JSON / f"{base_name}.json"
-
-    # Generate outputs
-    OUTPUT_XML.mkdir(parents=True, exist_ok=True)
-    OUTPUT_JSON.mkdir(parents=True, exist_ok=True)
-
-    generate_structured_xml(meeting, xml_output)
-    generate_json(meeting, json_output)
+    xml_output, json_output = write_meeting(meeting, xml_file.stem, subfolder)
 
     # Print summary
     print(f"\n✓ Extracted {len(meeting.topics)} topics")
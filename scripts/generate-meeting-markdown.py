@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Meeting Markdown Generator
+Renders Nuxt Content markdown for content/meetings from the V2 structured JSON
+
+- One .md per structured-json file: {post_name}-{post_id}.md
+- Incremental: a build state file records the hash of each source JSON and of
+  this generator (the template); only pages whose inputs changed are rendered
+- A rendered page identical to the file on disk is not rewritten, so Nuxt's
+  content cache and HMR only see the pages that really changed
+- Pages generated earlier whose source JSON is gone are removed
+- Generated pages carry GENERATED_MARKER in their frontmatter; a page on disk
+  without it (hand-migrated) is never overwritten or removed, only reported
+
+Usage: python generate-meeting-markdown.py [--force] [<filename.json> ...]
+"""
+
+import hashlib
+import html
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from string import Template
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+STRUCTURED_JSON = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-json'
+CONTENT_DIR = PROJECT_ROOT / 'content' / 'meetings'
+STATE_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'markdown-build-state.json'
+
+DESCRIPTION_LENGTH = 200
+
+# Frontmatter line that marks a page as owned by this generator
+GENERATED_MARKER = 'generatedBy: "generate-meeting-markdown"'
+
+BODY_TEMPLATE = Template("""Meeting archive page.
+
+**Topics covered:**
+
+$topic_list""")
+
+
+def template_hash() -> str:
+    """Hash of the generator itself: any change to the rendering invalidates every page"""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def plain(text: str) -> str:
+    """Extracted text with HTML entities decoded ('&amp;' -> '&')"""
+    return html.unescape(text) if text else ''
+
+
+def escape_yaml_string(text: str) -> str:
+    """Escape string for a double-quoted YAML scalar"""
+    if not text:
+        return ""
+    text = text.replace('\\', '\\\\')
+    text = text.replace('"', '\\"')
+    text = text.replace('\n', '\\n')
+    return text
+
+
+def iso_event_date(event_date: str) -> str:
+    """'Saturday, April 20, 2024' -> '2024-04-20' (empty if unparseable)"""
+    try:
+        return datetime.strptime(event_date, '%A, %B %d, %Y').strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return ''
+
+
+def truncate(text: str, length: int = DESCRIPTION_LENGTH) -> str:
+    """Cut text to length, adding an ellipsis only when something was cut"""
+    return text if len(text) <= length else text[:length] + '...'
+
+
+def is_generated(path: Path) -> bool:
+    """True if the page's frontmatter carries GENERATED_MARKER"""
+    frontmatter = path.read_text(encoding='utf-8').split('\n---', 1)[0]
+    return GENERATED_MARKER in frontmatter.splitlines()
+
+
+def output_filename(data: Dict) -> str:
+    """Markdown filename for a meeting: {post_name}-{post_id}.md"""
+    metadata = data['metadata']
+    return f"{metadata['post_name']}-{metadata['post_id']}.md"
+
+
+def render_markdown(data: Dict) -> str:
+    """Render one meeting as markdown with YAML frontmatter"""
+    metadata = data['metadata']
+    topics = data.get('topics', [])
+
+    # Unique speakers in order of appearance
+    speakers = []
+    seen = set()
+    for topic in topics:
+        for speaker in topic.get('speakers', []):
+            if speaker.get('name') and speaker['name'] not in seen:
+                seen.add(speaker['name'])
+                speakers.append(speaker)
+
+    # Description: first speaker bio, else first presentation description
+    description = plain(next((s['bio'] for s in speakers if s.get('bio')), '') or
+                        next((t['presentation']['description'] for t in topics
+                              if t.get('presentation', {}).get('description')), ''))
+
+    lines = ['---']
+    lines.append(f'title: "{escape_yaml_string(plain(metadata["title"]))}"')
+    lines.append(f'date: "{metadata["post_date"]}"')
+    event_date = iso_event_date(data.get('event', {}).get('date', ''))
+    if event_date:
+        lines.append(f'eventDate: "{event_date}"')
+    lines.append(f'slug: "{metadata["post_id"]}"')
+    if description:
+        lines.append(f'description: "{escape_yaml_string(truncate(description))}"')
+    lines.append('archiveStatus: "archived"')
+
+    if speakers:
+        lines.append('speakers:')
+        for speaker in speakers:
+            lines.append(f'  - name: "{escape_yaml_string(plain(speaker["name"]))}"')
+            lines.append(f'    title: "{escape_yaml_string(plain(speaker.get("title", "")))}"')
+
+    titled_topics = [t for t in topics if t.get('presentation', {}).get('title')]
+    if titled_topics:
+        lines.append('topics:')
+        speaker_name = ''
+        for topic in titled_topics:
+            presentation = topic['presentation']
+            # Topics without their own speaker belong to the previous topic's speaker
+            if topic.get('speakers'):
+                speaker_name = topic['speakers'][0].get('name', '')
+            lines.append(f'  - title: "{escape_yaml_string(plain(presentation["title"]))}"')
+            if speaker_name:
+                lines.append(f'    speaker: "{escape_yaml_string(plain(speaker_name))}"')
+            if presentation.get('learning_outcomes'):
+                lines.append('    keyPoints:')
+                for point in presentation['learning_outcomes']:
+                    lines.append(f'      - "{escape_yaml_string(plain(point))}"')
+
+    materials = [m for t in topics for m in t.get('materials', []) if m.get('url')]
+    if materials:
+        lines.append('archiveMaterials:')
+        for material in materials:
+            lines.append(f'  - type: "{escape_yaml_string(plain(material.get("label") or material.get("type", "")))}"')
+            lines.append(f'    url: "{escape_yaml_string(plain(material["url"]))}"')
+
+    lines.append(GENERATED_MARKER)
+    lines.append('---')
+    lines.append('')
+    topic_list = '\n\n'.join(f"- {plain(t['presentation']['title'])}" for t in titled_topics)
+    lines.append(BODY_TEMPLATE.substitute(topic_list=topic_list))
+
+    return '\n'.join(lines)
+
+
+def load_state() -> Dict:
+    """Build state from the previous run: {source filename: {source_hash, template_hash, output}}"""
+    if STATE_FILE.exists():
+        try:
+            with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Ignoring unreadable build state: {e}")
+    return {}
+
+
+def save_state(state: Dict) -> None:
+    """Write the build state atomically"""
+    tmp_file = STATE_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(state.items())), f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, STATE_FILE)
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content unless the file already holds exactly that. Returns True if written."""
+    if path.exists() and path.read_text(encoding='utf-8') == content:
+        return False
+    tmp_file = path.with_suffix('.md.tmp')
+    tmp_file.write_text(content, encoding='utf-8')
+    os.replace(tmp_file, path)
+    return True
+
+
+def generate(json_files: Optional[List[Path]] = None, force: bool = False) -> Dict[str, int]:
+    """
+    Render the given structured JSON files (default: all) into CONTENT_DIR.
+    Returns counts: {'written', 'unchanged', 'skipped', 'removed', 'failed', 'protected'}
+    """
+    counts = {'written': 0, 'unchanged': 0, 'skipped': 0, 'removed': 0, 'failed': 0, 'protected': 0}
+    full_run = json_files is None
+    if full_run:
+        json_files = sorted(STRUCTURED_JSON.glob('*.json'))
+
+    state = load_state()
+    current_template = template_hash()
+    CONTENT_DIR.mkdir(parents=True, exist_ok=True)
+
+    for json_file in json_files:
+        source_bytes = json_file.read_bytes()
+        source_hash = hashlib.sha256(source_bytes).hexdigest()
+        previous = state.get(json_file.name)
+
+        if not force and previous \
+                and previous['source_hash'] == source_hash \
+                and previous['template_hash'] == current_template \
+                and (CONTENT_DIR / previous['output']).exists():
+            counts['skipped'] += 1
+            continue
+
+        try:
+            data = json.loads(source_bytes)
+            output = output_filename(data)
+            content = render_markdown(data)
+        except Exception as e:
+            print(f"  ❌ {json_file.name}: {e}")
+            counts['failed'] += 1
+            continue
+
+        if (CONTENT_DIR / output).exists() and not is_generated(CONTENT_DIR / output):
+            print(f"  ⚠ {output}: not a generated page (no {GENERATED_MARKER!r}), left unchanged")
+            counts['protected'] += 1
+            continue
+
+        if write_if_changed(CONTENT_DIR / output, content):
+            print(f"  ✓ {output}")
+            counts['written'] += 1
+        else:
+            counts['unchanged'] += 1
+
+        # A changed post_name renames the page; drop the old file
+        renamed = CONTENT_DIR / previous['output'] if previous and previous['output'] != output else None
+        if renamed and renamed.exists() and is_generated(renamed):
+            renamed.unlink()
+
+        state[json_file.name] = {
+            'source_hash': source_hash,
+            'template_hash': current_template,
+            'output': output
+        }
+
+    # Remove generated pages whose source JSON no longer exists
+    if full_run:
+        for source_name in [name for name in state if not (STRUCTURED_JSON / name).exists()]:
+            stale = CONTENT_DIR / state.pop(source_name)['output']
+            if stale.exists() and is_generated(stale):
+                stale.unlink()
+                print(f"  🗑 Removed {stale.name}")
+                counts['removed'] += 1
+
+    save_state(state)
+    return counts
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("MEETING MARKDOWN GENERATOR")
+    print("=" * 80)
+    print()
+
+    args = sys.argv[1:]
+    force = '--force' in args
+    names = [a for a in args if not a.startswith('--')]
+
+    json_files = None
+    if names:
+        json_files = []
+        for json_filename in names:
+            if not json_filename.endswith('.json'):
+                json_filename += '.json'
+            json_file = STRUCTURED_JSON / json_filename
+            if not json_file.exists():
+                print(f"❌ File not found: {json_file}")
+                return
+            json_files.append(json_file)
+
+    start_time = time.time()
+    counts = generate(json_files, force=force)
+
+    print(f"\n{'=' * 80}")
+    print(f"COMPLETE: {counts['written']} written, {counts['unchanged']} unchanged, "
+          f"{counts['skipped']} skipped, {counts['removed']} removed, {counts['failed']} failed, "
+          f"{counts['protected']} hand-migrated left unchanged")
+    print(f"Time elapsed: {time.time() - start_time:.2f} seconds")
+    print(f"{'=' * 80}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client
+One place for the browser-like headers, connection pooling and retry policy
+used by every downloader, page fetcher and link checker
+
+- session(kind, pool_size) returns a process-wide requests.Session per header
+  profile, so keep-alive connections are reused across meetings and steps
+- The adapter pool is sized to the caller's concurrency (and grown if a later
+  caller needs more), so concurrent downloads do not queue on, or discard
+  connections from, requests' default 10-connection pool
+- 429 and 5xx responses (and connection errors) are retried with exponential
+  backoff plus jitter; Retry-After on 429/503 is honoured, capped at
+  RETRY_AFTER_MAX. After the last attempt the final response is returned as
+  usual, so callers keep their status-code handling
+- Accept-Encoding only lists encodings this install can decode
+- HostLimiter caps concurrent requests per host for the threaded downloaders
+
+Usage: python http_client.py <url>   Fetch a URL and print status, timing and retries
+"""
+
+import inspect
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+RETRIES = 4
+BACKOFF_FACTOR = 0.5      # 0.5, 1, 2, 4 s between attempts
+BACKOFF_JITTER = 0.5      # up to this many seconds added to each backoff
+BACKOFF_MAX = 30
+RETRY_AFTER_MAX = 120     # longest Retry-After we are willing to sleep
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_POOL_SIZE = 10
+MAX_PER_HOST = 6          # cap on in-flight requests to any single host
+
+USER_AGENT = ('Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/141.0.0.0 Mobile Safari/537.36')
+
+# Mimic real browser headers
+BASE_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'DNT': '1',
+    'Cache-Control': 'no-cache',
+    'Referer': 'https://aaiila.org/',
+}
+
+# Header profiles on top of BASE_HEADERS
+PROFILES = {
+    'html': {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    },
+    # Full navigation headers, to get past the site's bot protection
+    'navigate': {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,'
+                  '*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        'Pragma': 'no-cache',
+        'Sec-CH-UA': '"Google Chrome";v="141", "Not?A_Brand";v="8", "Chromium";v="141"',
+        'Sec-CH-UA-Mobile': '?1',
+        'Sec-CH-UA-Platform': '"Android"',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'same-origin',
+        'Sec-Fetch-User': '?1',
+        'Upgrade-Insecure-Requests': '1',
+    },
+    'document': {
+        'Accept': 'application/pdf,application/vnd.ms-powerpoint,'
+                  'application/vnd.openxmlformats-officedocument.presentationml.presentation,*/*',
+    },
+    'any': {
+        'Accept': '*/*',
+    },
+}
+
+_sessions: Dict[str, requests.Session] = {}
+_pool_sizes: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def retry_policy(retries: int = RETRIES) -> Retry:
+    """Backoff-with-jitter retry on 429/5xx and connection errors, honouring Retry-After"""
+    options = {
+        'total': retries,
+        'connect': retries,
+        'read': retries,
+        'status': retries,
+        'status_forcelist': RETRY_STATUSES,
+        'backoff_factor': BACKOFF_FACTOR,
+        'backoff_max': BACKOFF_MAX,
+        'backoff_jitter': BACKOFF_JITTER,
+        'retry_after_max': RETRY_AFTER_MAX,
+        'respect_retry_after_header': True,
+        'raise_on_status': False,
+        'raise_on_redirect': False,
+    }
+    # backoff_jitter and retry_after_max need urllib3 2.x
+    accepted = inspect.signature(Retry.__init__).parameters
+    return Retry(**{k: v for k, v in options.items() if k in accepted})
+
+
+def mount(http: requests.Session, pool_size: int, retries: int = RETRIES) -> None:
+    """(Re)mount pooled, retrying adapters for http and https"""
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry_policy(retries))
+    http.mount('https://', adapter)
+    http.mount('http://', adapter)
+
+
+def session(kind: str = 'html', pool_size: Optional[int] = None) -> requests.Session:
+    """
+    The shared session for a header profile ('html', 'navigate', 'document', 'any').
+    pool_size should be the number of threads that use it concurrently.
+    """
+    pool_size = max(pool_size or DEFAULT_POOL_SIZE, 1)
+    with _lock:
+        http = _sessions.get(kind)
+        if http is None:
+            http = requests.Session()
+            http.headers.update(BASE_HEADERS)
+            http.headers.update(PROFILES[kind])
+            _sessions[kind] = http
+        if pool_size > _pool_sizes.get(kind, 0):
+            # Growing the pool replaces the adapter; idle connections of the old one are dropped
+            mount(http, pool_size)
+            _pool_sizes[kind] = pool_size
+    return http
+
+
+def retries_used(response: requests.Response) -> int:
+    """How many retries urllib3 made before this response"""
+    retries = getattr(response.raw, 'retries', None)
+    return len(retries.history) if retries is not None else 0
+
+
+class HostLimiter:
+    """Bounds the number of concurrent requests per host"""
+
+    def __init__(self, per_host: int = MAX_PER_HOST):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's request slots for the duration of the block"""
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        with semaphore:
+            yield
+
+
+def close_all() -> None:
+    """Close every shared session (their pooled connections)"""
+    with _lock:
+        for http in _sessions.values():
+            http.close()
+        _sessions.clear()
+        _pool_sizes.clear()
+
+
+def main():
+    """Main execution"""
+    if len(sys.argv) < 2:
+        print(__doc__.split('Usage:', 1)[1].strip())
+        return
+
+    url = sys.argv[1]
+    http = session('any')
+    start = time.perf_counter()
+    try:
+        response = http.get(url, timeout=15)
+    except requests.RequestException as e:
+        print(f"❌ {url}: {e}")
+        return
+    print(f"HTTP {response.status_code} {url} ({len(response.content)} bytes, "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms, {retries_used(response)} retries)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Speaker Image Derivatives
+Post-download stage that turns the headshots in assets/images into
+width-bucketed WebP (and AVIF where Pillow supports it) derivatives
+
+- Derivatives are written where Nuxt serves them: headshots (assets/images)
+  to public/images/derivatives/speakers/{stem}-{width}w.{ext}, sources under
+  public/ (the kept uploads originals) to public/images/derivatives
+- Never upscales: buckets wider than the source are replaced by the source width
+- A manifest records dimensions and byte sizes for every source and derivative,
+  plus ready-made srcset strings
+- public/images/derivatives is pipeline output: gitignored and left out of
+  the asset manifest (look derivatives up through MANIFEST_FILE instead)
+- Unchanged sources (same size and mtime as in the manifest) are skipped
+- Pillow is optional; without it the stage is skipped with a warning
+
+Usage: python image_derivatives.py [--force] [<image filename> ...]
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import asset_manifest
+
+try:
+    from PIL import Image, ImageOps
+    HAS_PILLOW = True
+except ImportError:
+    Image = None
+    ImageOps = None
+    HAS_PILLOW = False
+
+if HAS_PILLOW:
+    try:
+        # Registers AVIF with Pillow releases that predate native support
+        import pillow_avif  # noqa: F401
+    except ImportError:
+        pass
+    Image.init()
+
+PROJECT_ROOT = Path(__file__).parent.parent
+IMAGES_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'assets' / 'images'
+PUBLIC_DIR = PROJECT_ROOT / 'public'
+PUBLIC_DERIVATIVES_DIR = PUBLIC_DIR / 'images' / 'derivatives'
+DERIVATIVES_DIR = PUBLIC_DERIVATIVES_DIR / 'speakers'
+MANIFEST_FILE = IMAGES_DIR / 'derivatives-manifest.json'
+
+# Width buckets (px) for srcset candidates
+WIDTHS = (160, 320, 640)
+
+# Encoder settings per output format
+FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'avif': {'format': 'AVIF', 'quality': 45, 'speed': 6},
+}
+
+SOURCE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+
+
+def available_formats() -> List[str]:
+    """Output formats this Pillow build can encode"""
+    if not HAS_PILLOW:
+        return []
+    return [name for name, options in FORMATS.items() if options['format'] in Image.SAVE]
+
+
+def target_widths(source_width: int, widths: Iterable[int] = WIDTHS) -> List[int]:
+    """Buckets narrower than the source, plus the source width capped at the largest bucket"""
+    widths = sorted(widths)
+    targets = [w for w in widths if w < source_width]
+    targets.append(min(source_width, widths[-1]))
+    return sorted(set(targets))
+
+
+def local_path(path: Path) -> str:
+    """Path as recorded in structured data (assets/images/...), or the served path for public/ files"""
+    if path.is_relative_to(PUBLIC_DIR):
+        return f"/{path.relative_to(PUBLIC_DIR).as_posix()}"
+    return f"assets/images/{path.relative_to(IMAGES_DIR).as_posix()}"
+
+
+def file_path(local: str) -> Path:
+    """Inverse of local_path"""
+    if local.startswith('/'):
+        return PUBLIC_DIR / local.lstrip('/')
+    return IMAGES_DIR / Path(local).relative_to('assets/images')
+
+
+def derivatives_dir(source: Path) -> Path:
+    """Output folder for a source's derivatives"""
+    return PUBLIC_DERIVATIVES_DIR if source.is_relative_to(PUBLIC_DIR) else DERIVATIVES_DIR
+
+
+def render_derivatives(source: str, output_dir: str, formats: List[str]) -> Dict:
+    """
+    Encode every width/format derivative for one source image.
+    Runs in a worker process, so it takes and returns plain values.
+    """
+    source = Path(source)
+    output_dir = Path(output_dir)
+    stat = source.stat()
+
+    with Image.open(source) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.mode not in ('RGB', 'RGBA'):
+            im = im.convert('RGBA' if 'transparency' in im.info or im.mode in ('LA', 'PA') else 'RGB')
+
+        entry = {
+            'width': im.width,
+            'height': im.height,
+            'bytes': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'derivatives': []
+        }
+
+        for width in target_widths(im.width):
+            height = max(1, round(im.height * width / im.width))
+            resized = im if width == im.width else im.resize((width, height), Image.LANCZOS)
+
+            for fmt in formats:
+                options = dict(FORMATS[fmt])
+                out_file = output_dir / f"{source.stem}-{width}w.{fmt}"
+                resized.save(out_file, options.pop('format'), **options)
+                entry['derivatives'].append({
+                    'path': local_path(out_file),
+                    'format': fmt,
+                    'width': width,
+                    'height': height,
+                    'bytes': out_file.stat().st_size
+                })
+
+    return entry
+
+
+def build_srcset(entry: Dict) -> Dict[str, str]:
+    """srcset attribute value per format, e.g. {'webp': '... 160w, ... 320w'}"""
+    candidates = {}
+    for derivative in entry['derivatives']:
+        candidates.setdefault(derivative['format'], []).append(
+            f"/{derivative['path'].lstrip('/')} {derivative['width']}w"
+        )
+    return {fmt: ', '.join(items) for fmt, items in candidates.items()}
+
+
+def load_manifest() -> Dict:
+    """Load the existing manifest, or an empty one"""
+    if MANIFEST_FILE.exists():
+        try:
+            with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠ Ignoring unreadable manifest: {e}")
+    return {'widths': list(WIDTHS), 'images': {}}
+
+
+def save_manifest(manifest: Dict) -> None:
+    """Write the manifest atomically so readers never see a partial file"""
+    tmp_file = MANIFEST_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, MANIFEST_FILE)
+
+
+def is_current(entry: Optional[Dict], source: Path, formats: List[str]) -> bool:
+    """True if the manifest entry matches the source file and all its derivatives exist"""
+    if not entry:
+        return False
+    stat = source.stat()
+    if entry.get('bytes') != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns:
+        return False
+    if {d['format'] for d in entry.get('derivatives', [])} != set(formats):
+        return False
+    return all(file_path(d['path']).exists() for d in entry['derivatives'])
+
+
+def generate_derivatives(sources: Optional[List[Path]] = None, force: bool = False,
+                         workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Generate derivatives for the given images (default: everything in IMAGES_DIR)
+    and merge them into the manifest.
+    Returns counts: {'generated', 'skipped', 'failed'}
+    """
+    counts = {'generated': 0, 'skipped': 0, 'failed': 0}
+
+    if not HAS_PILLOW:
+        print("  ⚠ Pillow not installed - skipping image derivatives (pip install Pillow)")
+        return counts
+
+    formats = available_formats()
+    if sources is None:
+        sources = sorted(p for p in IMAGES_DIR.iterdir()
+                         if p.is_file() and p.suffix.lower() in SOURCE_EXTENSIONS)
+
+    manifest = load_manifest()
+    manifest['widths'] = list(WIDTHS)
+    manifest['formats'] = formats
+    images = manifest.setdefault('images', {})
+
+    todo = []
+    for source in sources:
+        if not force and is_current(images.get(local_path(source)), source, formats):
+            counts['skipped'] += 1
+        else:
+            todo.append(source)
+
+    # Encoding is CPU-bound, so fan out across processes
+    if todo:
+        for output_dir in {derivatives_dir(source) for source in todo}:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                source: pool.submit(render_derivatives, str(source), str(derivatives_dir(source)), formats)
+                for source in todo
+            }
+            for source, future in futures.items():
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    print(f"    ⚠ Derivatives failed for {source.name}: {e}")
+                    counts['failed'] += 1
+                    continue
+                entry['srcset'] = build_srcset(entry)
+                images[local_path(source)] = entry
+                counts['generated'] += 1
+
+    # Drop entries whose source image is gone
+    for path in [p for p in images if not file_path(p).exists()]:
+        del images[path]
+
+    manifest['images'] = dict(sorted(images.items()))
+    save_manifest(manifest)
+    return counts
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("SPEAKER IMAGE DERIVATIVES")
+    print("=" * 80)
+    print()
+
+    args = sys.argv[1:]
+    force = '--force' in args
+    names = [a for a in args if a != '--force']
+
+    sources = None
+    if names:
+        sources = []
+        for name in names:
+            source = IMAGES_DIR / Path(name).name
+            if not source.exists():
+                print(f"❌ File not found: {source}")
+                return
+            sources.append(source)
+
+    print(f"Formats: {', '.join(available_formats()) or 'none (Pillow missing)'}")
+    print(f"Widths: {', '.join(str(w) for w in WIDTHS)}")
+    print()
+
+    counts = generate_derivatives(sources, force=force)
+    if counts['generated']:
+        asset_manifest.refresh()
+
+    print(f"\n{'=' * 80}")
+    print(f"COMPLETE: {counts['generated']} generated, {counts['skipped']} unchanged, {counts['failed']} failed")
+    print(f"Manifest: {MANIFEST_FILE}")
+    print(f"{'=' * 80}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+WordPress Export Inventory
+Streams the full WordPress export once and profiles its content, to size the
+migration and find where extractor work pays off
+
+Per post type and per category:
+- Item counts by status
+- content:encoded size distribution (log-scale buckets, total, max)
+- Shortcode frequency (uses and posts using each)
+- Postmeta key frequency
+Plus attachment totals by file type and year, and the heaviest posts.
+
+Memory is bounded: items are discarded as they are read, sizes go into fixed
+buckets and only the top-N heaviest posts are retained.
+
+Usage: python inventory-export.py [<export.xml>] [--top=N]
+"""
+
+import heapq
+import json
+import re
+import resource
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict
+
+import wp_export
+
+PROJECT_ROOT = Path(__file__).parent.parent
+REPORT_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'export-inventory.json'
+
+NS = wp_export.NAMESPACES
+
+# content:encoded size buckets: (upper bound in bytes, label)
+SIZE_BUCKETS = [
+    (1024, '<1K'),
+    (4 * 1024, '1-4K'),
+    (16 * 1024, '4-16K'),
+    (64 * 1024, '16-64K'),
+    (256 * 1024, '64-256K'),
+    (float('inf'), '>=256K'),
+]
+
+# Opening shortcodes: [name ...] but not [/name] or [[escaped]]
+SHORTCODE_PATTERN = re.compile(r'\[([A-Za-z][\w-]*)[\s\]/]')
+
+DEFAULT_TOP = 15
+
+
+def size_bucket(size: int) -> str:
+    """Label of the bucket a content size falls in"""
+    for limit, label in SIZE_BUCKETS:
+        if size < limit:
+            return label
+    return SIZE_BUCKETS[-1][1]
+
+
+class GroupStats:
+    """Running statistics for one post type or category"""
+
+    def __init__(self):
+        self.items = 0
+        self.status = Counter()
+        self.sizes = Counter()
+        self.content_bytes = 0
+        self.max_bytes = 0
+        self.shortcodes = Counter()
+        self.shortcode_posts = Counter()
+        self.postmeta = Counter()
+
+    def add(self, status: str, size: int, shortcodes: Counter, meta_keys):
+        self.items += 1
+        self.status[status] += 1
+        self.sizes[size_bucket(size)] += 1
+        self.content_bytes += size
+        self.max_bytes = max(self.max_bytes, size)
+        self.shortcodes.update(shortcodes)
+        self.shortcode_posts.update(shortcodes.keys())
+        self.postmeta.update(meta_keys)
+
+    def to_dict(self, top: int) -> Dict:
+        return {
+            'items': self.items,
+            'status': dict(self.status.most_common()),
+            'content_bytes': self.content_bytes,
+            'avg_bytes': round(self.content_bytes / self.items) if self.items else 0,
+            'max_bytes': self.max_bytes,
+            'size_distribution': {label: self.sizes.get(label, 0) for _, label in SIZE_BUCKETS},
+            'shortcodes': {name: {'uses': uses, 'posts': self.shortcode_posts[name]}
+                           for name, uses in self.shortcodes.most_common(top)},
+            'distinct_shortcodes': len(self.shortcodes),
+            'postmeta_keys': dict(self.postmeta.most_common(top)),
+            'distinct_postmeta_keys': len(self.postmeta),
+        }
+
+
+def text(item, path: str) -> str:
+    """Text of a child element, or ''"""
+    elem = item.find(path, NS)
+    return elem.text or '' if elem is not None else ''
+
+
+def build_inventory(xml_file: Path, top: int = DEFAULT_TOP) -> Dict:
+    """Stream the export once and return the inventory report"""
+    by_type: Dict[str, GroupStats] = {}
+    by_category: Dict[str, GroupStats] = {}
+    heaviest = []  # min-heap of (size, post_id, post_type, title)
+    attachments = {'total': 0, 'by_extension': Counter(), 'by_year': Counter(), 'unattached': 0}
+    total_items = 0
+
+    for item in wp_export.iter_items(xml_file):
+        total_items += 1
+        post_type = text(item, 'wp:post_type') or 'unknown'
+        post_id = text(item, 'wp:post_id')
+
+        if post_type == 'attachment':
+            url = text(item, 'wp:attachment_url')
+            suffix = Path(url.split('?', 1)[0]).suffix.lower() or '(none)'
+            attachments['total'] += 1
+            attachments['by_extension'][suffix] += 1
+            attachments['by_year'][text(item, 'wp:post_date')[:4] or 'unknown'] += 1
+            if text(item, 'wp:post_parent') in ('', '0'):
+                attachments['unattached'] += 1
+
+        content = text(item, 'content:encoded')
+        size = len(content.encode('utf-8'))
+        shortcodes = Counter(SHORTCODE_PATTERN.findall(content))
+        meta_keys = [text(meta, 'wp:meta_key') for meta in item.findall('wp:postmeta', NS)]
+        status = text(item, 'wp:status') or 'unknown'
+
+        by_type.setdefault(post_type, GroupStats()).add(status, size, shortcodes, meta_keys)
+        for category in item.findall('category[@domain="category"]'):
+            by_category.setdefault(category.text or '', GroupStats()).add(status, size, shortcodes, meta_keys)
+
+        entry = (size, post_id, post_type, text(item, 'title'))
+        if len(heaviest) < top:
+            heapq.heappush(heaviest, entry)
+        elif size > heaviest[0][0]:
+            heapq.heapreplace(heaviest, entry)
+
+    return {
+        'export': str(xml_file),
+        'export_bytes': xml_file.stat().st_size,
+        'items': total_items,
+        'post_types': {name: stats.to_dict(top)
+                       for name, stats in sorted(by_type.items(), key=lambda kv: -kv[1].items)},
+        'categories': {name: stats.to_dict(top)
+                       for name, stats in sorted(by_category.items(), key=lambda kv: -kv[1].items)},
+        'attachments': {
+            'total': attachments['total'],
+            'unattached': attachments['unattached'],
+            'by_extension': dict(attachments['by_extension'].most_common()),
+            'by_year': dict(sorted(attachments['by_year'].items())),
+        },
+        'heaviest_posts': [
+            {'post_id': post_id, 'post_type': post_type, 'title': title, 'content_bytes': size}
+            for size, post_id, post_type, title in sorted(heaviest, reverse=True)
+        ],
+    }
+
+
+def print_group(name: str, stats: Dict, top: int):
+    """Print one post type / category block"""
+    status = ', '.join(f"{s}: {n}" for s, n in stats['status'].items())
+    print(f"\n{name} — {stats['items']} items ({status})")
+    print(f"  content: {stats['content_bytes'] / 1024:.0f} KB total, "
+          f"avg {stats['avg_bytes'] / 1024:.1f} KB, max {stats['max_bytes'] / 1024:.1f} KB")
+    print(f"  sizes:   " + '  '.join(f"{label} {n}" for label, n in stats['size_distribution'].items() if n))
+    if stats['shortcodes']:
+        shortcodes = ', '.join(f"{name} {s['uses']}" for name, s in list(stats['shortcodes'].items())[:top])
+        print(f"  shortcodes ({stats['distinct_shortcodes']} distinct): {shortcodes}")
+    if stats['postmeta_keys']:
+        keys = ', '.join(f"{k} {n}" for k, n in list(stats['postmeta_keys'].items())[:top])
+        print(f"  postmeta ({stats['distinct_postmeta_keys']} distinct keys): {keys}")
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("WORDPRESS EXPORT INVENTORY")
+    print("=" * 80)
+
+    args = sys.argv[1:]
+    top = next((int(a.split('=', 1)[1]) for a in args if a.startswith('--top=')), DEFAULT_TOP)
+    paths = [a for a in args if not a.startswith('--')]
+    xml_file = Path(paths[0]) if paths else wp_export.EXPORT_FILE
+
+    if not xml_file.exists():
+        print(f"❌ Export not found: {xml_file}")
+        return
+
+    print(f"\nExport: {xml_file} ({xml_file.stat().st_size / 1024 / 1024:.1f} MB)")
+
+    start_time = time.time()
+    report = build_inventory(xml_file, top)
+    elapsed = time.time() - start_time
+
+    print(f"Items: {report['items']}")
+
+    print("\n" + "-" * 80)
+    print("BY POST TYPE")
+    print("-" * 80)
+    for name, stats in report['post_types'].items():
+        print_group(name, stats, top)
+
+    print("\n" + "-" * 80)
+    print("BY CATEGORY")
+    print("-" * 80)
+    for name, stats in report['categories'].items():
+        print_group(name or '(empty)', stats, top)
+
+    attachments = report['attachments']
+    print("\n" + "-" * 80)
+    print(f"ATTACHMENTS: {attachments['total']} ({attachments['unattached']} unattached)")
+    print("-" * 80)
+    print("  by type: " + ', '.join(f"{ext} {n}" for ext, n in attachments['by_extension'].items()))
+    print("  by year: " + ', '.join(f"{year} {n}" for year, n in attachments['by_year'].items()))
+
+    print("\n" + "-" * 80)
+    print(f"HEAVIEST POSTS (content:encoded)")
+    print("-" * 80)
+    for post in report['heaviest_posts']:
+        print(f"  {post['content_bytes'] / 1024:8.1f} KB  [{post['post_type']}] {post['post_id']}: "
+              f"{post['title'][:60]}")
+
+    REPORT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    # ru_maxrss is KB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\nTime elapsed: {elapsed:.2f} seconds, peak memory {peak_mb:.0f} MB")
+    print(f"✓ Report saved to: {REPORT_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Material Post-Processing
+Post-download stage for the PDFs in assets/materials
+
+For each PDF:
+- Counts pages
+- Renders a first-page thumbnail to assets/materials/thumbnails/{stem}.jpg
+- Optionally linearizes the file in place ("fast web view")
+
+Results are recorded on each material in structured-json next to local_path
+(page_count, thumbnail_path, linearized). Each step fails on its own: a PDF
+whose thumbnail cannot be rendered still gets its page count, and the errors
+are kept in the processing state so the file is retried on the next run.
+Files are processed in a process pool, and files unchanged since the last run
+are skipped.
+
+Backends are optional and picked in order of preference:
+- Page count:  PyMuPDF, pikepdf, pypdf
+- Thumbnail:   PyMuPDF, pdftoppm (poppler-utils)
+- Linearize:   pikepdf, qpdf
+
+Usage: python material_processing.py [--linearize] [--force] [<filename.pdf> ...]
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf
+    except ImportError:
+        pymupdf = None
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+import asset_manifest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+STRUCTURED_JSON = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-json'
+MATERIALS_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'assets' / 'materials'
+THUMBNAILS_DIR = MATERIALS_DIR / 'thumbnails'
+STATE_FILE = MATERIALS_DIR / 'processing-state.json'
+
+THUMBNAIL_WIDTH = 320
+
+QPDF = shutil.which('qpdf')
+PDFTOPPM = shutil.which('pdftoppm')
+
+
+def available_backends() -> Dict[str, Optional[str]]:
+    """Backend used for each step, or None if the step is unavailable"""
+    return {
+        'page_count': 'pymupdf' if pymupdf else 'pikepdf' if pikepdf else 'pypdf' if pypdf else None,
+        'thumbnail': 'pymupdf' if pymupdf else 'pdftoppm' if PDFTOPPM else None,
+        'linearize': 'pikepdf' if pikepdf else 'qpdf' if QPDF else None,
+    }
+
+
+def is_linearized(pdf_path: Path) -> bool:
+    """Linearized PDFs declare a /Linearized dictionary in the first object"""
+    with open(pdf_path, 'rb') as f:
+        return b'/Linearized' in f.read(1024)
+
+
+def count_pages(pdf_path: Path) -> Optional[int]:
+    """Number of pages, or None if no backend is installed"""
+    if pymupdf:
+        with pymupdf.open(pdf_path) as doc:
+            return doc.page_count
+    if pikepdf:
+        with pikepdf.open(pdf_path) as pdf:
+            return len(pdf.pages)
+    if pypdf:
+        return len(pypdf.PdfReader(str(pdf_path)).pages)
+    return None
+
+
+def render_thumbnail(pdf_path: Path, output_path: Path) -> bool:
+    """Render page 1 at THUMBNAIL_WIDTH pixels wide as JPEG"""
+    if pymupdf:
+        with pymupdf.open(pdf_path) as doc:
+            page = doc[0]
+            zoom = THUMBNAIL_WIDTH / page.rect.width
+            pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+            pixmap.save(output_path, jpg_quality=80)
+        return True
+    if PDFTOPPM:
+        # pdftoppm appends the extension itself
+        subprocess.run(
+            [PDFTOPPM, '-jpeg', '-singlefile', '-f', '1', '-l', '1',
+             '-scale-to-x', str(THUMBNAIL_WIDTH), '-scale-to-y', '-1',
+             str(pdf_path), str(output_path.with_suffix(''))],
+            check=True, capture_output=True, timeout=120
+        )
+        return True
+    return False
+
+
+def linearize(pdf_path: Path) -> bool:
+    """Rewrite the PDF linearized, replacing the original atomically"""
+    tmp_path = pdf_path.with_suffix('.linearized.tmp')
+    try:
+        if pikepdf:
+            with pikepdf.open(pdf_path) as pdf:
+                pdf.save(tmp_path, linearize=True)
+        elif QPDF:
+            # qpdf exits 3 for warnings but still writes usable output
+            result = subprocess.run([QPDF, '--linearize', str(pdf_path), str(tmp_path)],
+                                    capture_output=True, timeout=300)
+            if result.returncode not in (0, 3):
+                raise RuntimeError(result.stderr.decode(errors='replace').strip())
+        else:
+            return False
+        os.replace(tmp_path, pdf_path)
+        return True
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def process_pdf(pdf_path: str, do_linearize: bool) -> Dict:
+    """
+    Run every processing step on one PDF.
+    Runs in a worker process, so it takes and returns plain values.
+    """
+    pdf_path = Path(pdf_path)
+    result = {}
+    errors = {}
+
+    if do_linearize and not is_linearized(pdf_path):
+        try:
+            linearize(pdf_path)
+        except Exception as e:
+            errors['linearize'] = f"{type(e).__name__}: {e}"
+    result['linearized'] = is_linearized(pdf_path)
+
+    try:
+        page_count = count_pages(pdf_path)
+        if page_count is not None:
+            result['page_count'] = page_count
+    except Exception as e:
+        errors['page_count'] = f"{type(e).__name__}: {e}"
+
+    THUMBNAILS_DIR.mkdir(parents=True, exist_ok=True)
+    thumbnail = THUMBNAILS_DIR / f"{pdf_path.stem}.jpg"
+    try:
+        if render_thumbnail(pdf_path, thumbnail):
+            result['thumbnail_path'] = f"assets/materials/thumbnails/{thumbnail.name}"
+    except Exception as e:
+        errors['thumbnail'] = f"{type(e).__name__}: {e}"
+
+    if errors:
+        result['errors'] = errors
+
+    # Fingerprint after any rewrite so the next run can skip this file
+    stat = pdf_path.stat()
+    result['size'] = stat.st_size
+    result['mtime_ns'] = stat.st_mtime_ns
+    return result
+
+
+def load_state() -> Dict:
+    """Results of previous runs keyed by local_path"""
+    if STATE_FILE.exists():
+        try:
+            with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠ Ignoring unreadable processing state: {e}")
+    return {}
+
+
+def save_state(state: Dict) -> None:
+    """Write the processing state atomically"""
+    tmp_file = STATE_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(state.items())), f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, STATE_FILE)
+
+
+def is_current(entry: Optional[Dict], pdf_path: Path, do_linearize: bool) -> bool:
+    """True if the PDF is unchanged since it was last processed without errors"""
+    if not entry or entry.get('errors'):
+        return False
+    stat = pdf_path.stat()
+    if entry.get('size') != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns:
+        return False
+    if do_linearize and not entry.get('linearized'):
+        return False
+    thumbnail = entry.get('thumbnail_path')
+    return not thumbnail or (MATERIALS_DIR.parent / Path(thumbnail).relative_to('assets')).exists()
+
+
+def process_materials(pdf_files: Optional[List[Path]] = None, do_linearize: bool = False,
+                      force: bool = False, workers: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Process the given PDFs (default: every PDF in MATERIALS_DIR) in a process pool.
+    Returns {local_path: result} for every requested file that has results.
+    """
+    if pdf_files is None:
+        pdf_files = sorted(MATERIALS_DIR.glob('*.pdf'))
+
+    state = load_state()
+    results = {}
+    todo = []
+
+    for pdf_file in pdf_files:
+        key = f"assets/materials/{pdf_file.name}"
+        if not force and is_current(state.get(key), pdf_file, do_linearize):
+            results[key] = state[key]
+        else:
+            todo.append(pdf_file)
+
+    print(f"  PDFs: {len(todo)} to process, {len(results)} unchanged")
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pdf_file: pool.submit(process_pdf, str(pdf_file), do_linearize) for pdf_file in todo}
+            for pdf_file, future in futures.items():
+                key = f"assets/materials/{pdf_file.name}"
+                try:
+                    results[key] = state[key] = future.result()
+                except Exception as e:
+                    print(f"    ⚠ {pdf_file.name}: processing failed: {e}")
+                    continue
+                r = results[key]
+                print(f"    ✓ {pdf_file.name}: {r.get('page_count', '?')} pages"
+                      f"{', thumbnail' if r.get('thumbnail_path') else ''}"
+                      f"{', linearized' if r.get('linearized') else ''}")
+                for step, error in r.get('errors', {}).items():
+                    print(f"      ⚠ {step} failed: {error}")
+
+        save_state(state)
+
+    return results
+
+
+def update_json(json_file: Path, results: Dict[str, Dict]) -> bool:
+    """
+    Record results on every material whose local_path was processed.
+    Returns True if the file changed.
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    changed = False
+    for topic in data.get('topics', []):
+        for material in topic.get('materials', []):
+            result = results.get(material.get('local_path'))
+            if not result:
+                continue
+            for field in ('page_count', 'thumbnail_path', 'linearized'):
+                if field in result and material.get(field) != result[field]:
+                    material[field] = result[field]
+                    changed = True
+
+    if changed:
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    return changed
+
+
+def annotate_structured_json(results: Dict[str, Dict], json_files: Optional[List[Path]] = None) -> int:
+    """Apply results to the given structured JSON files (default: all). Returns files updated."""
+    updated = 0
+    for json_file in json_files or sorted(STRUCTURED_JSON.glob('*.json')):
+        try:
+            if update_json(json_file, results):
+                updated += 1
+                print(f"    ✓ Updated JSON: {json_file.name}")
+        except Exception as e:
+            print(f"    ⚠ Error updating {json_file.name}: {e}")
+    return updated
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("MATERIAL POST-PROCESSING (PDF)")
+    print("=" * 80)
+    print()
+
+    args = sys.argv[1:]
+    do_linearize = '--linearize' in args
+    force = '--force' in args
+    names = [a for a in args if not a.startswith('--')]
+
+    pdf_files = None
+    if names:
+        pdf_files = []
+        for name in names:
+            pdf_file = MATERIALS_DIR / Path(name).name
+            if not pdf_file.exists():
+                print(f"❌ File not found: {pdf_file}")
+                return
+            pdf_files.append(pdf_file)
+
+    backends = available_backends()
+    for step, backend in backends.items():
+        print(f"{step}: {backend or 'unavailable'}")
+    if do_linearize and not backends['linearize']:
+        print("⚠ --linearize requested but neither pikepdf nor qpdf is installed")
+    print()
+
+    results = process_materials(pdf_files, do_linearize=do_linearize, force=force)
+
+    print(f"\n  Updating structured data files...")
+    updated = annotate_structured_json(results)
+    asset_manifest.refresh()
+
+    print(f"\n{'=' * 80}")
+    print(f"COMPLETE: {len(results)} PDFs, {updated} JSON files updated")
+    print(f"{'=' * 80}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Migration CLI
+One entry point for the migration pipeline; every step runs in this interpreter
+
+- Subcommands map to the existing scripts, which are imported only when their
+  subcommand runs, so requests/bs4/ElementTree are never loaded for cheap
+  commands or for help
+- An import hook makes the hyphenated scripts importable under underscore
+  names (import batch_extract_all -> batch-extract-all.py), so modules load
+  once, are shared between steps and pickle cleanly into worker processes
+- "<command> --help" prints the script's docstring without importing it
+
+Usage: python migrate.py <command> [args...]
+       python migrate.py --help
+"""
+
+import ast
+import importlib.abc
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+# Searched in order when resolving an underscore name to a hyphenated script
+SCRIPT_DIRS = [SCRIPTS_DIR, SCRIPTS_DIR / 'old-non-releavnt-scripts']
+
+# command -> (batch script, single-file script or None, summary)
+COMMANDS = {
+    'split': ('extract-individual-items.py', None,
+              'Split the WordPress export into per-post XML files'),
+    'extract': ('batch-extract-all.py', 'extract-structured-data-v2.py',
+                'Extract structured XML/JSON (all categories, or one <file.xml>)'),
+    'markdown': ('generate-meeting-markdown.py', None,
+                 'Render meeting markdown from structured JSON'),
+    'download-images': ('batch-download-all-images.py', 'download-speaker-images.py',
+                        'Download speaker images (all meetings, or one <file.json>)'),
+    'download-materials': ('batch-download-all-materials.py', 'download-materials.py',
+                           'Download presentation materials (all meetings, or one <file.json>)'),
+    'verify': ('batch-verify-all.py', None,
+               'Verify extraction against the live or snapshotted pages'),
+    'validate-links': ('validate-links.py', None,
+                       'Check every extracted URL'),
+    'watch': ('watch-extraction.py', None,
+              'Re-extract and regenerate on file changes'),
+}
+
+
+class ScriptFinder(importlib.abc.MetaPathFinder):
+    """Resolve 'batch_extract_all' to scripts/batch-extract-all.py"""
+
+    def find_spec(self, fullname, path=None, target=None):
+        if '.' in fullname or '_' not in fullname:
+            return None
+        filename = fullname.replace('_', '-') + '.py'
+        for directory in SCRIPT_DIRS:
+            # A real module of that name wins
+            if (directory / f"{fullname}.py").exists():
+                return None
+            if (directory / filename).exists():
+                return importlib.util.spec_from_file_location(fullname, directory / filename)
+        return None
+
+
+def install_finder():
+    """Make the hyphenated scripts importable (idempotent)"""
+    if not any(isinstance(finder, ScriptFinder) for finder in sys.meta_path):
+        sys.meta_path.append(ScriptFinder())
+    for directory in reversed(SCRIPT_DIRS):
+        if str(directory) not in sys.path:
+            sys.path.insert(0, str(directory))
+
+
+def module_name(filename: str) -> str:
+    """'batch-extract-all.py' -> 'batch_extract_all'"""
+    return filename[:-len('.py')].replace('-', '_')
+
+
+def script_path(filename: str) -> Path:
+    for directory in SCRIPT_DIRS:
+        if (directory / filename).exists():
+            return directory / filename
+    raise FileNotFoundError(filename)
+
+
+def script_doc(filename: str) -> str:
+    """A script's docstring, read without executing it"""
+    return ast.get_docstring(ast.parse(script_path(filename).read_text(encoding='utf-8'))) or ''
+
+
+def print_usage():
+    print(__doc__.split('Usage:', 1)[1].strip().splitlines()[0].strip())
+    print("\nCommands:")
+    for command, (_, _, summary) in COMMANDS.items():
+        print(f"  {command:<20} {summary}")
+    print("\nRun 'python migrate.py <command> --help' for a command's options")
+
+
+def run(command: str, args):
+    """Import the command's script and call its main() with args"""
+    batch_script, single_script, _ = COMMANDS[command]
+    # A single .xml/.json argument goes to the per-file script
+    filename = single_script if single_script and any(a.endswith(('.xml', '.json')) for a in args) else batch_script
+
+    if '--help' in args or '-h' in args:
+        print(script_doc(filename))
+        return
+
+    module = importlib.import_module(module_name(filename))
+    sys.argv = [str(script_path(filename))] + list(args)
+    module.main()
+
+
+def main():
+    """Main execution"""
+    args = sys.argv[1:]
+    if not args or args[0] in ('--help', '-h', 'help'):
+        print_usage()
+        return
+
+    command, rest = args[0], args[1:]
+    if command not in COMMANDS:
+        print(f"❌ Unknown command: {command}\n")
+        print_usage()
+        sys.exit(2)
+
+    run(command, rest)
+
+
+# Worker processes re-import this module as __mp_main__, so the finder is in
+# place before they unpickle functions from script modules
+install_finder()
+
+if __name__ == '__main__':
+    main()
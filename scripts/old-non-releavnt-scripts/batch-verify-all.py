@@ -2,97 +2,160 @@
 """
 Batch Verification Script
 Runs web verification on all 50 structured XML files
+
+Results are collected into a columnar VerificationTable (verification-stats.py),
+which supplies the summary, the per-format/year/topic-count breakdowns and the
+per-run CSVs used for trends across runs.
+
+Modes:
+  python batch-verify-all.py                      Verify against live pages (sequential)
+  python batch-verify-all.py snapshot [--refresh] Save every meeting page to the snapshot corpus
+  python batch-verify-all.py --offline [--workers=N]
+                                                  Verify against snapshots in parallel, no network
 """
 
 import sys
 from pathlib import Path
 import time
 import json
+import io
+import contextlib
 import importlib.util
+from concurrent.futures import ProcessPoolExecutor
 
 # Load the verification script
-PROJECT_ROOT = Path(__file__).parent.parent
-verify_script = PROJECT_ROOT / 'scripts' / 'verify-extraction-accuracy.py'
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+verify_script = Path(__file__).parent / 'verify-extraction-accuracy.py'
 
 spec = importlib.util.spec_from_file_location("verify", verify_script)
 verify_module = importlib.util.module_from_spec(spec)
+# Registered so worker processes can unpickle its dataclasses
+sys.modules['verify'] = verify_module
 spec.loader.exec_module(verify_module)
 
 LivePageFetcher = verify_module.LivePageFetcher
+SnapshotPageFetcher = verify_module.SnapshotPageFetcher
 ContentComparator = verify_module.ContentComparator
 verify_file = verify_module.verify_file
 load_xml_data = verify_module.load_xml_data
 
+spec = importlib.util.spec_from_file_location("verification_stats", Path(__file__).parent / 'verification-stats.py')
+verification_stats = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(verification_stats)
+
 STRUCTURED_XML = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-xml'
 VERIFICATION_OUTPUT = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'batch-verification-report.json'
 
+# Per-process fetcher/comparator for offline workers
+_worker_state = {}
+
+
+def verify_offline(xml_file: Path):
+    """Verify one file against its snapshot in a worker process. Returns (result, printed output)."""
+    if not _worker_state:
+        _worker_state['fetcher'] = SnapshotPageFetcher()
+        _worker_state['comparator'] = ContentComparator()
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = verify_file(xml_file, _worker_state['fetcher'], _worker_state['comparator'])
+    return result, output.getvalue()
+
+
+def take_snapshots(xml_files, refresh: bool):
+    """Save the live page of every structured XML file to the snapshot corpus"""
+    pages = []
+    for xml_file in xml_files:
+        xml_data = load_xml_data(xml_file)
+        url = xml_data['metadata'].get('link', '') if xml_data else ''
+        if url:
+            pages.append((xml_file.stem, url))
+
+    print(f"Snapshotting {len(pages)} pages to {verify_module.SNAPSHOT_DIR}")
+    print()
+    counts = verify_module.snapshot_pages(pages, LivePageFetcher(), refresh=refresh)
+
+    print("\n" + "=" * 80)
+    print(f"SNAPSHOT COMPLETE: {counts['saved']} saved, {counts['skipped']} already present, "
+          f"{counts['failed']} failed")
+    print("=" * 80)
+
+
+def iter_results(xml_files, offline: bool, workers):
+    """Yield (index, xml_file, result or exception) in file order"""
+    if offline:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(verify_offline, xml_file) for xml_file in xml_files]
+            for i, (xml_file, future) in enumerate(zip(xml_files, futures), 1):
+                try:
+                    result, output = future.result()
+                except Exception as e:
+                    yield i, xml_file, e
+                    continue
+                print(f"\n[{i}/{len(xml_files)}] {xml_file.name}")
+                print("-" * 60)
+                print(output, end='')
+                yield i, xml_file, result
+        return
+
+    fetcher = LivePageFetcher()
+    comparator = ContentComparator()
+    for i, xml_file in enumerate(xml_files, 1):
+        print(f"\n[{i}/{len(xml_files)}] {xml_file.name}")
+        print("-" * 60)
+        try:
+            yield i, xml_file, verify_file(xml_file, fetcher, comparator)
+        except Exception as e:
+            yield i, xml_file, e
+
+        # Brief pause between requests to be respectful to server
+        if i < len(xml_files):
+            time.sleep(1.5)
+
 
 def main():
     """Verify all structured XML files"""
+    args = sys.argv[1:]
+    offline = '--offline' in args
+    workers = next((int(a.split('=', 1)[1]) for a in args if a.startswith('--workers=')), None)
+
     print("=" * 80)
-    print("BATCH WEB VERIFICATION - ALL 50 FILES")
+    print(f"BATCH {'OFFLINE' if offline else 'WEB'} VERIFICATION - ALL 50 FILES")
     print("=" * 80)
     print()
 
     # Get all structured XML files
     xml_files = sorted(STRUCTURED_XML.glob('*.xml'))
 
+    if 'snapshot' in args:
+        take_snapshots(xml_files, refresh='--refresh' in args)
+        return
+
+    if offline and not verify_module.SNAPSHOT_MANIFEST.exists():
+        print("❌ No page snapshots found. Run: python batch-verify-all.py snapshot")
+        return
+
     print(f"Found {len(xml_files)} structured XML files to verify")
     print()
 
-    fetcher = LivePageFetcher()
-    comparator = ContentComparator()
-
     results = []
-    stats = {
-        'total': len(xml_files),
-        'accessible': 0,
-        'inaccessible': 0,
-        'topic_matches': 0,
-        'total_accuracy': 0.0,
-        'high_accuracy': 0,  # >= 80%
-        'medium_accuracy': 0,  # 50-79%
-        'low_accuracy': 0,  # < 50%
-    }
+    run_id = time.strftime('%Y%m%d-%H%M%S') + ('-offline' if offline else '-live')
+    table = verification_stats.VerificationTable(run_id)
 
     start_time = time.time()
 
     # Verify each file
-    for i, xml_file in enumerate(xml_files, 1):
-        print(f"\n[{i}/{len(xml_files)}] {xml_file.name}")
-        print("-" * 60)
-
-        try:
-            result = verify_file(xml_file, fetcher, comparator)
-            results.append(result)
-
-            # Update stats
-            if result.page_accessible:
-                stats['accessible'] += 1
-                stats['total_accuracy'] += result.accuracy_score
-
-                if result.accuracy_score >= 80:
-                    stats['high_accuracy'] += 1
-                elif result.accuracy_score >= 50:
-                    stats['medium_accuracy'] += 1
-                else:
-                    stats['low_accuracy'] += 1
-
-                if result.topic_count_match:
-                    stats['topic_matches'] += 1
-            else:
-                stats['inaccessible'] += 1
-
-        except Exception as e:
-            print(f"❌ Verification error: {e}")
-            results.append({
+    for i, xml_file, result in iter_results(xml_files, offline, workers):
+        if isinstance(result, Exception):
+            print(f"❌ Verification error: {result}")
+            result = {
                 'file_name': xml_file.name,
-                'error': str(e)
-            })
+                'error': str(result)
+            }
+        results.append(result)
+        table.add(result, *verification_stats.meeting_facts(xml_file))
 
-        # Brief pause between requests to be respectful to server
-        if i < len(xml_files):
-            time.sleep(1.5)
+    stats = table.stats()
 
     # Calculate average accuracy
     avg_accuracy = stats['total_accuracy'] / stats['accessible'] if stats['accessible'] > 0 else 0
@@ -111,13 +174,18 @@ def main():
     print(f"  Medium (50-79%): {stats['medium_accuracy']}")
     print(f"  Low (<50%): {stats['low_accuracy']}")
     print(f"\nAverage accuracy: {avg_accuracy:.1f}%")
-    print(f"Time elapsed: {elapsed:.1f} seconds ({elapsed/60:.1f} minutes)")
+    verification_stats.print_report(table)
+    print(f"\nTime elapsed: {elapsed:.1f} seconds ({elapsed/60:.1f} minutes)")
 
     # Save detailed report
     report = {
         'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
         'stats': stats,
         'average_accuracy': round(avg_accuracy, 2),
+        'run': run_id,
+        'breakdowns': {
+            by: table.breakdown(by) for by in ('format', 'year', 'topic_count')
+        } if verification_stats.HAS_NUMPY else {},
         'results': [
             {
                 'file_name': r.file_name if hasattr(r, 'file_name') else r.get('file_name'),
@@ -136,6 +204,7 @@ def main():
         json.dump(report, f, indent=2, ensure_ascii=False)
 
     print(f"\n✓ Detailed report saved: {VERIFICATION_OUTPUT}")
+    print(f"✓ Run table saved: {table.save()}")
 
     # Show files with low accuracy
     low_acc_files = [r for r in results if hasattr(r, 'accuracy_score') and r.accuracy_score < 50]
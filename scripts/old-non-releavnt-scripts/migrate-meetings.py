@@ -15,13 +15,18 @@ This script:
 import xml.etree.ElementTree as ET
 import json
 import os
-import shutil
 import logging
 from pathlib import Path
 from datetime import datetime
 from html.parser import HTMLParser
 from urllib.parse import urlparse
 import re
+import sys
+
+# Shared pipeline modules live in scripts/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import uploads_index
+import image_derivatives
 
 # Configure logging
 logging.basicConfig(
@@ -49,6 +54,7 @@ class MeetingExtractor:
         self.images_meetings_dir = self.public_dir / 'images' / 'meetings'
         self.images_speakers_dir = self.public_dir / 'images' / 'speakers'
         self.documents_dir = self.public_dir / 'documents' / 'meetings'
+        self.uploads_dir = self.project_root / 'AAII-Migration-assets' / 'uploads'
 
         self.meetings = []
         self.migration_report = {
@@ -59,8 +65,10 @@ class MeetingExtractor:
             'missing_pdfs': [],
             'errors': [],
             'file_mapping': {},
-            'assets_organized': []
+            'assets_organized': [],
+            'variants_collapsed': 0
         }
+        self.uploads = None
 
     def setup_directories(self):
         """Create necessary directories"""
@@ -463,56 +471,56 @@ class MeetingExtractor:
         return html.strip()
 
     def organize_assets(self):
-        """Organize and copy assets from WordPress migration folder"""
+        """
+        Place images and PDFs from the indexed uploads tree into public/ (incremental).
+        Only the best source of each image size-variant group is published.
+        """
         logger.info("Organizing and copying assets...")
 
-        migration_assets = self.project_root / 'AAII-Migration-assets' / 'uploads'
-
-        if not migration_assets.exists():
-            logger.warning(f"Migration assets folder not found: {migration_assets}")
+        if not self.uploads_dir.exists():
+            logger.warning(f"Migration assets folder not found: {self.uploads_dir}")
             return
 
-        # Copy all images from migration assets to public/images directories
         try:
-            # Copy all images to meetings folder
-            for year_folder in migration_assets.iterdir():
-                if not year_folder.is_dir():
-                    continue
-
-                for month_folder in year_folder.iterdir():
-                    if not month_folder.is_dir():
-                        continue
-
-                    for file in month_folder.iterdir():
-                        if file.is_file() and file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-                            try:
-                                # Copy images to meetings folder
-                                dest = self.images_meetings_dir / file.name
-                                shutil.copy2(str(file), str(dest))
-                                self.migration_report['assets_organized'].append(f"{file.name} (meeting image)")
-
-                                # Check if it's a speaker image and copy to speakers folder too
-                                if any(x in file.name.lower() for x in ['speaker', 'headshot', 'portrait', 'profile']):
-                                    dest_speaker = self.images_speakers_dir / file.name
-                                    if not dest_speaker.exists():
-                                        shutil.copy2(str(file), str(dest_speaker))
-
-                            except Exception as e:
-                                logger.warning(f"Could not copy image {file.name}: {e}")
-                                self.migration_report['missing_images'].append(str(file))
-
-                        elif file.is_file() and file.suffix.lower() == '.pdf':
-                            try:
-                                # Copy PDFs to documents folder
-                                dest = self.documents_dir / file.name
-                                shutil.copy2(str(file), str(dest))
-                                self.migration_report['assets_organized'].append(f"{file.name} (document)")
-
-                            except Exception as e:
-                                logger.warning(f"Could not copy PDF {file.name}: {e}")
-                                self.migration_report['missing_pdfs'].append(str(file))
-
-            logger.info(f"Asset organization complete: {len(self.migration_report['assets_organized'])} files copied")
+            self.uploads = uploads_index.build_index(self.uploads_dir)
+            methods = {}
+            kept = self.uploads.kept()
+            self.migration_report['variants_collapsed'] = len(self.uploads) - len(kept)
+            placed_images = []
+
+            for entry in kept:
+                source = self.uploads.path(entry)
+                if entry['kind'] == 'image':
+                    targets = [self.images_meetings_dir / entry['name']]
+                    # Speaker images also go to the speakers folder
+                    if any(x in entry['name'].lower() for x in ['speaker', 'headshot', 'portrait', 'profile']):
+                        targets.append(self.images_speakers_dir / entry['name'])
+                    label, failures = 'meeting image', self.migration_report['missing_images']
+                else:
+                    targets = [self.documents_dir / entry['name']]
+                    label, failures = 'document', self.migration_report['missing_pdfs']
+
+                try:
+                    # Reflinked or copied, never hardlinked: public/ files can be edited without touching uploads
+                    for dest in targets:
+                        method = uploads_index.place(source, dest, entry['sha256'])
+                        methods[method] = methods.get(method, 0) + 1
+                    if entry['kind'] == 'image':
+                        placed_images.append(targets[0])
+                    self.migration_report['assets_organized'].append(f"{entry['name']} ({label})")
+                except Exception as e:
+                    logger.warning(f"Could not copy {label} {entry['name']}: {e}")
+                    failures.append(str(source))
+
+            summary = ', '.join(f"{count} {method}" for method, count in sorted(methods.items()))
+            logger.info(f"Asset organization complete: {len(self.migration_report['assets_organized'])} files "
+                        f"({summary or 'nothing to do'}); "
+                        f"{self.migration_report['variants_collapsed']} size variants not copied")
+
+            # Responsive derivatives come from the kept sources, not WordPress's own sizes
+            counts = image_derivatives.generate_derivatives(placed_images)
+            logger.info(f"Image derivatives: {counts['generated']} generated, {counts['skipped']} unchanged, "
+                        f"{counts['failed']} failed")
 
         except Exception as e:
             logger.error(f"Error organizing assets: {e}")
@@ -523,7 +531,15 @@ class MeetingExtractor:
         logger.info("Updating markdown files with asset paths...")
 
         try:
-            migration_assets = self.project_root / 'AAII-Migration-assets' / 'uploads'
+            if self.uploads is None:
+                self.uploads = uploads_index.build_index(self.uploads_dir)
+
+            kept = {entry['path'] for entry in self.uploads.kept()}
+
+            def published_name(name):
+                """Filename an asset was published under (size variants map to their kept source)"""
+                entry = self.uploads.resolve(name)
+                return entry['name'] if entry else name
 
             # Map image filenames to meetings
             for markdown_file in self.content_dir.glob('*.md'):
@@ -537,26 +553,23 @@ class MeetingExtractor:
                     year = date_match.group(1)
                     month = date_match.group(2)
 
-                    # Look for images in corresponding month folder
-                    month_assets = migration_assets / year / month
-                    if month_assets.exists():
-                        # Find first non-speaker image as featured image
-                        for image_file in month_assets.iterdir():
-                            if image_file.is_file() and image_file.suffix.lower() in ['.jpg', '.jpeg', '.png']:
-                                if not any(x in image_file.name.lower() for x in ['speaker', 'headshot', '400x400', '150x150']):
-                                    # Update the featured image path
-                                    content = re.sub(
-                                        r'image:\s*[\'"]([^\'"]+)[\'"]',
-                                        f'image: "/images/meetings/{image_file.name}"',
-                                        content
-                                    )
-                                    logger.info(f"Updated featured image in {markdown_file.name}")
-                                    break
+                    # Find first non-speaker kept image in the month's uploads as featured image
+                    for entry in self.uploads.month(year, month, kind='image'):
+                        if entry['path'] in kept and Path(entry['name']).suffix.lower() in ['.jpg', '.jpeg', '.png']:
+                            if not any(x in entry['name'].lower() for x in ['speaker', 'headshot']):
+                                # Update the featured image path
+                                content = re.sub(
+                                    r'image:\s*[\'"]([^\'"]+)[\'"]',
+                                    f'image: "/images/meetings/{entry["name"]}"',
+                                    content
+                                )
+                                logger.info(f"Updated featured image in {markdown_file.name}")
+                                break
 
                 # Update speaker image paths
                 content = re.sub(
                     r'speakerImage:\s*[\'"]([^\'"]+)[\'"]',
-                    lambda m: f'speakerImage: "/images/speakers/{Path(m.group(1)).name}"' if m.group(1) else 'speakerImage: ""',
+                    lambda m: f'speakerImage: "/images/speakers/{published_name(Path(m.group(1)).name)}"' if m.group(1) else 'speakerImage: ""',
                     content
                 )
 
@@ -585,6 +598,7 @@ class MeetingExtractor:
 - **Successful Migrations:** {self.migration_report['successful_migrations']}
 - **Failed Migrations:** {self.migration_report['failed_migrations']}
 - **Assets Organized:** {len(self.migration_report['assets_organized'])}
+- **Size Variants Collapsed:** {self.migration_report['variants_collapsed']}
 - **Migration Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 ## File Mapping
@@ -660,7 +674,7 @@ WordPress Post ID → Markdown Filename
 def main():
     """Main entry point"""
     # Configuration
-    PROJECT_ROOT = Path(__file__).parent.parent
+    PROJECT_ROOT = Path(__file__).parent.parent.parent
     XML_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'aaiilaorg.WordPress.2025-11-01.xml'
 
     # Validate XML file exists
@@ -6,11 +6,16 @@ Validates all extracted URLs from the consolidated JSON file
 
 import json
 import requests
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 from collections import defaultdict
 import time
 
+# Shared pipeline modules live in scripts/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import http_client
+
 PROJECT_ROOT = Path(__file__).parent.parent
 CONSOLIDATED_JSON = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'all-meetings-consolidated.json'
 VALIDATION_REPORT = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'validation-report.json'
@@ -25,10 +30,7 @@ class LinkValidator:
             'timeout': [],
             'by_domain': defaultdict(list)
         }
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+        self.session = http_client.session('any')
 
     def validate_url(self, url: str) -> Tuple[str, int, str]:
         """
@@ -2,19 +2,154 @@
 """
 Validate Migration v3 Results
 Check generated markdown files for quality and completeness
+
+Each file's frontmatter is parsed once (with PyYAML when installed, else the
+original line patterns) in a process pool. Per-file field presence and counts
+are written to a frontmatter index in AAII-Migration-assets/output; files whose
+size and mtime match the index are not re-read on later runs. An index written
+by the other parser is discarded, so counts never mix the two.
+
+Usage: python validate-migration-v3.py [--force] [--workers=N]
 """
 
+import json
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Optional
+
+try:
+    import yaml
+    HAS_YAML = True
+    YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+except ImportError:
+    yaml = None
+    HAS_YAML = False
 
-PROJECT_ROOT = Path(__file__).parent.parent
+PARSER = 'yaml' if HAS_YAML else 'patterns'
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
 OUTPUT_DIR = PROJECT_ROOT / 'content' / 'meetings'
+INDEX_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'frontmatter-index.json'
+
+FRONTMATTER_PATTERN = re.compile(r'^---\n(.*?)\n---', re.DOTALL)
+
+# Presence flags and list counts recorded per file
+FIELDS = ['title', 'date', 'description']
+LISTS = {'speakers': 'speakers', 'topics': 'topics', 'materials': 'archiveMaterials'}
+
+
+def count_with_patterns(frontmatter: str) -> Dict:
+    """Field presence and list counts from line patterns (no YAML parser)"""
+    return {
+        'fields': {f: bool(re.search(rf'^{f}:', frontmatter, re.MULTILINE)) for f in FIELDS},
+        'speakers': len(re.findall(r'^  - name:', frontmatter, re.MULTILINE)),
+        'topics': len(re.findall(r'^  - title:', frontmatter, re.MULTILINE)),
+        'materials': len(re.findall(r'^  - type:', frontmatter, re.MULTILINE)),
+    }
+
+
+def index_file(file_path: str) -> Dict:
+    """
+    Parse one markdown file's frontmatter into an index entry.
+    Runs in a worker process, so it takes and returns plain values.
+    """
+    file_path = Path(file_path)
+    stat = file_path.stat()
+    entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'has_frontmatter': False, 'error': None}
+
+    content = file_path.read_text(encoding='utf-8')
+    if not content.startswith('---'):
+        entry['error'] = 'No frontmatter'
+        return entry
+    entry['has_frontmatter'] = True
+
+    match = FRONTMATTER_PATTERN.match(content)
+    if not match:
+        entry['error'] = 'Malformed frontmatter'
+        return entry
+
+    if not HAS_YAML:
+        entry.update(count_with_patterns(match.group(1)))
+        return entry
+
+    try:
+        data = yaml.load(match.group(1), Loader=YamlLoader) or {}
+    except yaml.YAMLError as e:
+        entry['error'] = f"Malformed frontmatter: {str(e).splitlines()[0]}"
+        return entry
+    if not isinstance(data, dict):
+        entry['error'] = 'Malformed frontmatter: not a mapping'
+        return entry
+
+    entry['fields'] = {f: data.get(f) not in (None, '') for f in FIELDS}
+    for name, key in LISTS.items():
+        value = data.get(key)
+        entry[name] = len(value) if isinstance(value, list) else 0
+    return entry
+
+
+def load_index() -> Dict:
+    """Entries from the previous run keyed by filename, or {} if unreadable or from the other parser"""
+    if INDEX_FILE.exists():
+        try:
+            with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Ignoring unreadable frontmatter index: {e}")
+            return {}
+        if index.get('parser') != PARSER:
+            print(f"⚠ Frontmatter index was built with parser {index.get('parser')!r}, re-parsing with {PARSER!r}")
+            return {}
+        return index.get('files', {})
+    return {}
+
+
+def save_index(files: Dict) -> None:
+    """Write the index atomically"""
+    INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = INDEX_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'parser': PARSER,
+            'files': dict(sorted(files.items()))
+        }, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, INDEX_FILE)
+
+
+def build_index(md_files, force: bool = False, workers: Optional[int] = None) -> Dict:
+    """Index every file, re-parsing only new or changed ones. Returns {filename: entry}."""
+    previous = {} if force else load_index()
+    files = {}
+    todo = []
+    for md_file in md_files:
+        old = previous.get(md_file.name)
+        stat = md_file.stat()
+        if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+            files[md_file.name] = old
+        else:
+            todo.append(md_file)
+
+    print(f"Parsing {len(todo)} files ({len(files)} unchanged since last index)...\n")
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for md_file, entry in zip(todo, pool.map(index_file, map(str, todo), chunksize=16)):
+                files[md_file.name] = entry
+
+    save_index(files)
+    return files
+
 
 class MigrationValidator:
     """Validates migration results"""
 
-    def __init__(self):
+    def __init__(self, force: bool = False, workers: Optional[int] = None):
+        self.force = force
+        self.workers = workers
         self.stats = {
             'total_files': 0,
             'has_frontmatter': 0,
@@ -33,52 +168,25 @@ class MigrationValidator:
             'issues': []
         }
 
-    def validate_file(self, file_path):
-        """Validate a single markdown file"""
-        content = file_path.read_text(encoding='utf-8')
+    def validate_file(self, file_name, entry):
+        """Add one file's index entry to the stats"""
+        if entry['has_frontmatter']:
+            self.stats['has_frontmatter'] += 1
 
-        # Check frontmatter
-        if not content.startswith('---'):
-            self.stats['issues'].append(f"{file_path.name}: No frontmatter")
+        if entry['error']:
+            self.stats['issues'].append(f"{file_name}: {entry['error']}")
             return
 
-        self.stats['has_frontmatter'] += 1
-
-        # Extract frontmatter
-        match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-        if not match:
-            self.stats['issues'].append(f"{file_path.name}: Malformed frontmatter")
-            return
-
-        frontmatter = match.group(1)
-
         # Check fields
-        if re.search(r'^title:', frontmatter, re.MULTILINE):
-            self.stats['has_title'] += 1
-
-        if re.search(r'^date:', frontmatter, re.MULTILINE):
-            self.stats['has_date'] += 1
-
-        if re.search(r'^description:', frontmatter, re.MULTILINE):
-            self.stats['has_description'] += 1
-
-        # Count speakers
-        speakers = len(re.findall(r'^  - name:', frontmatter, re.MULTILINE))
-        if speakers > 0:
-            self.stats['has_speakers'] += 1
-            self.stats['total_speakers'] += speakers
-
-        # Count topics
-        topics = len(re.findall(r'^  - title:', frontmatter, re.MULTILINE))
-        if topics > 0:
-            self.stats['has_topics'] += 1
-            self.stats['total_topics'] += topics
+        for field in FIELDS:
+            if entry['fields'][field]:
+                self.stats[f'has_{field}'] += 1
 
-        # Count archive materials
-        materials = len(re.findall(r'^  - type:', frontmatter, re.MULTILINE))
-        if materials > 0:
-            self.stats['has_archive_materials'] += 1
-            self.stats['total_materials'] += materials
+        # Count speakers, topics and archive materials
+        for name, stat in (('speakers', 'speakers'), ('topics', 'topics'), ('materials', 'archive_materials')):
+            if entry[name] > 0:
+                self.stats[f'has_{stat}'] += 1
+                self.stats[f'total_{name}'] += entry[name]
 
     def run(self):
         """Run validation"""
@@ -93,9 +201,10 @@ class MigrationValidator:
 
         print(f"Validating {len(md_files)} markdown files...\n")
 
-        # Validate each file
+        # Parse (or reuse) each file's frontmatter, then validate from the index
+        index = build_index(md_files, force=self.force, workers=self.workers)
         for file_path in md_files:
-            self.validate_file(file_path)
+            self.validate_file(file_path.name, index[file_path.name])
 
         # Calculate averages
         if self.stats['has_speakers'] > 0:
@@ -140,11 +249,14 @@ class MigrationValidator:
         else:
             print(f"\n✅ No validation issues found!")
 
+        print(f"\nFrontmatter index: {INDEX_FILE} (parser: {PARSER})")
         print(f"\n{'='*100}\n")
 
 def main():
     """Entry point"""
-    validator = MigrationValidator()
+    args = sys.argv[1:]
+    workers = next((int(a.split('=', 1)[1]) for a in args if a.startswith('--workers=')), None)
+    validator = MigrationValidator(force='--force' in args, workers=workers)
     validator.run()
 
 if __name__ == '__main__':
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Verification Statistics
+Columnar tables of verification results with vectorized aggregations
+
+- VerificationTable collects one row per file and one row per topic in a
+  single pass over the ComparisonResults (format, year, topic count and
+  per-field match columns included)
+- Aggregations (accuracy histogram, per-format/per-year/per-topic-count
+  breakdowns, per-field match rates) run on NumPy arrays
+- Each batch run is saved as CSV under output/verification-runs so accuracy
+  can be compared across runs without re-verifying
+
+NumPy is optional: without it only the summary stats are available.
+
+Usage: python verification-stats.py    Show breakdowns for the latest run and trends across runs
+"""
+
+import csv
+import importlib.util
+import re
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SCRIPTS_DIR = PROJECT_ROOT / 'scripts'
+INDIVIDUAL_POSTS = PROJECT_ROOT / 'AAII-Migration-assets' / 'individual-posts' / 'monthly-meetings'
+RUNS_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'verification-runs'
+
+FILE_COLUMNS = ['run', 'file_name', 'format', 'year', 'topic_count', 'accessible', 'accuracy',
+                'topic_count_match', 'speaker_rate', 'title_rate', 'materials_rate',
+                'warning_count', 'error_count']
+TOPIC_COLUMNS = ['run', 'file_name', 'format', 'year', 'topic_id', 'speaker_match', 'title_match',
+                 'materials_match', 'checks_passed', 'total_checks']
+
+NUMERIC_COLUMNS = {'topic_count', 'accuracy', 'speaker_rate', 'title_rate', 'materials_rate',
+                   'warning_count', 'error_count', 'topic_id', 'checks_passed', 'total_checks'}
+BOOL_COLUMNS = {'accessible', 'topic_count_match', 'speaker_match', 'title_match', 'materials_match'}
+
+FIELDS = ['speaker', 'title', 'materials']
+
+_extractor = None
+
+
+def _get_extractor():
+    """V2 DataExtractor (for detect_format), loaded on first use"""
+    global _extractor
+    if _extractor is None:
+        # The V2 script imports its sibling modules from scripts/
+        sys.path.insert(0, str(SCRIPTS_DIR))
+        spec = importlib.util.spec_from_file_location("extract_v2", SCRIPTS_DIR / 'extract-structured-data-v2.py')
+        extract_v2 = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(extract_v2)
+        _extractor = extract_v2.DataExtractor()
+    return _extractor
+
+
+def meeting_facts(xml_file: Path) -> Tuple[str, str]:
+    """(content format, event year) for a structured XML file"""
+    fmt = 'unknown'
+    source = INDIVIDUAL_POSTS / xml_file.name
+    if source.exists():
+        content_elem = ET.parse(source).getroot().find('{http://purl.org/rss/1.0/modules/content/}encoded')
+        if content_elem is not None and content_elem.text:
+            fmt = _get_extractor().detect_format(content_elem.text)
+
+    year = ''
+    try:
+        root = ET.parse(xml_file).getroot()
+        date_text = root.findtext('event/date', '') or root.findtext('metadata/post_date', '')
+        match = re.search(r'\b(19|20)\d{2}\b', date_text)
+        year = match.group(0) if match else ''
+    except ET.ParseError:
+        pass
+    return fmt, year or 'unknown'
+
+
+class VerificationTable:
+    """Verification results as columns: one table per file, one per topic"""
+
+    def __init__(self, run: str = ''):
+        self.run = run
+        self.files: Dict[str, list] = {c: [] for c in FILE_COLUMNS}
+        self.topics: Dict[str, list] = {c: [] for c in TOPIC_COLUMNS}
+
+    def __len__(self):
+        return len(self.files['file_name'])
+
+    def add(self, result, fmt: str, year: str):
+        """Append a ComparisonResult (or an error dict from the batch loop)"""
+        comparisons = getattr(result, 'topic_comparisons', [])
+        topic_count = len(comparisons)
+
+        row = {
+            'run': self.run,
+            'file_name': getattr(result, 'file_name', None) or result.get('file_name', ''),
+            'format': fmt,
+            'year': year,
+            'topic_count': topic_count,
+            'accessible': getattr(result, 'page_accessible', False),
+            'accuracy': getattr(result, 'accuracy_score', 0.0),
+            'topic_count_match': getattr(result, 'topic_count_match', False),
+            'warning_count': len(getattr(result, 'warnings', [])),
+            'error_count': len(getattr(result, 'errors', [])) if hasattr(result, 'errors') else 1,
+        }
+        for field in FIELDS:
+            matched = sum(1 for c in comparisons if c.get(f'{field}_match'))
+            row[f'{field}_rate'] = matched / topic_count if topic_count else 0.0
+        for column in FILE_COLUMNS:
+            self.files[column].append(row[column])
+
+        for c in comparisons:
+            topic_row = {
+                'run': self.run,
+                'file_name': row['file_name'],
+                'format': fmt,
+                'year': year,
+                'topic_id': c['topic_id'],
+                'speaker_match': c['speaker_match'],
+                'title_match': c['title_match'],
+                'materials_match': c['materials_match'],
+                'checks_passed': c['checks_passed'],
+                'total_checks': c['total_checks'],
+            }
+            for column in TOPIC_COLUMNS:
+                self.topics[column].append(topic_row[column])
+
+    # Summary (no NumPy needed)
+
+    def stats(self) -> Dict:
+        """Batch summary in the original report layout"""
+        accessible = [i for i, ok in enumerate(self.files['accessible']) if ok]
+        accuracy = [self.files['accuracy'][i] for i in accessible]
+        return {
+            'total': len(self),
+            'accessible': len(accessible),
+            'inaccessible': len(self) - len(accessible),
+            'topic_matches': sum(1 for i in accessible if self.files['topic_count_match'][i]),
+            'total_accuracy': sum(accuracy),
+            'high_accuracy': sum(1 for a in accuracy if a >= 80),
+            'medium_accuracy': sum(1 for a in accuracy if 50 <= a < 80),
+            'low_accuracy': sum(1 for a in accuracy if a < 50),
+        }
+
+    # Vectorized aggregations
+
+    def arrays(self, table: str = 'files') -> Dict:
+        """Columns of a table as NumPy arrays"""
+        columns = self.files if table == 'files' else self.topics
+        out = {}
+        for name, values in columns.items():
+            if name in NUMERIC_COLUMNS:
+                out[name] = np.asarray(values, dtype=float)
+            elif name in BOOL_COLUMNS:
+                out[name] = np.asarray(values, dtype=bool)
+            else:
+                out[name] = np.asarray(values, dtype=str)
+        return out
+
+    def accuracy_histogram(self, bins: int = 10) -> List[Tuple[float, float, int]]:
+        """(low, high, files) per accuracy bin over accessible pages"""
+        cols = self.arrays()
+        counts, edges = np.histogram(cols['accuracy'][cols['accessible']], bins=bins, range=(0, 100))
+        return [(edges[i], edges[i + 1], int(counts[i])) for i in range(bins)]
+
+    def breakdown(self, by: str) -> List[Dict]:
+        """Accuracy and field match rates per group of `by` (format, year, topic_count)"""
+        cols = self.arrays()
+        mask = cols['accessible']
+        if not mask.any():
+            return []
+        keys = cols[by][mask]
+        groups, inverse = np.unique(keys, return_inverse=True)
+        files = np.bincount(inverse)
+
+        def mean(column):
+            return np.bincount(inverse, weights=cols[column][mask]) / files
+
+        accuracy = mean('accuracy')
+        rates = {field: mean(f'{field}_rate') for field in FIELDS}
+        low = np.bincount(inverse, weights=(cols['accuracy'][mask] < 50).astype(float))
+
+        return [
+            {
+                by: int(groups[i]) if by == 'topic_count' else str(groups[i]),
+                'files': int(files[i]),
+                'accuracy': float(accuracy[i]),
+                'low_accuracy': int(low[i]),
+                **{f'{field}_rate': float(rates[field][i]) for field in FIELDS}
+            }
+            for i in range(len(groups))
+        ]
+
+    def field_rates(self) -> Dict[str, float]:
+        """Share of all topics where each field matched"""
+        cols = self.arrays('topics')
+        if not len(cols['topic_id']):
+            return {field: 0.0 for field in FIELDS}
+        return {field: float(cols[f'{field}_match'].mean()) for field in FIELDS}
+
+    # Persistence
+
+    def save(self, runs_dir: Optional[Path] = None) -> Path:
+        """Write both tables as CSV; returns the files CSV path"""
+        runs_dir = runs_dir or RUNS_DIR
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        for table, columns in (('files', self.files), ('topics', self.topics)):
+            with open(runs_dir / f"{self.run}-{table}.csv", 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows(zip(*columns.values()))
+        return runs_dir / f"{self.run}-files.csv"
+
+    @classmethod
+    def load(cls, run: str, runs_dir: Optional[Path] = None) -> 'VerificationTable':
+        """Load a saved run"""
+        runs_dir = runs_dir or RUNS_DIR
+        table = cls(run)
+        for name, columns in (('files', table.files), ('topics', table.topics)):
+            path = runs_dir / f"{run}-{name}.csv"
+            if not path.exists():
+                continue
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.DictReader(f):
+                    for column in columns:
+                        value = row.get(column, '')
+                        if column in NUMERIC_COLUMNS:
+                            value = float(value or 0)
+                        elif column in BOOL_COLUMNS:
+                            value = value == 'True'
+                        columns[column].append(value)
+        return table
+
+
+def list_runs(runs_dir: Optional[Path] = None) -> List[str]:
+    """Saved run ids, oldest first"""
+    runs_dir = runs_dir or RUNS_DIR
+    return sorted(p.name[:-len('-files.csv')] for p in runs_dir.glob('*-files.csv')) if runs_dir.exists() else []
+
+
+def print_report(table: VerificationTable):
+    """Print histogram, per-field rates and per-format/year/topic-count breakdowns"""
+    if not HAS_NUMPY:
+        print("\n⚠ NumPy not installed - accuracy breakdowns skipped (pip install numpy)")
+        return
+    if not any(table.files['accessible']):
+        return
+
+    print(f"\nAccuracy histogram:")
+    for low, high, count in table.accuracy_histogram():
+        print(f"  {f'{low:.0f}-{high:.0f}%':>8} {'█' * count} {count}")
+
+    print(f"\nField match rates (all topics):")
+    for field, rate in table.field_rates().items():
+        print(f"  {field:<10} {rate * 100:5.1f}%")
+
+    for by in ('format', 'year', 'topic_count'):
+        print(f"\nBy {by.replace('_', ' ')}:")
+        print(f"  {by:<32} {'files':>5} {'acc%':>6} {'<50%':>5} {'spk%':>6} {'title%':>7} {'mat%':>6}")
+        for row in table.breakdown(by):
+            print(f"  {str(row[by]):<32} {row['files']:>5} {row['accuracy']:>6.1f} {row['low_accuracy']:>5} "
+                  f"{row['speaker_rate'] * 100:>6.1f} {row['title_rate'] * 100:>7.1f} "
+                  f"{row['materials_rate'] * 100:>6.1f}")
+
+
+def print_trends(runs: List[str]):
+    """Average accuracy per run, overall and per format"""
+    if not HAS_NUMPY or len(runs) < 2:
+        return
+    print(f"\nTrend across {len(runs)} runs:")
+    tables = [VerificationTable.load(run) for run in runs]
+    formats = sorted({f for t in tables for f in t.files['format']})
+    print(f"  {'run':<24} {'acc%':>6} " + ' '.join(f"{f[:14]:>14}" for f in formats))
+    for table in tables:
+        by_format = {row['format']: row['accuracy'] for row in table.breakdown('format')}
+        cols = table.arrays()
+        overall = cols['accuracy'][cols['accessible']].mean() if cols['accessible'].any() else 0.0
+        print(f"  {table.run:<24} {overall:>6.1f} " +
+              ' '.join(f"{by_format[f]:>14.1f}" if f in by_format else f"{'-':>14}" for f in formats))
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("VERIFICATION STATISTICS")
+    print("=" * 80)
+
+    runs = list_runs()
+    if not runs:
+        print(f"\nNo saved runs in {RUNS_DIR}. Run batch-verify-all.py first.")
+        return
+
+    latest = VerificationTable.load(runs[-1])
+    print(f"\nLatest run: {runs[-1]} ({len(latest)} files)")
+    print_report(latest)
+    print_trends(runs)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,9 @@ import xml.etree.ElementTree as ET
 import requests
 from bs4 import BeautifulSoup
 import json
+import gzip
+import hashlib
+import os
 import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
@@ -15,10 +18,27 @@ from dataclasses import dataclass, asdict
 import sys
 import time
 from difflib import SequenceMatcher
+from urllib.parse import urlparse, parse_qs, urlencode
 
-PROJECT_ROOT = Path(__file__).parent.parent
+try:
+    from rapidfuzz import fuzz as rapidfuzz_fuzz
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    rapidfuzz_fuzz = None
+    HAS_RAPIDFUZZ = False
+
+# Shared pipeline modules live in scripts/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import http_client
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
 STRUCTURED_XML = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'structured-xml'
 VERIFICATION_OUTPUT = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'verification-report.json'
+SNAPSHOT_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'page-snapshots'
+SNAPSHOT_MANIFEST = SNAPSHOT_DIR / 'manifest.json'
+
+# Query parameters that never change which resource a link points to
+TRACKING_PARAMS = {'si', 'feature', 'fbclid', 'gclid'}
 
 
 @dataclass
@@ -57,39 +77,20 @@ class LivePageFetcher:
     """Fetches and parses live webpage content"""
 
     def __init__(self):
-        self.session = requests.Session()
-        # Mimic real browser headers to bypass bot protection
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Mobile Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'DNT': '1',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache',
-            'Sec-CH-UA': '"Google Chrome";v="141", "Not?A_Brand";v="8", "Chromium";v="141"',
-            'Sec-CH-UA-Mobile': '?1',
-            'Sec-CH-UA-Platform': '"Android"',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'same-origin',
-            'Sec-Fetch-User': '?1',
-            'Upgrade-Insecure-Requests': '1',
-            'Referer': 'https://aaiila.org/'
-        })
+        # Full browser navigation headers to bypass bot protection
+        self.session = http_client.session('navigate')
         # Enable cookie handling
         self.session.cookies.set('wordpress_test_cookie', 'WP Cookie check', domain='aaiila.org')
         self.session.cookies.set('wp_lang', 'en_US', domain='aaiila.org')
 
-    def fetch_page(self, url: str) -> Tuple[bool, Optional[str], Optional[BeautifulSoup]]:
+    def fetch_html(self, url: str) -> Tuple[bool, Optional[str], Optional[bytes]]:
         """
-        Fetch webpage and return (success, error_message, soup)
+        Fetch raw webpage bytes and return (success, error_message, html)
         """
         try:
             response = self.session.get(url, timeout=15)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                return True, None, soup
+                return True, None, response.content
             else:
                 return False, f"HTTP {response.status_code}", None
         except requests.Timeout:
@@ -97,6 +98,15 @@ class LivePageFetcher:
         except requests.RequestException as e:
             return False, str(e), None
 
+    def fetch_page(self, url: str) -> Tuple[bool, Optional[str], Optional[BeautifulSoup]]:
+        """
+        Fetch webpage and return (success, error_message, soup)
+        """
+        success, error_msg, html = self.fetch_html(url)
+        if not success:
+            return False, error_msg, None
+        return True, None, BeautifulSoup(html, 'html.parser')
+
     def extract_event_date(self, soup: BeautifulSoup) -> Optional[str]:
         """Extract event date from page"""
         # Look for date patterns
@@ -217,20 +227,262 @@ class LivePageFetcher:
         )
 
 
-class ContentComparator:
-    """Compares XML data with live page content"""
+class SnapshotPageFetcher(LivePageFetcher):
+    """Serves pages from the local snapshot corpus instead of the network"""
+
+    def __init__(self, snapshot_dir: Optional[Path] = None):
+        super().__init__()
+        self.snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+        self.manifest = load_snapshot_manifest(self.snapshot_dir / SNAPSHOT_MANIFEST.name)
+
+    def fetch_html(self, url: str) -> Tuple[bool, Optional[str], Optional[bytes]]:
+        entry = self.manifest.get(url)
+        if not entry:
+            return False, "No snapshot for URL", None
+        if entry.get('error'):
+            return False, entry['error'], None
+        with gzip.open(self.snapshot_dir / entry['file'], 'rb') as f:
+            return True, None, f.read()
+
+
+def load_snapshot_manifest(manifest_file: Optional[Path] = None) -> Dict:
+    """Snapshot manifest: {url: {file, sha256, bytes, fetched_at} or {error, fetched_at}}"""
+    manifest_file = manifest_file or SNAPSHOT_MANIFEST
+    if manifest_file.exists():
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def snapshot_pages(pages: List[Tuple[str, str]], fetcher: LivePageFetcher, refresh: bool = False,
+                   delay: float = 1.5) -> Dict[str, int]:
+    """
+    Save each (name, url) page once as {name}.html.gz under SNAPSHOT_DIR.
+    Pages already in the manifest are skipped unless refresh is set.
+    Returns counts: {'saved', 'skipped', 'failed'}
+    """
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = load_snapshot_manifest()
+    counts = {'saved': 0, 'skipped': 0, 'failed': 0}
+    fetched_any = False
+
+    for i, (name, url) in enumerate(pages, 1):
+        entry = manifest.get(url)
+        if entry and not entry.get('error') and not refresh and (SNAPSHOT_DIR / entry['file']).exists():
+            counts['skipped'] += 1
+            continue
+
+        # Brief pause between requests to be respectful to server
+        if fetched_any:
+            time.sleep(delay)
+        fetched_any = True
+
+        success, error_msg, html = fetcher.fetch_html(url)
+        fetched_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        if not success:
+            print(f"  [{i}/{len(pages)}] ❌ {name}: {error_msg}")
+            manifest[url] = {'error': error_msg, 'fetched_at': fetched_at}
+            counts['failed'] += 1
+            continue
+
+        filename = f"{name}.html.gz"
+        with gzip.open(SNAPSHOT_DIR / filename, 'wb', compresslevel=9) as f:
+            f.write(html)
+        manifest[url] = {
+            'file': filename,
+            'sha256': hashlib.sha256(html).hexdigest(),
+            'bytes': len(html),
+            'fetched_at': fetched_at
+        }
+        counts['saved'] += 1
+        print(f"  [{i}/{len(pages)}] ✓ {name} ({len(html)} bytes)")
+
+    tmp_file = SNAPSHOT_MANIFEST.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, SNAPSHOT_MANIFEST)
+
+    return counts
+
+
+# Scorers share one method, ratio(a, b, cutoff) -> 0-1 similarity of two
+# already-lowercased strings; a score below cutoff may be returned as 0.
+
+
+class DifflibScorer:
+    """
+    difflib.SequenceMatcher ratio, the measure the verification thresholds were
+    tuned on (default). SequenceMatcher's cheap upper bounds reject pairs below
+    the cutoff before the full ratio is computed.
+    """
+
+    name = 'difflib'
+
+    def ratio(self, a: str, b: str, cutoff: float = 0.0) -> float:
+        matcher = SequenceMatcher(None, a, b)
+        if cutoff and (matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff):
+            return 0.0
+        return matcher.ratio()
+
+
+class RapidFuzzScorer:
+    """
+    rapidfuzz Indel ratio (C++), with early exit below the cutoff. Indel scores
+    differ from SequenceMatcher's, so the 0.8/0.9 thresholds behave differently
+    """
+
+    name = 'rapidfuzz'
+
+    def ratio(self, a: str, b: str, cutoff: float = 0.0) -> float:
+        return rapidfuzz_fuzz.ratio(a, b, score_cutoff=cutoff * 100) / 100
+
+
+class BitParallelScorer:
+    """
+    Pure-Python Indel ratio, 2 * LCS / (len(a) + len(b)), the same measure
+    rapidfuzz uses. The LCS is computed bit-parallel (Hyyro's algorithm):
+    one integer holds a bit per character of `a`, so each character of `b`
+    costs a few big-int operations instead of a row of the DP table.
+    """
+
+    name = 'python'
 
     @staticmethod
-    def similarity_score(str1: str, str2: str) -> float:
-        """Calculate similarity between two strings (0-1)"""
+    def lcs_length(a: str, b: str) -> int:
+        if len(a) < len(b):
+            a, b = b, a
+        mask = (1 << len(a)) - 1
+        matches = {}
+        for i, ch in enumerate(a):
+            matches[ch] = matches.get(ch, 0) | (1 << i)
+
+        row = mask
+        for ch in b:
+            u = row & matches.get(ch, 0)
+            row = ((row + u) | (row - u)) & mask
+        # Zero bits mark matched positions
+        return len(a) - bin(row).count('1')
+
+    def ratio(self, a: str, b: str, cutoff: float = 0.0) -> float:
+        total = len(a) + len(b)
+        if not total:
+            return 1.0
+        return 2 * self.lcs_length(a, b) / total
+
+
+SCORERS = {
+    'difflib': DifflibScorer,
+    'rapidfuzz': RapidFuzzScorer,
+    'python': BitParallelScorer,
+}
+
+
+def make_scorer(name: Optional[str] = None):
+    """Scorer by name; default is difflib, which matches the original results"""
+    name = name or 'difflib'
+    if name == 'rapidfuzz' and not HAS_RAPIDFUZZ:
+        print("⚠ rapidfuzz not installed, using pure-Python scorer")
+        name = 'python'
+    return SCORERS[name]()
+
+
+class SimilarityEngine:
+    """
+    Fuzzy string matching with cheap prefilters in front of the scorer; both
+    are exact, so match() agrees with comparing the scorer's ratio:
+    - exact match after lowercasing
+    - length bound: no ratio can exceed 2 * min(len) / (len(a) + len(b)),
+      so pairs whose lengths differ too much are rejected without scoring
+    """
+
+    def __init__(self, scorer=None):
+        self.scorer = scorer or make_scorer()
+
+    def score(self, str1: str, str2: str) -> float:
+        """Similarity between two strings (0-1)"""
         if not str1 or not str2:
             return 0.0
-        return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+        a, b = str1.lower(), str2.lower()
+        if a == b:
+            return 1.0
+        return self.scorer.ratio(a, b)
 
-    @staticmethod
-    def fuzzy_match(str1: str, str2: str, threshold: float = 0.8) -> bool:
+    def match(self, str1: str, str2: str, threshold: float) -> bool:
+        """True if the two strings are at least `threshold` similar"""
+        if not str1 or not str2:
+            return False
+        a, b = str1.lower(), str2.lower()
+        if a == b:
+            return True
+        if 2 * min(len(a), len(b)) / (len(a) + len(b)) < threshold:
+            return False
+        return self.scorer.ratio(a, b, threshold) >= threshold
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a material link for set lookups:
+    scheme, "www.", trailing slashes, fragments and tracking parameters are
+    ignored, and YouTube short/embed/watch links reduce to the video id.
+    """
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    for prefix in ('www.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = parsed.path.rstrip('/')
+    query = parse_qs(parsed.query)
+
+    if host == 'youtu.be' and path:
+        return f"youtube:{path.lstrip('/')}"
+    if host.endswith('youtube.com'):
+        if 'v' in query:
+            return f"youtube:{query['v'][0]}"
+        for prefix in ('/embed/', '/live/', '/shorts/'):
+            if path.startswith(prefix):
+                return f"youtube:{path[len(prefix):]}"
+
+    params = {k: v for k, v in sorted(query.items())
+              if k not in TRACKING_PARAMS and not k.startswith('utm_')}
+    return f"{host}{path}?{urlencode(params, doseq=True)}" if params else f"{host}{path}"
+
+
+class LinkIndex:
+    """
+    Page links indexed for material lookups. Exact and normalized URLs are
+    set lookups; only links that miss both fall back to fuzzy matching, and
+    the engine's length bound skips most candidates there.
+    """
+
+    def __init__(self, links: List[str], engine: SimilarityEngine):
+        self.engine = engine
+        self.exact = {link.rstrip('/') for link in links}
+        self.normalized = {normalize_url(link) for link in links}
+
+    def contains(self, url: str, threshold: float = 0.9) -> bool:
+        """True if url (or a near-identical link) appears on the page"""
+        url = url.rstrip('/')
+        if url in self.exact:
+            return True
+        normalized = normalize_url(url)
+        if normalized in self.normalized:
+            return True
+        return any(self.engine.match(normalized, link, threshold) for link in self.normalized)
+
+
+class ContentComparator:
+    """Compares XML data with live page content"""
+
+    def __init__(self, engine: Optional[SimilarityEngine] = None):
+        self.engine = engine or SimilarityEngine()
+
+    def similarity_score(self, str1: str, str2: str) -> float:
+        """Calculate similarity between two strings (0-1)"""
+        return self.engine.score(str1, str2)
+
+    def fuzzy_match(self, str1: str, str2: str, threshold: float = 0.8) -> bool:
         """Check if two strings match with fuzzy logic"""
-        return ContentComparator.similarity_score(str1, str2) >= threshold
+        return self.engine.match(str1, str2, threshold)
 
     def compare_topics(self, xml_topics: List, page_topics: List[PageTopic], page_links: List[str]) -> Tuple[List[Dict], List[str]]:
         """
@@ -239,6 +491,7 @@ class ContentComparator:
         """
         comparisons = []
         warnings = []
+        link_index = LinkIndex(page_links, self.engine)
 
         # Check topic count
         if len(xml_topics) != len(page_topics):
@@ -312,7 +565,7 @@ class ContentComparator:
                 for material in xml_materials:
                     xml_url = material.get('url', '').rstrip('/')
                     # Check if this URL exists on the page
-                    if any(self.fuzzy_match(xml_url, page_url, 0.9) for page_url in page_links):
+                    if link_index.contains(xml_url, 0.9):
                         materials_found += 1
 
                 if materials_found == len(xml_materials):
@@ -509,12 +762,21 @@ def main():
     print("=" * 80)
     print()
 
-    fetcher = LivePageFetcher()
-    comparator = ContentComparator()
+    # Optional --scorer=difflib|rapidfuzz|python and --offline (use page snapshots)
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    offline = '--offline' in sys.argv[1:]
+    scorer_name = next((a.split('=', 1)[1] for a in sys.argv[1:] if a.startswith('--scorer=')), None)
+    if scorer_name and scorer_name not in SCORERS:
+        print(f"❌ Unknown scorer: {scorer_name} (choose from {', '.join(SCORERS)})")
+        return
+
+    fetcher = SnapshotPageFetcher() if offline else LivePageFetcher()
+    comparator = ContentComparator(SimilarityEngine(make_scorer(scorer_name)))
+    print(f"Similarity scorer: {comparator.engine.scorer.name}")
 
     # Check if specific file provided
-    if len(sys.argv) > 1:
-        xml_file = STRUCTURED_XML / sys.argv[1]
+    if args:
+        xml_file = STRUCTURED_XML / args[0]
         if not xml_file.exists():
             print(f"❌ File not found: {xml_file}")
             return
@@ -534,7 +796,7 @@ def main():
         print(f"\n✓ Verification report saved: {VERIFICATION_OUTPUT}")
 
     else:
-        print("Usage: python verify-extraction-accuracy.py <filename.xml>")
+        print("Usage: python verify-extraction-accuracy.py <filename.xml> [--offline] [--scorer=difflib|rapidfuzz|python]")
         print("Example: python verify-extraction-accuracy.py april-2021-webinar-meeting-archive-14812.xml")
 
 
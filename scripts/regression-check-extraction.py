@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Extraction Regression Check
+Runs the V2 DataExtractor over every meeting in parallel and compares each
+Meeting structurally against the committed golden JSON files
+
+- Reports per-field differences grouped as speakers, titles, descriptions,
+  outcomes, materials, topics and metadata
+- Prints its own timing (extraction wall time and per-file cost)
+- Exits with status 1 when any file differs, fails to extract or has no
+  golden file, so it can gate changes
+- --update exits with status 1 when any extraction fails; a full update also
+  removes golden files for posts that no longer exist
+
+Usage:
+  python regression-check-extraction.py            Compare against golden files
+  python regression-check-extraction.py --update   Re-record golden files from the current extractor
+  python regression-check-extraction.py <filename.xml> ...
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+GOLDEN_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'golden-json'
+v2_script = PROJECT_ROOT / 'scripts' / 'extract-structured-data-v2.py'
+
+spec = importlib.util.spec_from_file_location("extract_v2", v2_script)
+extract_v2 = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(extract_v2)
+
+INDIVIDUAL_POSTS = extract_v2.INDIVIDUAL_POSTS
+
+# Field groups used in the report, checked against the diff path in order
+FIELD_GROUPS = [
+    ('speakers', 'speakers'),
+    ('learning_outcomes', 'outcomes'),
+    ('materials', 'materials'),
+    ('presentation.title', 'titles'),
+    ('presentation.description', 'descriptions'),
+    ('topics', 'topics'),
+]
+
+MAX_DIFFS_SHOWN = 10
+
+_extractor = None
+
+
+def extract_file(xml_file: Path) -> Tuple[str, Optional[Dict], float]:
+    """Extract one meeting in a worker process. Returns (filename, meeting dict, seconds)."""
+    global _extractor
+    if _extractor is None:
+        _extractor = extract_v2.DataExtractor()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        meeting = _extractor.extract_meeting(xml_file)
+    data = extract_v2.meeting_to_dict(meeting) if meeting else None
+    return xml_file.name, data, time.perf_counter() - start
+
+
+def field_group(path: str) -> str:
+    """Report group for a diff path like 'topics[1].speakers[0].name'"""
+    for marker, group in FIELD_GROUPS:
+        if marker in path:
+            return group
+    return 'metadata'
+
+
+def diff_values(path: str, golden, actual, diffs: List[Tuple[str, str]]):
+    """Recursively collect (path, description) for every difference"""
+    if isinstance(golden, dict) and isinstance(actual, dict):
+        for key in list(golden) + [k for k in actual if k not in golden]:
+            child = f"{path}.{key}" if path else key
+            if key not in actual:
+                diffs.append((child, "missing"))
+            elif key not in golden:
+                diffs.append((child, f"unexpected {actual[key]!r:.80}"))
+            else:
+                diff_values(child, golden[key], actual[key], diffs)
+    elif isinstance(golden, list) and isinstance(actual, list):
+        if len(golden) != len(actual):
+            diffs.append((path, f"length {len(golden)} -> {len(actual)}"))
+        for i, (g, a) in enumerate(zip(golden, actual)):
+            diff_values(f"{path}[{i}]", g, a, diffs)
+    elif golden != actual:
+        diffs.append((path, f"{golden!r:.80} -> {actual!r:.80}"))
+
+
+def compare_meetings(golden: Dict, actual: Dict) -> List[Tuple[str, str]]:
+    """Diff two meeting dicts, matching topics by id rather than position"""
+    diffs = []
+    diff_values('', {k: v for k, v in golden.items() if k != 'topics'},
+                {k: v for k, v in actual.items() if k != 'topics'}, diffs)
+
+    golden_topics = {t['id']: t for t in golden.get('topics', [])}
+    actual_topics = {t['id']: t for t in actual.get('topics', [])}
+    for topic_id in sorted(set(golden_topics) | set(actual_topics)):
+        path = f"topics[id={topic_id}]"
+        if topic_id not in actual_topics:
+            diffs.append((path, "missing topic"))
+        elif topic_id not in golden_topics:
+            diffs.append((path, "unexpected topic"))
+        else:
+            diff_values(path, golden_topics[topic_id], actual_topics[topic_id], diffs)
+    return diffs
+
+
+def orphaned_goldens() -> List[Path]:
+    """Golden files whose post is gone from INDIVIDUAL_POSTS"""
+    return [golden_file for golden_file in sorted(GOLDEN_DIR.glob('*.json'))
+            if not (INDIVIDUAL_POSTS / f"{golden_file.stem}.xml").exists()]
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("EXTRACTION REGRESSION CHECK (V2)")
+    print("=" * 80)
+    print()
+
+    args = sys.argv[1:]
+    update = '--update' in args
+    names = [a for a in args if not a.startswith('--')]
+
+    xml_files = [INDIVIDUAL_POSTS / name for name in names] if names else sorted(INDIVIDUAL_POSTS.glob('*.xml'))
+    missing = [f for f in xml_files if not f.exists()]
+    if missing:
+        print(f"❌ File not found: {missing[0]}")
+        return
+
+    # Extract everything in parallel
+    start_time = time.time()
+    with ProcessPoolExecutor() as pool:
+        extracted = list(pool.map(extract_file, xml_files))
+    extract_elapsed = time.time() - start_time
+    cpu_total = sum(seconds for _, _, seconds in extracted)
+
+    if update:
+        GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+        failed = []
+        for filename, data, _ in extracted:
+            if data is None:
+                failed.append(filename)
+                continue
+            with open(GOLDEN_DIR / filename.replace('.xml', '.json'), 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"✓ Recorded {len(extracted) - len(failed)} golden files in {GOLDEN_DIR}")
+
+        # A full update also drops goldens for posts that no longer exist
+        if not names:
+            for golden_file in orphaned_goldens():
+                golden_file.unlink()
+                print(f"  🗑 Removed {golden_file.name} (post no longer exists)")
+
+        print(f"Time elapsed: {extract_elapsed:.2f} seconds")
+        if failed:
+            print(f"❌ Extraction failed, golden files not written: {len(failed)}")
+            for filename in failed:
+                print(f"  - {filename}")
+            sys.exit(1)
+        return
+
+    results = {'passed': [], 'changed': {}, 'failed': [], 'no_golden': []}
+    group_counts: Dict[str, int] = {}
+
+    for filename, data, _ in extracted:
+        golden_file = GOLDEN_DIR / filename.replace('.xml', '.json')
+        if not golden_file.exists():
+            results['no_golden'].append(filename)
+            continue
+        if data is None:
+            results['failed'].append(filename)
+            continue
+
+        with open(golden_file, 'r', encoding='utf-8') as f:
+            golden = json.load(f)
+
+        diffs = compare_meetings(golden, data)
+        if diffs:
+            results['changed'][filename] = diffs
+            for path, _ in diffs:
+                group = field_group(path)
+                group_counts[group] = group_counts.get(group, 0) + 1
+        else:
+            results['passed'].append(filename)
+
+    elapsed = time.time() - start_time
+
+    # Per-file diffs
+    for filename, diffs in results['changed'].items():
+        print(f"\n✗ {filename}: {len(diffs)} differences")
+        for path, description in diffs[:MAX_DIFFS_SHOWN]:
+            print(f"    [{field_group(path)}] {path}: {description}")
+        if len(diffs) > MAX_DIFFS_SHOWN:
+            print(f"    ... {len(diffs) - MAX_DIFFS_SHOWN} more")
+
+    # Summary
+    print("\n" + "=" * 80)
+    print("REGRESSION CHECK COMPLETE")
+    print("=" * 80)
+    print(f"\nFiles checked: {len(extracted)}")
+    print(f"✓ Unchanged: {len(results['passed'])}")
+    print(f"✗ Changed: {len(results['changed'])}")
+    if results['failed']:
+        print(f"❌ Extraction failed: {len(results['failed'])}")
+        for filename in results['failed']:
+            print(f"  - {filename}")
+    if results['no_golden']:
+        print(f"❌ No golden file: {len(results['no_golden'])} (run with --update to record)")
+        for filename in results['no_golden']:
+            print(f"  - {filename}")
+    orphaned = orphaned_goldens() if not names else []
+    if orphaned:
+        print(f"⚠ Golden files without a post: {len(orphaned)} (run with --update to remove)")
+
+    if group_counts:
+        print(f"\nDifferences by field:")
+        for group, count in sorted(group_counts.items(), key=lambda item: -item[1]):
+            print(f"  {group}: {count}")
+
+    print(f"\nExtraction: {extract_elapsed:.2f}s wall, {cpu_total:.2f}s in extractor "
+          f"({cpu_total / max(len(extracted), 1) * 1000:.1f} ms/file)")
+    print(f"Time elapsed: {elapsed:.2f} seconds")
+
+    if results['changed'] or results['failed'] or results['no_golden']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Uploads Index
+One-pass index of the WordPress uploads tree (AAII-Migration-assets/uploads/<year>/<month>)
+
+- Month folders are scanned in a thread pool; each file is recorded with its
+  path, size, mtime, sha256 and WordPress size variant (the "-150x150" suffix)
+- Hashes are reused for files whose size and mtime are unchanged since the
+  previous index, so a rescan of an unchanged tree only stats files
+- Lookups by month folder and by filename replace directory rescans
+- Size variants are grouped under their original ("photo-150x150.jpg" and
+  "photo-1024x683.jpg" under "photo.jpg"); only the best source of each group
+  (the original, else the largest variant) is kept for copying and derivatives
+- place() puts a file at its destination incrementally: targets with the
+  source's size and mtime (else its indexed sha256) are skipped, and new ones
+  are reflinked when the filesystem allows, falling back to a plain copy.
+  Never hardlinked, so editing or optimising a published file cannot change
+  the uploads archive
+
+Usage: python uploads_index.py
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+PROJECT_ROOT = Path(__file__).parent.parent
+UPLOADS_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'uploads'
+INDEX_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'uploads-index.json'
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+DOCUMENT_EXTENSIONS = {'.pdf'}
+
+# WordPress names generated sizes "{original}-{width}x{height}.{ext}"
+VARIANT_PATTERN = re.compile(r'^(?P<base>.+)-(?P<width>\d+)x(?P<height>\d+)(?P<ext>\.[A-Za-z0-9]+)$')
+
+SCAN_WORKERS = 8
+
+# Linux FICLONE ioctl: copy-on-write clone on btrfs/XFS
+FICLONE = 0x40049409
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_variant(name: str) -> Tuple[str, Optional[Tuple[int, int]]]:
+    """'photo-150x150.jpg' -> ('photo.jpg', (150, 150)); originals -> (name, None)"""
+    match = VARIANT_PATTERN.match(name)
+    if not match:
+        return name, None
+    return match.group('base') + match.group('ext'), (int(match.group('width')), int(match.group('height')))
+
+
+def best_source(group: List[Dict]) -> Dict:
+    """The original if WordPress kept it, else the largest variant (by area, then bytes)"""
+    for entry in group:
+        if not entry['variant']:
+            return entry
+    return max(group, key=lambda e: (e['variant'][0] * e['variant'][1], e['size']))
+
+
+def asset_kind(path: Path) -> Optional[str]:
+    """'image', 'document' or None for files the migration ignores"""
+    suffix = path.suffix.lower()
+    if suffix in IMAGE_EXTENSIONS:
+        return 'image'
+    if suffix in DOCUMENT_EXTENSIONS:
+        return 'document'
+    return None
+
+
+def scan_month(month_dir: Path, uploads_dir: Path, previous: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Index entries for one uploads/<year>/<month> folder, keyed by relative path"""
+    entries = {}
+    for path in sorted(month_dir.iterdir()):
+        kind = asset_kind(path)
+        if not kind or not path.is_file():
+            continue
+
+        key = path.relative_to(uploads_dir).as_posix()
+        stat = path.stat()
+        old = previous.get(key)
+        if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+            entries[key] = old
+            continue
+
+        original, variant = parse_variant(path.name)
+        entries[key] = {
+            'path': key,
+            'name': path.name,
+            'kind': kind,
+            'year': month_dir.parent.name,
+            'month': month_dir.name,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_sha256(path),
+            'original': original,
+            'variant': list(variant) if variant else None
+        }
+    return entries
+
+
+class UploadsIndex:
+    """In-memory uploads index with month and filename lookups"""
+
+    def __init__(self, entries: Dict[str, Dict], root: Optional[Path] = None):
+        self.root = root or UPLOADS_DIR
+        self.entries = entries
+        self._by_month: Dict[Tuple[str, str], List[Dict]] = {}
+        self._by_name: Dict[str, List[Dict]] = {}
+        self._groups: Optional[Dict[str, List[Dict]]] = None
+        for entry in entries.values():
+            self._by_month.setdefault((entry['year'], entry['month']), []).append(entry)
+            self._by_name.setdefault(entry['name'], []).append(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def path(self, entry: Dict) -> Path:
+        """Absolute path of an indexed file"""
+        return self.root / entry['path']
+
+    def month(self, year: str, month: str, kind: Optional[str] = None) -> List[Dict]:
+        """Files in uploads/<year>/<month>, in name order"""
+        entries = self._by_month.get((year, month), [])
+        return [e for e in entries if e['kind'] == kind] if kind else list(entries)
+
+    def find(self, name: str) -> Optional[Dict]:
+        """Newest indexed file with this filename"""
+        matches = self._by_name.get(name)
+        return max(matches, key=lambda e: (e['year'], e['month'])) if matches else None
+
+    def groups(self) -> Dict[str, List[Dict]]:
+        """Image size-variant groups keyed by '<year>/<month>/<original>'"""
+        if self._groups is None:
+            self._groups = {}
+            for entry in self.entries.values():
+                if entry['kind'] == 'image':
+                    key = f"{entry['year']}/{entry['month']}/{entry['original']}"
+                    self._groups.setdefault(key, []).append(entry)
+        return self._groups
+
+    def kept(self) -> List[Dict]:
+        """Files to publish: the best source of every image group, plus every document"""
+        images = [best_source(group) for group in self.groups().values()]
+        documents = [e for e in self.entries.values() if e['kind'] != 'image']
+        return sorted(images + documents, key=lambda e: e['path'])
+
+    def resolve(self, name: str) -> Optional[Dict]:
+        """Kept entry standing in for a filename (variant names map to their group's best source)"""
+        entry = self.find(name)
+        if not entry or entry['kind'] != 'image':
+            return entry
+        return best_source(self.groups()[f"{entry['year']}/{entry['month']}/{entry['original']}"])
+
+
+def load_index() -> Dict[str, Dict]:
+    """Entries from the saved index, or {}"""
+    if INDEX_FILE.exists():
+        try:
+            with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f).get('files', {})
+        except (OSError, ValueError) as e:
+            print(f"  ⚠ Ignoring unreadable uploads index: {e}")
+    return {}
+
+
+def save_index(entries: Dict[str, Dict]) -> None:
+    """Write the index atomically"""
+    INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = INDEX_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'generated': time.strftime('%Y-%m-%d %H:%M:%S'), 'files': entries},
+                  f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, INDEX_FILE)
+
+
+def build_index(uploads_dir: Optional[Path] = None, workers: int = SCAN_WORKERS,
+                save: bool = True) -> UploadsIndex:
+    """Scan the uploads tree (reusing unchanged hashes) and return the index"""
+    uploads_dir = uploads_dir or UPLOADS_DIR
+    if not uploads_dir.exists():
+        return UploadsIndex({}, uploads_dir)
+
+    month_dirs = [month_dir
+                  for year_dir in sorted(uploads_dir.iterdir()) if year_dir.is_dir()
+                  for month_dir in sorted(year_dir.iterdir()) if month_dir.is_dir()]
+
+    previous = load_index()
+    entries = {}
+    # Scanning is stat/read bound and hashlib releases the GIL, so threads suffice
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for month_entries in pool.map(lambda d: scan_month(d, uploads_dir, previous), month_dirs):
+            entries.update(month_entries)
+
+    if save:
+        save_index(entries)
+    return UploadsIndex(entries, uploads_dir)
+
+
+def is_same_file(source: Path, dest: Path, sha256: Optional[str] = None) -> bool:
+    """
+    True if dest is a separate file holding source's content. Copies made by
+    place() keep source's mtime, so matching size and mtime is enough; only
+    other same-size files are hashed (sha256 defaults to hashing source; pass
+    the indexed hash). A hardlink to source counts as different, so place()
+    replaces it with an independent copy.
+    """
+    try:
+        dest_stat = dest.stat()
+    except FileNotFoundError:
+        return False
+    source_stat = source.stat()
+    if (dest_stat.st_dev, dest_stat.st_ino) == (source_stat.st_dev, source_stat.st_ino):
+        return False
+    if dest_stat.st_size != source_stat.st_size:
+        return False
+    if dest_stat.st_mtime_ns == source_stat.st_mtime_ns:
+        return True
+    return file_sha256(dest) == (sha256 or file_sha256(source))
+
+
+def reflink(source: Path, dest: Path) -> bool:
+    """Copy-on-write clone via FICLONE; False if unsupported here"""
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return False
+    try:
+        with open(source, 'rb') as src, open(dest, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+    shutil.copystat(source, dest)
+    return True
+
+
+def place(source: Path, dest: Path, sha256: Optional[str] = None) -> str:
+    """
+    Make dest an independent copy of source as cheaply as possible (reflink,
+    else copy; never a hardlink). sha256 is source's indexed hash, if known.
+    Returns 'skipped', 'cloned' or 'copied'.
+    """
+    if is_same_file(source, dest, sha256):
+        return 'skipped'
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dest = dest.with_name(dest.name + '.tmp')
+    tmp_dest.unlink(missing_ok=True)
+
+    if reflink(source, tmp_dest):
+        method = 'cloned'
+    else:
+        shutil.copy2(source, tmp_dest)
+        method = 'copied'
+
+    os.replace(tmp_dest, dest)
+    return method
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("UPLOADS INDEX")
+    print("=" * 80)
+    print()
+
+    if not UPLOADS_DIR.exists():
+        print(f"❌ Uploads folder not found: {UPLOADS_DIR}")
+        return
+
+    start_time = time.time()
+    index = build_index()
+
+    images = [e for e in index if e['kind'] == 'image']
+    kept = index.kept()
+    kept_bytes = sum(e['size'] for e in kept)
+    total_bytes = sum(e['size'] for e in index)
+    print(f"Files indexed: {len(index)} ({len(images)} images, {len(index) - len(images)} documents)")
+    print(f"Image groups: {len(index.groups())} ({sum(1 for e in images if e['variant'])} size variants)")
+    print(f"Kept for publishing: {len(kept)} files, {kept_bytes / 1024 / 1024:.1f} MB "
+          f"of {total_bytes / 1024 / 1024:.1f} MB")
+    print(f"Time elapsed: {time.time() - start_time:.2f} seconds")
+    print(f"\n✓ Index saved to: {INDEX_FILE}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
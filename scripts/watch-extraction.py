@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Extraction Watch Mode
+Watches individual-posts/** and the V2 extractor module, and keeps the
+structured outputs and meeting markdown up to date while posts or extractor
+rules are being edited
+
+- A changed or new post is re-run through process_single_file with its
+  category's extraction profile (see batch-extract-all.py); a deleted post
+  has its structured XML/JSON removed
+- Editing extract-structured-data-v2.py reloads it in-process and
+  re-extracts every post; a module that fails to load keeps the previous
+  extractor running
+- Markdown is regenerated incrementally, so only pages whose JSON changed
+  are rewritten and the Nuxt dev server picks them up straight away
+- One DataExtractor lives for the whole session; bursts of events (editor
+  saves, a re-split) are debounced into one batch
+- Uses inotify on Linux and falls back to polling file mtimes elsewhere
+
+Note: re-extraction rewrites the structured JSON from the post, as a manual
+process_single_file run does, so download annotations (local paths) on
+re-extracted meetings are dropped until the downloaders run again.
+
+Usage: python watch-extraction.py [--poll]
+"""
+
+import contextlib
+import ctypes
+import ctypes.util
+import importlib.util
+import io
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = PROJECT_ROOT / 'scripts'
+INDIVIDUAL_POSTS_DIR = PROJECT_ROOT / 'AAII-Migration-assets' / 'individual-posts'
+EXTRACTOR_SCRIPT = SCRIPTS_DIR / 'extract-structured-data-v2.py'
+
+# Quiet period that ends a burst of events, and the longest a burst may be held
+DEBOUNCE = 0.05
+MAX_DEBOUNCE = 0.5
+POLL_INTERVAL = 0.05
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def load_script(name: str, filename: str):
+    """Load a hyphenated script as a module"""
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def is_watched(path: Path) -> bool:
+    """Posts in a category folder, or the extractor module"""
+    if path == EXTRACTOR_SCRIPT:
+        return True
+    return path.suffix == '.xml' and path.parent.parent == INDIVIDUAL_POSTS_DIR
+
+
+class PollingWatcher:
+    """Change detection by comparing (mtime_ns, size) snapshots"""
+
+    name = 'polling'
+
+    def __init__(self):
+        self.snapshot = self.scan()
+
+    @staticmethod
+    def scan() -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for path in [EXTRACTOR_SCRIPT] + list(INDIVIDUAL_POSTS_DIR.glob('*/*.xml')):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def changes(self, timeout: float) -> Set[Path]:
+        """Paths added, modified or removed since the last call"""
+        time.sleep(min(timeout, POLL_INTERVAL))
+        current = self.scan()
+        changed = {p for p in current.keys() | self.snapshot.keys() if current.get(p) != self.snapshot.get(p)}
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Change detection with Linux inotify through libc"""
+
+    name = 'inotify'
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, Path] = {}
+        self.add_watch(EXTRACTOR_SCRIPT.parent)
+        self.add_watch(INDIVIDUAL_POSTS_DIR)
+        for category_dir in INDIVIDUAL_POSTS_DIR.iterdir():
+            if category_dir.is_dir():
+                self.add_watch(category_dir)
+
+    def add_watch(self, directory: Path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.dirs[wd] = directory
+
+    def changes(self, timeout: float) -> Set[Path]:
+        """Paths written, moved or deleted within the timeout"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost; treat every post as changed
+                return set(INDIVIDUAL_POSTS_DIR.glob('*/*.xml')) | {EXTRACTOR_SCRIPT}
+            if wd not in self.dirs or not name:
+                continue
+            path = self.dirs[wd] / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & IN_CREATE and self.dirs[wd] == INDIVIDUAL_POSTS_DIR:
+                    self.add_watch(path)
+                    changed.update(path.glob('*.xml'))
+                continue
+            # IN_CREATE alone is followed by IN_CLOSE_WRITE once the file is complete
+            if mask != IN_CREATE:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(poll: bool = False):
+    """inotify watcher where available, else polling"""
+    if not poll:
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as e:
+            print(f"⚠ inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher()
+
+
+class ExtractionSession:
+    """Persistent extractor plus the profile and markdown modules it feeds"""
+
+    def __init__(self):
+        self.batch = load_script('batch_extract', 'batch-extract-all.py')
+        self.markdown = load_script('generate_markdown', 'generate-meeting-markdown.py')
+        self.profiles = self.batch.load_profiles()
+        self.extract_v2 = self.batch.extract_v2
+        self.extractor = self.extract_v2.DataExtractor()
+
+    def reload_extractor(self) -> bool:
+        """Re-exec the extractor module; keep the old one if the new one fails to load"""
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                spec = importlib.util.spec_from_file_location('extract_v2', EXTRACTOR_SCRIPT)
+                extract_v2 = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(extract_v2)
+                extractor = extract_v2.DataExtractor()
+        except Exception as e:
+            print(f"  ❌ Extractor failed to load, keeping the previous one: {e}")
+            return False
+        self.extract_v2 = extract_v2
+        self.extractor = extractor
+        print(f"  ↻ Reloaded {EXTRACTOR_SCRIPT.name}")
+        return True
+
+    def outputs(self, xml_file: Path):
+        """Structured XML and JSON paths for a post"""
+        subfolder = self.profiles[xml_file.parent.name]['output']
+        return (self.extract_v2.OUTPUT_XML / subfolder / f"{xml_file.stem}.xml",
+                self.extract_v2.OUTPUT_JSON / subfolder / f"{xml_file.stem}.json")
+
+    def extract(self, xml_file: Path) -> bool:
+        """Re-extract one post with its category profile. Returns True if outputs were written."""
+        category = xml_file.parent.name
+        profile = self.profiles.get(category)
+        if profile is None:
+            print(f"  ⚠ {category}/{xml_file.name}: no extraction profile, ignored")
+            return False
+
+        if profile['formats'] is not None:
+            root = self.extract_v2.ET.parse(xml_file).getroot()
+            content = self.extract_v2.ITEM_READER.read(root)['content']
+            fmt = self.extractor.detect_format(content) if content else ''
+            if fmt not in profile['formats']:
+                print(f"  - {category}/{xml_file.name}: skipped ({fmt})")
+                return False
+
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            meeting = self.extract_v2.process_single_file(xml_file, self.extractor, profile['output'])
+
+        if meeting:
+            print(f"  ✓ {category}/{xml_file.name}: {len(meeting.topics)} topics")
+            return True
+        reason = (log.getvalue().strip().splitlines() or ['extraction failed'])[-1]
+        print(f"  ✗ {category}/{xml_file.name}: {reason}")
+        return False
+
+    def remove(self, xml_file: Path) -> bool:
+        """Remove the structured outputs of a deleted post"""
+        if xml_file.parent.name not in self.profiles:
+            return False
+        removed = False
+        for output in self.outputs(xml_file):
+            if output.exists():
+                output.unlink()
+                removed = True
+        if removed:
+            print(f"  🗑 {xml_file.parent.name}/{xml_file.name}: outputs removed")
+        return removed
+
+    def handle(self, changed: Set[Path]):
+        """Process one debounced batch of changed paths"""
+        if EXTRACTOR_SCRIPT in changed:
+            if not self.reload_extractor():
+                changed = changed - {EXTRACTOR_SCRIPT}
+            else:
+                # New rules affect every post
+                changed = set(INDIVIDUAL_POSTS_DIR.glob('*/*.xml'))
+
+        json_files = []
+        removed = False
+        for xml_file in sorted(p for p in changed if p != EXTRACTOR_SCRIPT):
+            # A post caught mid-save (truncated, malformed) must not stop the watcher
+            try:
+                if xml_file.exists():
+                    if self.extract(xml_file):
+                        json_output = self.outputs(xml_file)[1]
+                        # Only the top-level JSON (monthly meetings) becomes pages
+                        if json_output.parent == self.extract_v2.OUTPUT_JSON:
+                            json_files.append(json_output)
+                else:
+                    removed = self.remove(xml_file) or removed
+            except Exception as e:
+                print(f"  ❌ {xml_file.parent.name}/{xml_file.name}: {type(e).__name__}: {e}")
+
+        if json_files or removed:
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    # A full run is needed to drop pages of removed meetings
+                    counts = self.markdown.generate(None if removed else json_files)
+            except Exception as e:
+                print(f"  ❌ Markdown generation failed: {type(e).__name__}: {e}")
+                return
+            print(f"  Markdown: {counts['written']} written, {counts['unchanged'] + counts['skipped']} unchanged, "
+                  f"{counts['removed']} removed")
+
+
+def main():
+    """Main execution"""
+    print("=" * 80)
+    print("EXTRACTION WATCH MODE")
+    print("=" * 80)
+    print()
+
+    if not INDIVIDUAL_POSTS_DIR.exists():
+        print(f"❌ Folder not found: {INDIVIDUAL_POSTS_DIR}")
+        return
+
+    session = ExtractionSession()
+    watcher = make_watcher(poll='--poll' in sys.argv[1:])
+    print(f"Watching {INDIVIDUAL_POSTS_DIR.relative_to(PROJECT_ROOT)}/** and {EXTRACTOR_SCRIPT.name} ({watcher.name})")
+    print("Press Ctrl+C to stop\n")
+
+    try:
+        while True:
+            changed = {p for p in watcher.changes(1.0) if is_watched(p)}
+            if not changed:
+                continue
+
+            # Debounce: collect until the events go quiet
+            first_event = time.perf_counter()
+            while time.perf_counter() - first_event < MAX_DEBOUNCE:
+                more = {p for p in watcher.changes(DEBOUNCE) if is_watched(p)}
+                if not more:
+                    break
+                changed |= more
+
+            print(f"[{time.strftime('%H:%M:%S')}] {len(changed)} changed")
+            session.handle(changed)
+            print(f"  Done in {(time.perf_counter() - first_event) * 1000:.0f} ms\n")
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+WordPress Export Reader
+Shared helpers for reading the full WordPress WXR export
+
+- iter_items streams <item> elements with iterparse and discards each one
+  after it has been handled, so memory stays bounded by the largest item
+  rather than the export size
+- build_offset_index records the byte offset and length of every <item>
+  (skipping CDATA, so markup inside post content cannot confuse it) together
+  with post_id, post_type, status, modified date and categories
+- ExportReader memory-maps the export and parses only the requested item's
+  slice, so fetching one post costs the same regardless of export size
+- ItemReader walks an item's children once, dispatching each tag through a
+  precomputed handler table, and returns its fields, classified postmeta and
+  content together instead of one find() scan per field
+
+Usage:
+  python wp_export.py index [<export.xml>]   Build (or refresh) the offset index
+  python wp_export.py show <post_id>         Print one item from the export
+"""
+
+import json
+import mmap
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+EXPORT_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'aaiilaorg.WordPress.2025-11-01.xml'
+INDEX_FILE = PROJECT_ROOT / 'AAII-Migration-assets' / 'output' / 'export-index.json'
+
+NAMESPACES = {
+    'wp': 'http://wordpress.org/export/1.2/',
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'excerpt': 'http://wordpress.org/export/1.2/excerpt/',
+    'wfw': 'http://wellformedweb.org/CommentAPI/',
+}
+
+WP = '{%s}' % NAMESPACES['wp']
+CONTENT = '{%s}' % NAMESPACES['content']
+DC = '{%s}' % NAMESPACES['dc']
+META_KEY = WP + 'meta_key'
+META_VALUE = WP + 'meta_value'
+
+# Single-valued item fields: full tag -> record key
+ITEM_FIELDS = {
+    'title': 'title',
+    'link': 'link',
+    DC + 'creator': 'creator',
+    CONTENT + 'encoded': 'content',
+    WP + 'post_id': 'post_id',
+    WP + 'post_name': 'post_name',
+    WP + 'post_date': 'post_date',
+    WP + 'post_modified': 'post_modified',
+    WP + 'post_type': 'post_type',
+    WP + 'status': 'status',
+}
+
+CDATA_START = b'<![CDATA['
+CDATA_END = b']]>'
+
+
+def iter_items(xml_file: Optional[Path] = None) -> Iterator[ET.Element]:
+    """
+    Yield every <item> of the export in document order.
+    The element is cleared and detached once the consumer moves on, so do
+    not keep references to it (copy what you need).
+    """
+    parents = []
+    for event, elem in ET.iterparse(xml_file or EXPORT_FILE, events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+        parents.pop()
+        if elem.tag == 'item':
+            yield elem
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+
+
+def find_markup(buf, token: bytes, pos: int) -> int:
+    """Offset of the next token at or after pos that is not inside a CDATA section, or -1"""
+    while True:
+        found = buf.find(token, pos)
+        if found == -1:
+            return -1
+        cdata = buf.find(CDATA_START, pos, found)
+        if cdata == -1:
+            return found
+        pos = buf.find(CDATA_END, cdata + len(CDATA_START))
+        if pos == -1:
+            return -1
+        pos += len(CDATA_END)
+
+
+def scan_item_offsets(buf) -> Iterator[Tuple[int, int]]:
+    """Yield (offset, length) of every <item>...</item> element in the buffer"""
+    pos = 0
+    while True:
+        start = find_markup(buf, b'<item>', pos)
+        if start == -1:
+            return
+        end = find_markup(buf, b'</item>', start)
+        if end == -1:
+            return
+        end += len(b'</item>')
+        yield start, end - start
+        pos = end
+
+
+def root_open_tag(buf) -> bytes:
+    """The <rss ...> start tag, whose namespace declarations every item slice needs"""
+    start = buf.find(b'<rss')
+    end = buf.find(b'>', start)
+    if start == -1 or end == -1:
+        raise ValueError("Not a WordPress export: no <rss> element")
+    return bytes(buf[start:end + 1])
+
+
+def parse_slice(open_tag: bytes, data: bytes) -> ET.Element:
+    """Parse one item slice, wrapped in the root tag for its namespace declarations"""
+    return ET.fromstring(open_tag + data + b'</rss>')[0]
+
+
+def item_summary(item: ET.Element) -> Dict:
+    """Fields recorded in the offset index"""
+    def text(path):
+        elem = item.find(path, NAMESPACES)
+        return elem.text or '' if elem is not None else ''
+
+    return {
+        'post_id': text('wp:post_id'),
+        'post_type': text('wp:post_type'),
+        'status': text('wp:status'),
+        'post_modified': text('wp:post_modified'),
+        'title': text('title'),
+        'categories': [c.text or '' for c in item.findall('category[@domain="category"]')],
+    }
+
+
+def build_offset_index(xml_file: Optional[Path] = None, index_file: Optional[Path] = None) -> Dict:
+    """Scan the export once and write the offset index. Returns the index."""
+    xml_file = Path(xml_file or EXPORT_FILE)
+    index_file = index_file or INDEX_FILE
+    stat = xml_file.stat()
+
+    items = []
+    with open(xml_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        open_tag = root_open_tag(buf)
+        for offset, length in scan_item_offsets(buf):
+            entry = item_summary(parse_slice(open_tag, buf[offset:offset + length]))
+            entry['offset'] = offset
+            entry['length'] = length
+            items.append(entry)
+
+    index = {
+        'export': str(xml_file),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'root_tag': open_tag.decode('utf-8'),
+        'items': items
+    }
+
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = index_file.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_file, index_file)
+    return index
+
+
+def load_offset_index(xml_file: Optional[Path] = None, index_file: Optional[Path] = None) -> Dict:
+    """The offset index for the export, rebuilt if missing or stale"""
+    xml_file = Path(xml_file or EXPORT_FILE)
+    index_file = index_file or INDEX_FILE
+    if index_file.exists():
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            stat = xml_file.stat()
+            if index.get('export') == str(xml_file) and index.get('size') == stat.st_size \
+                    and index.get('mtime_ns') == stat.st_mtime_ns:
+                return index
+        except (OSError, ValueError):
+            pass
+    return build_offset_index(xml_file, index_file)
+
+
+class ExportReader:
+    """Random access to export items through the offset index and a memory map"""
+
+    def __init__(self, xml_file: Optional[Path] = None, index_file: Optional[Path] = None):
+        self.xml_file = Path(xml_file or EXPORT_FILE)
+        self.index = load_offset_index(self.xml_file, index_file)
+        self.open_tag = self.index['root_tag'].encode('utf-8')
+        self.by_id: Dict[str, Dict] = {}
+        for entry in self.index['items']:
+            self.by_id.setdefault(entry['post_id'], entry)
+        self._file = open(self.xml_file, 'rb')
+        self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        self._buf.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.index['items'])
+
+    def __contains__(self, post_id) -> bool:
+        return str(post_id) in self.by_id
+
+    def entries(self, post_type: Optional[str] = None, status: Optional[str] = None,
+                category: Optional[str] = None) -> List[Dict]:
+        """Index entries matching the given filters, in export order"""
+        return [e for e in self.index['items']
+                if (post_type is None or e['post_type'] == post_type)
+                and (status is None or e['status'] == status)
+                and (category is None or category in e['categories'])]
+
+    def raw(self, post_id) -> bytes:
+        """The item's bytes exactly as they appear in the export"""
+        entry = self.by_id[str(post_id)]
+        return self._buf[entry['offset']:entry['offset'] + entry['length']]
+
+    def get(self, post_id) -> ET.Element:
+        """Parse and return one <item> element"""
+        return parse_slice(self.open_tag, self.raw(post_id))
+
+
+def keep_all(meta_key: str) -> Tuple[bool, Optional[str]]:
+    """Default postmeta classifier: keep everything"""
+    return True, None
+
+
+class ItemReader:
+    """
+    Single-pass reader for <item> elements.
+    Every child is looked up once in a handler table keyed by its full tag;
+    postmeta is classified as it is read with classify(meta_key) -> (keep, rule),
+    the same contract as the splitter's PostmetaFilter.classify.
+
+    read() returns a dict with:
+    - the ITEM_FIELDS values ('' if absent, the raw text otherwise)
+    - 'category': text of the first <category> of any domain
+    - 'categories': texts of the domain="category" categories
+    - 'postmeta': (key, value, element, keep, rule) for every entry that has a
+      meta_key, in document order; value is only read for kept entries and is
+      None when dropped or when the entry has no wp:meta_value
+    - 'postmeta_count': all wp:postmeta children, keyed or not
+    - 'children': the children to keep (everything except dropped postmeta)
+    """
+
+    def __init__(self, classify: Optional[Callable[[str], Tuple[bool, Optional[str]]]] = None):
+        self.classify = classify or keep_all
+        self.handlers = {tag: self._field(key) for tag, key in ITEM_FIELDS.items()}
+        self.handlers['category'] = self._category
+        self.handlers[WP + 'postmeta'] = self._postmeta
+
+    @staticmethod
+    def _field(key: str):
+        def handle(record, child):
+            record[key] = child.text or ''
+            record['children'].append(child)
+        return handle
+
+    @staticmethod
+    def _category(record, child):
+        if 'category' not in record:
+            record['category'] = child.text
+        if child.get('domain') == 'category':
+            record['categories'].append(child.text or '')
+        record['children'].append(child)
+
+    def _postmeta(self, record, child):
+        record['postmeta_count'] += 1
+        key = child.findtext(META_KEY)
+        if not key:
+            return
+        keep, rule = self.classify(key)
+        value = None
+        if keep:
+            value_elem = child.find(META_VALUE)
+            if value_elem is not None:
+                value = value_elem.text or ''
+            record['children'].append(child)
+        # Plain tuple: this runs for every postmeta entry of every item
+        record['postmeta'].append((key, value, child, keep, rule))
+
+    def read(self, item: ET.Element) -> Dict:
+        """Collect an item's fields, postmeta and content in one walk over its children"""
+        record = dict.fromkeys(ITEM_FIELDS.values(), '')
+        record.update(categories=[], postmeta=[], postmeta_count=0, children=[])
+        handlers = self.handlers
+        children = record['children']
+        for child in item:
+            handler = handlers.get(child.tag)
+            if handler:
+                handler(record, child)
+            else:
+                children.append(child)
+        record.setdefault('category', '')
+        return record
+
+
+def main():
+    """Main execution"""
+    args = sys.argv[1:]
+    command = args[0] if args else ''
+
+    if command == 'index':
+        xml_file = Path(args[1]) if len(args) > 1 else EXPORT_FILE
+        if not xml_file.exists():
+            print(f"❌ Export not found: {xml_file}")
+            return
+        start_time = time.time()
+        index = build_offset_index(xml_file)
+        print(f"✓ Indexed {len(index['items'])} items in {time.time() - start_time:.2f} seconds")
+        print(f"  Index saved to: {INDEX_FILE}")
+    elif command == 'show' and len(args) > 1:
+        with ExportReader() as reader:
+            if args[1] not in reader:
+                print(f"❌ No item with post_id {args[1]}")
+                return
+            print(reader.raw(args[1]).decode('utf-8'))
+    else:
+        print(__doc__.split('Usage:', 1)[1].rstrip())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+Structured XML Backend
+Shared XML read/write helpers for the structured-xml outputs
+
+- Uses lxml when installed: streaming xmlfile writes for generation and
+  in-place element insertion for the asset annotators
+- Falls back to xml.etree.ElementTree when lxml is not available
+- Both backends produce the same 2-space indented layout and drop characters
+  XML 1.0 cannot represent (e.g. \x0b from pasted Word text)
+- Documents are written to a .tmp file and only replace the output on success
+"""
+
+import os
+import re
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+try:
+    from lxml import etree as LET
+    HAS_LXML = True
+except ImportError:
+    LET = None
+    HAS_LXML = False
+
+# Active backend: 'lxml' or 'etree' (override for benchmarks/debugging)
+BACKEND = 'lxml' if HAS_LXML else 'etree'
+
+INDENT = '  '
+
+# Characters outside the XML 1.0 Char production (control characters, surrogates, U+FFFE/U+FFFF)
+INVALID_XML_CHARS = re.compile('[^\x09\x0a\x0d\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]')
+
+
+def xml_text(text: Optional[str]) -> Optional[str]:
+    """Text with XML-invalid characters removed (None stays None)"""
+    return INVALID_XML_CHARS.sub('', text) if text else text
+
+
+def _resolve(backend: Optional[str]) -> str:
+    """Return the backend to use, falling back to ElementTree if lxml is missing"""
+    backend = backend or BACKEND
+    if backend == 'lxml' and not HAS_LXML:
+        return 'etree'
+    return backend
+
+
+class TreeWriter:
+    """Builds an ElementTree in memory, indents it and writes it on close"""
+
+    def __init__(self, output_path: Path, root_tag: str):
+        self.output_path = output_path
+        self.root = ET.Element(root_tag)
+        self.stack = [self.root]
+
+    @contextmanager
+    def element(self, tag: str, **attrib):
+        elem = ET.SubElement(self.stack[-1], tag, **attrib)
+        self.stack.append(elem)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+
+    def leaf(self, tag: str, text: Optional[str]):
+        elem = ET.SubElement(self.stack[-1], tag)
+        elem.text = xml_text(text)
+
+    def close(self):
+        tree = ET.ElementTree(self.root)
+        ET.indent(tree, space=INDENT)
+        tree.write(self.output_path, encoding='utf-8', xml_declaration=True)
+
+
+class StreamWriter:
+    """Writes elements incrementally with lxml.etree.xmlfile (no full tree in memory)"""
+
+    def __init__(self, xf, depth: int = 1):
+        self.xf = xf
+        self.depth = depth
+        # Whether the element currently open at each level has children
+        self.has_children = [False]
+
+    def _newline(self, depth: int):
+        self.xf.write('\n' + INDENT * depth)
+
+    @contextmanager
+    def element(self, tag: str, **attrib):
+        self.has_children[-1] = True
+        self._newline(self.depth)
+        with self.xf.element(tag, attrib):
+            self.depth += 1
+            self.has_children.append(False)
+            try:
+                yield
+            finally:
+                if self.has_children.pop():
+                    self._newline(self.depth - 1)
+                self.depth -= 1
+
+    def leaf(self, tag: str, text: Optional[str]):
+        self.has_children[-1] = True
+        self._newline(self.depth)
+        elem = LET.Element(tag)
+        # Empty text serializes as <tag/> like ElementTree's short empty elements
+        elem.text = xml_text(text) or None
+        self.xf.write(elem)
+
+
+@contextmanager
+def open_writer(output_path: Path, root_tag: str, backend: Optional[str] = None):
+    """
+    Open a writer for a structured XML document.
+    Yields an object with element(tag, **attrib) (context manager) and leaf(tag, text).
+    The document goes to a .tmp file first; if writing fails, the previous
+    output is left untouched rather than replaced by a truncated document.
+    """
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    try:
+        if _resolve(backend) == 'lxml':
+            with LET.xmlfile(str(tmp_path), encoding='utf-8') as xf:
+                xf.write_declaration()
+                with xf.element(root_tag):
+                    writer = StreamWriter(xf)
+                    yield writer
+                    if writer.has_children[0]:
+                        xf.write('\n')
+        else:
+            writer = TreeWriter(tmp_path, root_tag)
+            yield writer
+            writer.close()
+        os.replace(tmp_path, output_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def parse(xml_file: Path, backend: Optional[str] = None):
+    """Parse an XML file with the active backend, keeping existing whitespace"""
+    if _resolve(backend) == 'lxml':
+        return LET.parse(str(xml_file))
+    return ET.parse(xml_file)
+
+
+def new_element(parent, tag: str, text: Optional[str] = None):
+    """Create a detached element of the same backend as parent"""
+    factory = LET.Element if HAS_LXML and isinstance(parent, LET._Element) else ET.Element
+    elem = factory(tag)
+    elem.text = text
+    return elem
+
+
+def set_child_text(parent, tag: str, text: str, after: Optional[str] = None):
+    """
+    Set the text of parent's <tag> child in place, creating it if needed.
+    New children go right after the <after> sibling (or at the end) and
+    inherit the surrounding indentation, so the file never needs re-indenting.
+    """
+    existing = parent.find(tag)
+    if existing is not None:
+        existing.text = text
+        return existing
+
+    elem = new_element(parent, tag, text)
+    children = list(parent)
+    anchor = parent.find(after) if after else None
+    if anchor is None and children:
+        anchor = children[-1]
+
+    if anchor is None:
+        parent.append(elem)
+        return elem
+
+    idx = children.index(anchor)
+    elem.tail = anchor.tail
+    if idx == len(children) - 1:
+        # Anchor was the last child: its tail closed the parent, now it separates siblings
+        anchor.tail = parent.text
+    parent.insert(idx + 1, elem)
+    return elem
+
+
+def write(tree, xml_file: Path):
+    """Write a parsed tree back to disk"""
+    tree.write(str(xml_file), encoding='utf-8', xml_declaration=True)
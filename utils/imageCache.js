@@ -1,29 +1,24 @@
-// Shared image cache across all components
-export const imageCache = ref(new Map())
+// Build-time list of asset paths, generated by scripts/asset_manifest.py
+// (rerun by the download scripts whenever they write assets, and before
+// "npm run build"/"npm run generate"; files added to public/ while "nuxt dev"
+// is running count as missing until the script is rerun)
+import assetPaths from '~/assets/asset-paths.json'
 
-// Optional: Cache cleanup utilities
-export const clearImageCache = () => {
-  imageCache.value.clear()
-}
+// Shared static lookup across all components
+export const assetIndex = new Set(assetPaths)
 
-export const getCacheSize = () => {
-  return imageCache.value.size
-}
+// Drop query strings and fragments so "/images/a.jpg?v=2" matches "/images/a.jpg"
+const normalizePath = (path) => path.split(/[?#]/)[0]
 
-// Optional: Cache with expiration (future enhancement)
-export const setCacheWithExpiry = (key, value, expiryMs = 5 * 60 * 1000) => {
-  const expiry = Date.now() + expiryMs
-  imageCache.value.set(key, { value, expiry })
+export const isExternalUrl = (path) => /^(https?:)?\/\//.test(path)
+
+export const assetExists = (path) => {
+  if (!path) return false
+  // Remote assets are not in the manifest; let the browser load them directly
+  if (isExternalUrl(path)) return true
+  return assetIndex.has(normalizePath(path))
 }
 
-export const getCacheWithExpiry = (key) => {
-  const cached = imageCache.value.get(key)
-  if (!cached) return undefined
-  
-  if (Date.now() > cached.expiry) {
-    imageCache.value.delete(key)
-    return undefined
-  }
-  
-  return cached.value
-} 
\ No newline at end of file
+export const getCacheSize = () => {
+  return assetIndex.size
+}